@@ -0,0 +1,106 @@
+"""
+Benchmark de memoria de los registros de cuenta - CoProx
+
+PROPÓSITO:
+Mide la memoria que ocupan las cuentas de AuthModel con el registro compacto
+(AccountRecord con __slots__ y last_used epoch) frente al diccionario anterior de
+cinco/seis claves con un datetime por cuenta.
+
+FUNCIONAMIENTO:
+- Genera los tokens antes de medir, así su coste no entra en la comparación
+- Mide con tracemalloc los registros anteriores (dict + datetime), los registros
+  compactos y un AuthModel completo (índices, política de selección incluidos)
+- Todas las cuentas tienen last_used asignado, como tras un rato de servicio
+
+USO:
+    python benchmarks/bench_account_memory.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.auth_model import AccountRecord, AuthModel  # noqa: E402
+
+
+def make_tokens(count: int) -> list:
+    """Genera tokens válidos para AuthModel"""
+    return [f"ghu_benchmark{i:010d}abcdefghij" for i in range(count)]
+
+
+def legacy_records(tokens: list) -> dict:
+    """Registros con el formato anterior de AuthModel"""
+    return {
+        token: {
+            'token': token,
+            'quota_remaining': 1000 + i,
+            'quota_total': 5000,
+            'is_exhausted': False,
+            'last_used': datetime.now(),
+            'failover_count': 0
+        }
+        for i, token in enumerate(tokens)
+    }
+
+
+def compact_records(tokens: list) -> dict:
+    """Registros compactos actuales"""
+    return {
+        token: AccountRecord(
+            token,
+            quota_remaining=1000 + i,
+            quota_total=5000,
+            last_used=time.time()
+        )
+        for i, token in enumerate(tokens)
+    }
+
+
+def full_model(tokens: list) -> AuthModel:
+    """AuthModel con todas las cuentas usadas al menos una vez"""
+    model = AuthModel()
+    for i, token in enumerate(tokens):
+        model.add_account(token, quota_remaining=1000 + i, quota_total=5000)
+    with model._lock:
+        for token, record in model._accounts.items():
+            model._accounts[token] = record.replace(last_used=time.time())
+    return model
+
+
+def measure(build, tokens: list) -> int:
+    """Bytes retenidos por el resultado de build(tokens)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(tokens)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'cuentas':>8} {'dict+datetime':>15} {'AccountRecord':>15} {'ahorro':>8} {'AuthModel':>12}")
+    for size in args.sizes:
+        tokens = make_tokens(size)
+        legacy = measure(legacy_records, tokens)
+        compact = measure(compact_records, tokens)
+        model = measure(full_model, tokens)
+        print(
+            f"{size:>8} {legacy / 1024:>12.0f} KiB {compact / 1024:>12.0f} KiB "
+            f"{1 - compact / legacy:>7.0%} {model / 1024:>9.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark de las políticas de selección de cuentas - CoProx
+
+PROPÓSITO:
+Compara el coste de AuthModel.get_current_token con cada política de
+scheduler_model.py frente al recorrido lineal anterior, con pools grandes en los que
+la mayoría de las cuentas están agotadas (el peor caso del recorrido lineal).
+
+FUNCIONAMIENTO:
+- Registra N cuentas con cuotas aleatorias y agota la fracción indicada
+- Mide get_current_token con cada política y con el recorrido first-fit lineal
+- Mide también el ciclo agotar + seleccionar, que es lo que ocurre en failover
+- Imprime microsegundos por operación
+
+USO:
+    python benchmarks/bench_account_scheduler.py [--accounts 10000] [--exhausted 0.9]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.auth_model import AuthModel  # noqa: E402
+from src.models.config_model import ACCOUNT_SCHEDULERS  # noqa: E402
+from src.models.scheduler_model import create_scheduler  # noqa: E402
+
+
+def make_token(index: int) -> str:
+    """Genera un token válido para AuthModel"""
+    return f"ghu_benchmark{index:010d}abcdefghij"
+
+
+def build_model(policy: str, accounts: int, exhausted: float, seed: int = 7) -> AuthModel:
+    """Crea un AuthModel con cuentas y la fracción agotada indicada"""
+    rng = random.Random(seed)
+    model = AuthModel(scheduler=create_scheduler(policy))
+    for i in range(accounts):
+        model.add_account(make_token(i), quota_remaining=rng.randint(1, 1000), quota_total=1000)
+    for i in range(int(accounts * exhausted)):
+        model.mark_account_as_exhausted(make_token(i))
+    return model
+
+
+def linear_first_fit(model: AuthModel):
+    """Recorrido lineal previo de get_current_token"""
+    with model._lock:
+        for token, account in model._accounts.items():
+            if not account['is_exhausted']:
+                account['last_used'] = datetime.now()
+                return token
+        return None
+
+
+def bench(label: str, func, repeat: int) -> float:
+    """Ejecuta func repeat veces (mejor de 5) y devuelve µs por operación"""
+    best = min(timeit.repeat(func, number=repeat, repeat=5))
+    per_op = best / repeat * 1e6
+    print(f"  {label:<38} {per_op:9.2f} µs/op")
+    return per_op
+
+
+def bench_failover(policy: str, accounts: int, exhausted: float) -> None:
+    """Mide agotar la cuenta elegida y seleccionar la siguiente"""
+    model = build_model(policy, accounts, exhausted)
+    available = accounts - int(accounts * exhausted)
+    iterations = max(1, available - 1)
+
+    start = timeit.default_timer()
+    for _ in range(iterations):
+        model.mark_account_as_exhausted(model.get_current_token())
+    elapsed = timeit.default_timer() - start
+    print(f"  {policy + ' (agotar + seleccionar)':<38} {elapsed / iterations * 1e6:9.2f} µs/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--accounts", type=int, default=10000)
+    parser.add_argument("--exhausted", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.accounts} cuentas, {args.exhausted:.0%} agotadas")
+
+    print("get_current_token:")
+    baseline_model = build_model("first_fit", args.accounts, args.exhausted)
+    baseline = bench("lineal (anterior)", lambda: linear_first_fit(baseline_model), args.repeat)
+    for policy in ACCOUNT_SCHEDULERS:
+        model = build_model(policy, args.accounts, args.exhausted)
+        per_op = bench(policy, model.get_current_token, args.repeat)
+        print(f"  {'':<38} {baseline / per_op:9.1f}x vs lineal")
+
+    print("failover:")
+    for policy in ACCOUNT_SCHEDULERS:
+        bench_failover(policy, args.accounts, args.exhausted)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark de contención en el camino de cada solicitud - CoProx
+
+PROPÓSITO:
+Mide el rendimiento con 4/16/64 hilos de lo que hace cada solicitud proxied sobre los
+modelos (elegir cuenta, registrar last_used, actualizar la hora de la última
+solicitud y el contador total), antes y después de eliminar los locks compartidos.
+
+FUNCIONAMIENTO:
+- "antes": contadores con un único lock por proceso (o una sola franja en memoria
+  compartida) y last_used escrito bajo el lock de AuthModel invalidando la
+  instantánea de cuentas
+- "después": celdas por hilo (local), franjas (memoria compartida) y last_used
+  escrito sin lock
+- Un hilo lector consulta get_statistics y get_all_accounts continuamente, como
+  el refresco de métricas de la UI
+- Imprime solicitudes por segundo para cada combinación
+
+USO:
+    python benchmarks/bench_hot_path_contention.py [--threads 4 16 64] [--seconds 1.0]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.auth_model import AuthModel  # noqa: E402
+from src.models.proxy_model import ProxyModel  # noqa: E402
+from src.models.stats_model import SharedMemoryStatsBackend  # noqa: E402
+
+ACCOUNTS = 1000
+
+
+class LockedStatsBackend:
+    """Backend local anterior: un lock por proceso en cada escritura"""
+
+    def __init__(self, fields, max_fields=()):
+        self._fields = tuple(fields)
+        self._index = {name: i for i, name in enumerate(self._fields)}
+        self._values = [0] * len(self._fields)
+        self._lock = threading.Lock()
+
+    def add(self, field, amount=1):
+        i = self._index[field]
+        with self._lock:
+            self._values[i] += amount
+
+    def set_max(self, field, value):
+        i = self._index[field]
+        with self._lock:
+            if value > self._values[i]:
+                self._values[i] = value
+
+    def snapshot(self):
+        return dict(zip(self._fields, list(self._values)))
+
+    def close(self):
+        pass
+
+
+class LockedAuthModel(AuthModel):
+    """AuthModel con la escritura anterior de last_used bajo el lock"""
+
+    def get_current_token(self):
+        with self._lock:
+            token = self._scheduler.select()
+            if token is not None:
+                self._accounts[token] = self._accounts[token].replace(last_used=time.time())
+                self._invalidate_snapshot()
+            return token
+
+
+def build_auth(auth_class):
+    """Crea un AuthModel con ACCOUNTS cuentas disponibles"""
+    auth = auth_class()
+    for i in range(ACCOUNTS):
+        auth.add_account(f"ghu_benchmark{i:010d}abcdefghij", quota_remaining=1000)
+    return auth
+
+
+def build_stats(kind: str, before: bool):
+    """Crea el backend de contadores para el escenario"""
+    if kind == "shared":
+        return SharedMemoryStatsBackend(
+            ProxyModel.STAT_FIELDS, 2, ProxyModel.STAT_MAX_FIELDS,
+            stripes=1 if before else 8
+        )
+    if before:
+        return LockedStatsBackend(ProxyModel.STAT_FIELDS, ProxyModel.STAT_MAX_FIELDS)
+    return None
+
+
+def run(threads: int, seconds: float, kind: str, before: bool) -> float:
+    """Ejecuta el camino de solicitud en varios hilos y retorna solicitudes/s"""
+    auth = build_auth(LockedAuthModel if before else AuthModel)
+    proxy = ProxyModel(stats_backend=build_stats(kind, before))
+    go = threading.Event()
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def worker(index):
+        go.wait()
+        done = 0
+        while not stop.is_set():
+            for _ in range(100):
+                auth.get_current_token()
+                proxy.update_last_request_time()
+                proxy.increment_request_counter()
+            done += 100
+        counts[index] = done
+
+    def reader():
+        go.wait()
+        while not stop.is_set():
+            proxy.get_statistics()
+            auth.get_statistics()
+            auth.get_all_accounts()
+            time.sleep(0.001)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=reader))
+    for thread in workers:
+        thread.start()
+    start = time.perf_counter()
+    go.set()
+    time.sleep(seconds)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    proxy.close()
+    return sum(counts) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'hilos':>5} {'antes':>12} {'después':>12} {'mejora':>8}")
+    for kind in ("local", "shared"):
+        for threads in args.threads:
+            before = run(threads, args.seconds, kind, before=True)
+            after = run(threads, args.seconds, kind, before=False)
+            print(
+                f"{kind:<8} {threads:>5} {before:>10.0f}/s {after:>10.0f}/s "
+                f"{after / before:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
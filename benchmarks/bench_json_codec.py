@@ -0,0 +1,96 @@
+"""
+Micro-benchmark de los codecs JSON - CoProx
+
+PROPÓSITO:
+Compara el coste de parsear solicitudes y serializar respuestas con cada codec de
+json_service.py sobre payloads de chat realistas (50 mensajes por conversación).
+
+FUNCIONAMIENTO:
+- Genera una conversación con mensajes system/user/assistant de longitud variable
+- Mide loads (cuerpo del cliente), dumps (cuerpo hacia la API) y el camino
+  anterior del proxy (request.json + json= de requests, ambos con stdlib)
+- Imprime microsegundos por operación y el tamaño de la salida
+
+USO:
+    python benchmarks/bench_json_codec.py [--messages 50] [--repeat 2000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services import json_service  # noqa: E402
+from src.services.json_service import OrjsonCodec, StdlibCodec  # noqa: E402
+
+WORDS = (
+    "def class return import proxy token quota model request response stream "
+    "cuenta solicitud límite añadir función variable ñandú café ✓"
+).split()
+
+
+def build_payload(messages: int, seed: int = 7) -> dict:
+    """Construye una solicitud de chat con el número de mensajes indicado"""
+    rng = random.Random(seed)
+    conversation = [{"role": "system", "content": "You are a helpful coding assistant."}]
+    for i in range(messages - 1):
+        role = "user" if i % 2 == 0 else "assistant"
+        length = rng.randint(20, 400)
+        content = " ".join(rng.choice(WORDS) for _ in range(length))
+        conversation.append({"role": role, "content": content})
+    return {
+        "model": "gpt-4o",
+        "messages": conversation,
+        "temperature": 0.2,
+        "top_p": 1,
+        "max_tokens": 4096,
+        "stream": False,
+    }
+
+
+def bench(label: str, func, repeat: int) -> float:
+    """Ejecuta func repeat veces (mejor de 5) y devuelve µs por operación"""
+    best = min(timeit.repeat(func, number=repeat, repeat=5))
+    per_op = best / repeat * 1e6
+    print(f"  {label:<38} {per_op:9.1f} µs/op")
+    return per_op
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = build_payload(args.messages)
+    body = json.dumps(payload).encode("utf-8")
+    print(f"Payload: {args.messages} mensajes, {len(body) / 1024:.1f} KiB\n")
+
+    print("Camino anterior (request.json + json= de requests)")
+    baseline = bench(
+        "json.loads + json.dumps",
+        lambda: (json.loads(body), json.dumps(payload).encode("utf-8")),
+        args.repeat,
+    )
+    print()
+
+    codecs = [StdlibCodec()]
+    if json_service.orjson is not None:
+        codecs.append(OrjsonCodec())
+    else:
+        print("orjson no está instalado: solo se mide el codec estándar\n")
+
+    for codec in codecs:
+        print(f"Codec {codec.name}")
+        loads = bench("loads (cuerpo del cliente)", lambda c=codec: c.loads(body), args.repeat)
+        dumps = bench("dumps compacto (hacia la API)", lambda c=codec: c.dumps(payload), args.repeat)
+        print(f"  {'salida compacta':<38} {len(codec.dumps(payload)) / 1024:9.1f} KiB")
+        print(f"  {'total vs camino anterior':<38} {baseline / (loads + dumps):9.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark del refresco de cuotas de todo el pool de cuentas - CoProx
+
+PROPÓSITO:
+Compara el tiempo de refrescar la cuota de N cuentas verificándolas una a una
+(como verify_specific_token en un bucle) con QuotaRefreshService, que las
+verifica en paralelo y aplica el resultado en una sola actualización.
+
+FUNCIONAMIENTO:
+- La verificación se simula con una espera de --latency segundos, el tiempo
+  típico de ida y vuelta a copilot_internal/v2/token
+- "serie": una verificación tras otra y update_account_quota por cuenta
+- "paralelo": QuotaRefreshService.refresh_all con los límites configurados
+- Imprime el tiempo de cada estrategia y la mejora
+
+USO:
+    python benchmarks/bench_quota_refresh.py [--accounts 500] [--latency 0.02]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.auth_model import AuthModel  # noqa: E402
+from src.models.config_model import QUOTA_REFRESH_PER_HOST, QUOTA_REFRESH_WORKERS  # noqa: E402
+from src.services.quota_refresh_service import QuotaRefreshService  # noqa: E402
+
+
+def build_auth(accounts: int) -> AuthModel:
+    """Crea un AuthModel con el número de cuentas indicado"""
+    auth = AuthModel()
+    for i in range(accounts):
+        auth.add_account(f"ghu_benchmark{i:010d}abcdefghij", quota_remaining=1, quota_total=1)
+    return auth
+
+
+def make_verify(latency: float):
+    """Verificación simulada con la latencia indicada"""
+    def verify(token):
+        time.sleep(latency)
+        return {"token": "tid=x", "limited_user_quotas": {"chat": 50}}
+    return verify
+
+
+def run_serial(auth: AuthModel, verify) -> float:
+    """Verifica las cuentas una a una y retorna los segundos empleados"""
+    start = time.perf_counter()
+    for token in list(auth.get_all_accounts()):
+        chat = verify(token)["limited_user_quotas"]["chat"]
+        auth.update_account_quota(token, chat, chat)
+    return time.perf_counter() - start
+
+
+def run_parallel(auth: AuthModel, verify) -> float:
+    """Verifica las cuentas con QuotaRefreshService y retorna los segundos"""
+    service = QuotaRefreshService(auth, verify)
+    return service.refresh_all()['duration']
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    verify = make_verify(args.latency)
+    serial = run_serial(build_auth(args.accounts), verify)
+    parallel = run_parallel(build_auth(args.accounts), verify)
+
+    print(
+        f"{args.accounts} cuentas, latencia {args.latency * 1000:.0f} ms, "
+        f"{QUOTA_REFRESH_WORKERS} hilos, {QUOTA_REFRESH_PER_HOST} por host"
+    )
+    print(f"serie:    {serial:8.2f} s")
+    print(f"paralelo: {parallel:8.2f} s")
+    print(f"mejora:   {serial / parallel:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,780 @@
+"""
+Controlador del Proxy Asíncrono - CoProx
+
+PROPÓSITO:
+Este controlador implementa el motor "asyncio" del servidor proxy: una aplicación
+ASGI que atiende los mismos endpoints que la aplicación Flask sin dedicar un hilo
+del sistema a cada solicitud en curso.
+
+FUNCIONAMIENTO:
+- Expone /v1/chat/completions, /chat/completions (POST) y /models (GET)
+- Reutiliza la validación, reescritura y formateo de ProxyController
+- Reenvía a la API de Copilot con un cliente HTTP asíncrono compartido
+- Reenvía respuestas en streaming (SSE) a medida que llegan
+- Reserva un hueco en la cuenta menos cargada antes de llamar a la API, esperando
+  turno sin bloquear el event loop si todas están al límite
+- Aplica el límite adaptativo de concurrencia hacia la API de ProxyController:
+  las solicitudes sobrantes reciben 429 con Retry-After
+- Se sirve con uvicorn dentro del proceso del servidor; al parar (lifespan)
+  cierra el proceso con ProxyController.shutdown_server_process
+
+PARÁMETROS DE ENTRADA:
+- proxy_controller: ProxyController cuyos métodos y modelos se reutilizan
+- http_service: AsyncHttpService opcional (inyectable para tests)
+- scope/receive/send: Interfaz ASGI estándar
+
+SALIDA ESPERADA:
+- Respuestas HTTP idénticas a las del motor Flask+Waitress
+
+PROCESAMIENTO DE DATOS:
+- Lee el cuerpo de la solicitud y lo parsea con el codec JSON del proxy
+- Valida con ProxyController.validate_chat_request
+- Reescribe el modelo con ProxyController.rewrite_model_name
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Utiliza: proxy_controller.py (validación, formateo y modelos)
+- Utiliza: async_http_service.py (comunicación asíncrona con la API)
+- Utiliza: admission_service.py (solicitudes en curso por cuenta)
+- Actualiza: proxy_model.py (a través de ProxyController)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- ProxyController.start_server(engine="asyncio") lo arranca en el proceso servidor
+"""
+
+import asyncio
+import socket
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - dependencia opcional
+    httpx = None
+
+from src.models.config_model import API_URL, HEADERS_BASE, SSE_CONTENT_TYPE, UPSTREAM_LIMIT_RETRY_AFTER
+from src.models.models_cache_model import ModelsCacheEntry, ModelsCacheModel
+from src.services.admission_service import AccountLease
+from src.services.async_http_service import AsyncHttpService
+
+if TYPE_CHECKING:
+    from src.controllers.proxy_controller import ProxyController
+
+# Errores esperables al hablar con la API (red y parseo de respuesta)
+_UPSTREAM_ERRORS: tuple = (ValueError, TypeError, KeyError)
+if httpx is not None:
+    _UPSTREAM_ERRORS = (httpx.HTTPError,) + _UPSTREAM_ERRORS
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class AsyncProxyController:
+    """
+    Aplicación ASGI del proxy que delega la lógica en ProxyController.
+    """
+
+    CHAT_PATHS = ("/v1/chat/completions", "/chat/completions")
+    MODELS_PATH = "/models"
+
+    def __init__(
+        self,
+        proxy_controller: "ProxyController",
+        http_service: Optional[AsyncHttpService] = None
+    ):
+        """
+        Inicializa la aplicación ASGI.
+
+        Args:
+            proxy_controller: Controlador con la lógica de validación y formateo
+            http_service: Cliente asíncrono. Si no se proporciona, se crea
+                         de forma perezosa dentro del event loop del servidor.
+        """
+        self._proxy = proxy_controller
+        self._http_service = http_service
+
+    def _get_http_service(self) -> AsyncHttpService:
+        """Obtiene el cliente asíncrono, creándolo en el loop actual"""
+        if self._http_service is None:
+            self._http_service = AsyncHttpService()
+        return self._http_service
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Punto de entrada ASGI"""
+        if scope["type"] == "lifespan":
+            await self._handle_lifespan(receive, send)
+            return
+
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"]
+        method = scope["method"]
+
+        try:
+            if path in self.CHAT_PATHS:
+                if method != "POST":
+                    await self._send_json(send, 405, self._proxy.format_error_response("Method Not Allowed"))
+                    return
+                body = await self._read_body(receive)
+                await self._handle_chat_completion(body, send)
+            elif path == self.MODELS_PATH:
+                if method != "GET":
+                    await self._send_json(send, 405, self._proxy.format_error_response("Method Not Allowed"))
+                    return
+                await self._handle_list_models(send, self._get_header(scope, b"if-none-match"))
+            else:
+                await self._send_json(send, 404, self._proxy.format_error_response("Not Found"))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            await self._send_json(send, 500, self._proxy.format_error_response(str(e)))
+
+    def _get_header(self, scope: Scope, name: bytes) -> Optional[str]:
+        """Obtiene un header de la solicitud ASGI (nombre en minúsculas)"""
+        for key, value in scope.get("headers", []):
+            if key.lower() == name:
+                return value.decode("latin-1")
+        return None
+
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        """Atiende los eventos de arranque y parada del servidor ASGI"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._http_service is not None:
+                    await self._http_service.aclose()
+                # uvicorn sustituye los handlers de señales del proceso servidor
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._proxy.shutdown_server_process
+                )
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        """Lee el cuerpo completo de la solicitud ASGI"""
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    async def _handle_chat_completion(self, body: bytes, send: Send) -> None:
+        """
+        Procesa una solicitud de chat con la misma lógica que el motor Flask.
+
+        Args:
+            body: Cuerpo crudo de la solicitud
+            send: Canal ASGI de respuesta
+        """
+        try:
+            data = self._proxy.get_json_codec().loads(body) if body else None
+        except ValueError:
+            data = None
+
+        if not isinstance(data, dict):
+            data = None
+
+        # Caché de respuestas: un acierto no necesita token ni API
+        cache_key = self._proxy.get_response_cache_key(data)
+        if cache_key is not None:
+            cached = self._proxy.lookup_cached_completion(cache_key)
+            if cached is not None:
+                proxy_model = self._proxy.get_proxy_model()
+                proxy_model.update_last_request_time()
+                self._proxy.increment_request_counter()
+                await self._send_bytes(send, 200, cached.body, cached.content_type)
+                return
+
+        is_valid, error = self._proxy.validate_chat_request(data)
+        if not is_valid:
+            await self._send_json(send, 400, self._proxy.format_error_response(error or "Invalid request"))
+            return
+        assert data is not None, "Data should not be None after validation"
+
+        if data.get("stream") and not self._proxy.is_streaming_enabled():
+            await self._send_json(send, 200, self._proxy.format_streaming_disabled_response())
+            return
+
+        if self._proxy.peek_current_token() is None:
+            await self._send_json(send, 503, self._proxy.format_error_response(
+                "No authentication tokens available"
+            ))
+            return
+
+        content = self._proxy.get_json_codec().dumps(data)
+
+        if data.get("stream"):
+            if not self._proxy.try_upstream_slot():
+                await self._send_bytes(send, 429, *self._upstream_limited())
+                return
+            try:
+                lease = await self._acquire_account()
+                if lease is None:
+                    await self._send_json(send, 503, self._busy_error())
+                    return
+                try:
+                    await self._stream_chat_completion(data, self._chat_headers(lease.token), content, send, lease)
+                finally:
+                    lease.release()
+            finally:
+                self._proxy.release_upstream_slot()
+            return
+
+        coalescing = self._proxy.get_coalescing_service()
+        if coalescing is None:
+            status, body, content_type, extra_headers = await self._complete_chat_with_account(
+                data, content, cache_key
+            )
+        else:
+            # Las solicitudes idénticas en curso comparten la llamada a la API
+            # (y solo la primera reserva cuenta y hueco hacia la API)
+            key = cache_key if cache_key is not None else coalescing.make_key(data)
+            (status, body, content_type, extra_headers), coalesced = await coalescing.run_async(
+                key,
+                lambda: self._complete_chat_with_account(data, content, cache_key)
+            )
+            if coalesced:
+                proxy_model = self._proxy.get_proxy_model()
+                proxy_model.record_coalesced_request()
+                proxy_model.update_last_request_time()
+                self._proxy.increment_request_counter()
+
+        await self._send_bytes(send, status, body, content_type, extra_headers)
+
+    async def _acquire_account(self) -> Optional[AccountLease]:
+        """
+        Reserva la cuenta que atenderá una solicitud (ver
+        ProxyController._acquire_account) sin bloquear el event loop.
+
+        Returns:
+            Reserva de la cuenta, o None si no hay cuenta con hueco
+        """
+        admission = self._proxy.get_admission_service()
+        if admission is not None:
+            return await admission.acquire_async()
+        token = self._proxy.get_current_token()
+        return None if token is None else AccountLease(None, token)
+
+    def _chat_headers(self, token: str) -> Dict[str, str]:
+        """Construye los headers de /chat/completions para una cuenta"""
+        return {
+            "authorization": f"Bearer {self._proxy.get_credential(token)}",
+            "content-type": "application/json",
+            **HEADERS_BASE
+        }
+
+    def _busy_error(self) -> Dict:
+        """Error devuelto cuando ninguna cuenta tiene hueco"""
+        return self._proxy.format_error_response("All accounts are busy, try again later")
+
+    def _upstream_limited(self) -> Tuple[bytes, str, Tuple[Tuple[bytes, bytes], ...]]:
+        """
+        Respuesta 429 para una solicitud rechazada por el límite de
+        concurrencia hacia la API.
+
+        Returns:
+            Tupla inmutable (cuerpo, content_type, headers con Retry-After)
+        """
+        body = self._proxy.get_json_codec().dumps(self._proxy.format_upstream_limited_response())
+        return body, "application/json", ((b"retry-after", str(UPSTREAM_LIMIT_RETRY_AFTER).encode("latin-1")),)
+
+    async def _complete_chat_with_account(
+        self,
+        data: Dict,
+        content: bytes,
+        cache_key: Optional[str]
+    ) -> Tuple[int, bytes, str, Tuple[Tuple[bytes, bytes], ...]]:
+        """
+        Reserva un hueco hacia la API y una cuenta, y obtiene la respuesta
+        completa con ella.
+
+        Args:
+            data: Datos validados de la solicitud
+            content: Cuerpo JSON serializado
+            cache_key: Clave para guardar la respuesta en caché (None si no aplica)
+
+        Returns:
+            Tupla inmutable (status_code, cuerpo, content_type, headers
+            extra); 429 si se alcanzó el límite de concurrencia, 503 si
+            ninguna cuenta tiene hueco
+        """
+        if not self._proxy.try_upstream_slot():
+            return (429, *self._upstream_limited())
+        try:
+            lease = await self._acquire_account()
+            if lease is None:
+                return 503, self._proxy.get_json_codec().dumps(self._busy_error()), "application/json", ()
+            try:
+                status, body, content_type = await self._complete_chat(
+                    data, self._chat_headers(lease.token), content, cache_key, lease
+                )
+                return status, body, content_type, ()
+            finally:
+                lease.release()
+        finally:
+            self._proxy.release_upstream_slot()
+
+    async def _complete_chat(
+        self,
+        data: Dict,
+        headers: Dict[str, str],
+        content: bytes,
+        cache_key: Optional[str],
+        lease: Optional[AccountLease] = None
+    ) -> Tuple[int, bytes, str]:
+        """
+        Obtiene la respuesta completa de una solicitud sin streaming.
+
+        Args:
+            data: Datos validados de la solicitud
+            headers: Headers ya construidos
+            content: Cuerpo JSON serializado
+            cache_key: Clave para guardar la respuesta en caché (None si no aplica)
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+
+        Returns:
+            Tupla inmutable (status_code, cuerpo, content_type)
+        """
+        if self._proxy.is_passthrough_enabled():
+            return await self._passthrough_chat_completion(data, headers, content, cache_key, lease)
+
+        response = await self._forward_to_copilot(headers, content, lease)
+
+        proxy_model = self._proxy.get_proxy_model()
+        proxy_model.update_last_request_time()
+
+        response = self._proxy.rewrite_model_name(data, response)
+        formatted = self._proxy.format_openai_response(response)
+
+        self._proxy.increment_request_counter()
+
+        body = self._proxy.get_json_codec().dumps(formatted)
+        if "error" not in formatted:
+            self._proxy.store_cached_completion(cache_key, body, "application/json")
+        return 200, body, "application/json"
+
+    async def _forward_to_copilot(
+        self,
+        headers: Dict[str, str],
+        content: bytes,
+        lease: Optional[AccountLease] = None
+    ) -> Dict:
+        """
+        Reenvía la solicitud a la API, con el mismo manejo de errores que
+        ProxyController.forward_to_copilot.
+
+        Args:
+            headers: Headers ya construidos
+            content: Cuerpo JSON serializado
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+
+        Returns:
+            Respuesta de la API o error formateado
+        """
+        try:
+            resp = await self._post_chat_completion(headers, content, lease)
+            return resp.json()
+        except _UPSTREAM_ERRORS as e:
+            return self._format_upstream_error(e)
+
+    async def _post_chat_completion(
+        self,
+        headers: Dict[str, str],
+        content: bytes,
+        lease: Optional[AccountLease] = None
+    ) -> Any:
+        """
+        Envía una solicitud a /chat/completions con failover de cuenta
+        (ver ProxyController._post_chat_completion).
+
+        Args:
+            headers: Headers ya construidos con el token inicial
+            content: Cuerpo JSON serializado
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+
+        Returns:
+            httpx.Response de la última cuenta intentada
+        """
+        attempts = 0
+        session_renewed = False
+        while True:
+            started = time.monotonic()
+            try:
+                resp = await self._get_http_service().post(
+                    f"{API_URL}/chat/completions",
+                    headers=headers,
+                    content=content
+                )
+            except _UPSTREAM_ERRORS:
+                self._proxy.record_upstream_call(started, None)
+                raise
+            self._proxy.record_upstream_call(started, resp.status_code)
+            if resp.status_code == 401 and not session_renewed:
+                session_renewed = True
+                renewed_headers = await self._renewed_session_headers(headers)
+                if renewed_headers is not None:
+                    headers = renewed_headers
+                    continue
+
+            attempts += 1
+            retry_headers = self._failover_headers(headers, resp.status_code, attempts, resp.headers, lease)
+            if retry_headers is None:
+                self._proxy.observe_quota(self._account_for(headers), resp)
+                return resp
+            headers = retry_headers
+            session_renewed = False
+
+    def _failover_headers(
+        self,
+        headers: Dict[str, str],
+        status_code: int,
+        attempts: int,
+        response_headers: Optional[Mapping[str, str]] = None,
+        lease: Optional[AccountLease] = None
+    ) -> Optional[Dict[str, str]]:
+        """
+        Obtiene los headers para reintentar con la siguiente cuenta.
+
+        Args:
+            headers: Headers del intento anterior
+            status_code: Código HTTP recibido
+            attempts: Intentos realizados
+            response_headers: Headers de la respuesta (para Retry-After)
+            lease: Reserva de la solicitud, que pasa a la siguiente cuenta
+
+        Returns:
+            Headers con el token de la siguiente cuenta, o None si no hay
+            que reintentar
+        """
+        token = self._account_for(headers)
+        next_token = self._proxy.next_failover_token(token, status_code, attempts, response_headers, lease)
+        if next_token is None:
+            return None
+        return {**headers, "authorization": f"Bearer {self._proxy.get_credential(next_token)}"}
+
+    def _account_for(self, headers: Dict[str, str]) -> str:
+        """Obtiene el token OAuth de la cuenta cuya credencial llevan los headers"""
+        credential = headers["authorization"][len("Bearer "):]
+        session_tokens = self._proxy.get_session_token_service()
+        if session_tokens is None:
+            return credential
+        return session_tokens.account_for(credential)
+
+    async def _renewed_session_headers(self, headers: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        Obtiene headers con un token de sesión renovado tras un 401.
+
+        El intercambio usa el cliente síncrono, por lo que se ejecuta en el
+        executor por defecto para no bloquear el event loop.
+
+        Args:
+            headers: Headers del intento rechazado
+
+        Returns:
+            Headers con el nuevo token de sesión, o None si no hay que
+            reintentar con la misma cuenta
+        """
+        credential = headers["authorization"][len("Bearer "):]
+        token = self._account_for(headers)
+        renewed = await asyncio.get_running_loop().run_in_executor(
+            None, self._proxy.renew_credential, token, credential
+        )
+        if renewed is None:
+            return None
+        return {**headers, "authorization": f"Bearer {renewed}"}
+
+    async def _passthrough_chat_completion(
+        self,
+        data: Dict,
+        headers: Dict[str, str],
+        content: bytes,
+        cache_key: Optional[str] = None,
+        lease: Optional[AccountLease] = None
+    ) -> Tuple[int, bytes, str]:
+        """
+        Obtiene el cuerpo de la API sin parsear el JSON.
+
+        Args:
+            data: Datos validados de la solicitud
+            headers: Headers ya construidos
+            content: Cuerpo JSON serializado
+            cache_key: Clave para guardar la respuesta en caché (None si no aplica)
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+
+        Returns:
+            Tupla (status_code, cuerpo, content_type)
+        """
+        codec = self._proxy.get_json_codec()
+        try:
+            resp = await self._post_chat_completion(headers, content, lease)
+        except _UPSTREAM_ERRORS as e:
+            return 502, codec.dumps(self._format_upstream_error(e)), "application/json"
+
+        proxy_model = self._proxy.get_proxy_model()
+        proxy_model.update_last_request_time()
+        self._proxy.increment_request_counter()
+
+        body = resp.content
+        content_type = resp.headers.get("content-type", "application/json")
+        target_model = self._proxy.get_rewritten_model(data)
+        if target_model is not None:
+            patched = self._proxy.rewrite_model_bytes(body, target_model)
+            if patched is None:
+                try:
+                    response = self._proxy.rewrite_model_name(data, codec.loads(body))
+                except (ValueError, TypeError) as e:
+                    return 502, codec.dumps(self._format_upstream_error(e)), "application/json"
+                patched = codec.dumps(self._proxy.format_openai_response(response))
+                content_type = "application/json"
+            body = patched
+
+        if resp.status_code == 200:
+            self._proxy.store_cached_completion(cache_key, body, content_type)
+
+        return resp.status_code, body, content_type
+
+    def _format_upstream_error(self, error: Exception) -> Dict:
+        """Traduce excepciones de httpx a errores formateados"""
+        if httpx is not None:
+            if isinstance(error, httpx.TimeoutException):
+                return self._proxy.format_error_response("Request timeout: API took too long to respond")
+            if isinstance(error, httpx.ConnectError):
+                return self._proxy.format_error_response("Connection error: Could not reach GitHub Copilot API")
+            if isinstance(error, httpx.HTTPError):
+                return self._proxy.format_error_response(f"API request failed: {str(error)}")
+        return self._proxy.format_error_response(f"Invalid API response: {str(error)}")
+
+    async def _stream_chat_completion(
+        self,
+        data: Dict,
+        headers: Dict[str, str],
+        content: bytes,
+        send: Send,
+        lease: Optional[AccountLease] = None
+    ) -> None:
+        """
+        Reenvía el SSE de la API al cliente chunk a chunk.
+
+        Args:
+            data: Datos validados de la solicitud
+            headers: Headers ya construidos
+            content: Cuerpo JSON serializado
+            send: Canal ASGI de respuesta
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+        """
+        headers = {**headers, "accept": SSE_CONTENT_TYPE}
+        rewrite = self._proxy.get_rewritten_model(data) is not None
+        started = False
+        attempts = 0
+        session_renewed = False
+        call_started: Optional[float] = None
+
+        try:
+            while True:
+                call_started = time.monotonic()
+                async with self._get_http_service().stream(
+                    f"{API_URL}/chat/completions",
+                    headers=headers,
+                    content=content
+                ) as resp:
+                    self._proxy.record_upstream_call(call_started, resp.status_code)
+                    call_started = None
+                    if resp.status_code == 401 and not session_renewed:
+                        session_renewed = True
+                        renewed_headers = await self._renewed_session_headers(headers)
+                        if renewed_headers is not None:
+                            headers = renewed_headers
+                            continue
+
+                    attempts += 1
+                    if resp.status_code != 200:
+                        retry_headers = self._failover_headers(
+                            headers, resp.status_code, attempts, resp.headers, lease
+                        )
+                        if retry_headers is not None:
+                            headers = retry_headers
+                            session_renewed = False
+                            continue
+
+                        body = await resp.aread()
+                        await self._send_bytes(
+                            send,
+                            resp.status_code,
+                            body,
+                            resp.headers.get("content-type", "application/json")
+                        )
+                        return
+
+                    self._proxy.observe_quota(self._account_for(headers), resp)
+                    proxy_model = self._proxy.get_proxy_model()
+                    proxy_model.update_last_request_time()
+                    self._proxy.increment_request_counter()
+
+                    started = True
+                    await send({
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": [
+                            (b"content-type", SSE_CONTENT_TYPE.encode("latin-1")),
+                            (b"cache-control", b"no-cache"),
+                            (b"x-accel-buffering", b"no"),
+                        ],
+                    })
+                    async for text_line in resp.aiter_lines():
+                        line = text_line.encode("utf-8")
+                        if rewrite and line.startswith(b"data:"):
+                            line = self._proxy.rewrite_sse_data_line(data, line)
+                        await send({
+                            "type": "http.response.body",
+                            "body": line + b"\n",
+                            "more_body": True,
+                        })
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+                    return
+        except _UPSTREAM_ERRORS as e:
+            if call_started is not None:
+                # Falló la llamada antes de recibir la respuesta
+                self._proxy.record_upstream_call(call_started, None)
+            if started:
+                # El stream ya comenzó: solo se puede cerrar la respuesta
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            else:
+                await self._send_json(send, 500, self._format_upstream_error(e))
+
+    async def _handle_list_models(self, send: Send, if_none_match: Optional[str] = None) -> None:
+        """
+        Procesa solicitud de listado de modelos, usando la caché de /models
+        del proxy cuando está activa.
+
+        Args:
+            send: Canal ASGI de respuesta
+            if_none_match: Header If-None-Match del cliente
+        """
+        token = self._proxy.peek_current_token()
+        if token is None:
+            await self._send_json(send, 503, self._proxy.format_error_response(
+                "No authentication tokens available"
+            ))
+            return
+
+        models_cache = self._proxy.get_models_cache()
+        if models_cache is not None:
+            entry, needs_refresh = models_cache.lookup()
+            if entry is not None:
+                if needs_refresh:
+                    # Stale-while-revalidate: responder ya y refrescar en segundo plano
+                    asyncio.ensure_future(self._refresh_models_cache(models_cache, token))
+                await self._send_models_entry(send, entry, if_none_match)
+                return
+
+        try:
+            resp = await self._fetch_models(token)
+        except _UPSTREAM_ERRORS as e:
+            error = self._format_upstream_error(e)
+            error["error"]["message"] = f"API request failed: {error['error']['message']}"
+            await self._send_json(send, 500, error)
+            return
+
+        if models_cache is not None and resp.status_code == 200:
+            entry = models_cache.store(resp.text)
+            await self._send_models_entry(send, entry, if_none_match)
+            return
+
+        await self._send_bytes(send, resp.status_code, resp.content, "text/html; charset=utf-8")
+
+    async def _fetch_models(self, token: str) -> Any:
+        """Obtiene la lista de modelos de la API"""
+        return await self._get_http_service().get(
+            f"{API_URL}/models",
+            headers={
+                "authorization": f"Bearer {self._proxy.get_credential(token)}",
+                **HEADERS_BASE
+            }
+        )
+
+    async def _refresh_models_cache(self, models_cache: ModelsCacheModel, token: str) -> None:
+        """Refresca la caché de /models; ante errores conserva la entrada anterior"""
+        try:
+            resp = await self._fetch_models(token)
+            if resp.status_code == 200:
+                models_cache.store(resp.text)
+        except _UPSTREAM_ERRORS:
+            pass
+        finally:
+            models_cache.finish_refresh()
+
+    async def _send_models_entry(
+        self,
+        send: Send,
+        entry: ModelsCacheEntry,
+        if_none_match: Optional[str]
+    ) -> None:
+        """Envía la lista de modelos cacheada, o 304 si el cliente tiene el ETag"""
+        etag_header = [(b"etag", f'"{entry.etag}"'.encode("latin-1"))]
+        if ModelsCacheModel.etag_matches(if_none_match, entry.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": etag_header})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        await self._send_bytes(
+            send,
+            200,
+            entry.body.encode("utf-8"),
+            "text/html; charset=utf-8",
+            etag_header
+        )
+
+    async def _send_json(self, send: Send, status: int, payload: Dict) -> None:
+        """Envía una respuesta JSON completa"""
+        body = self._proxy.get_json_codec().dumps(payload)
+        await self._send_bytes(send, status, body, "application/json")
+
+    async def _send_bytes(
+        self,
+        send: Send,
+        status: int,
+        body: bytes,
+        content_type: str,
+        extra_headers: Sequence[Tuple[bytes, bytes]] = ()
+    ) -> None:
+        """Envía una respuesta completa con el Content-Type indicado"""
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type.encode("latin-1")),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                *extra_headers,
+            ],
+        })
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+    def serve(self, host: str, port: int, sock: Optional[socket.socket] = None) -> None:
+        """
+        Sirve la aplicación con uvicorn (bloqueante).
+
+        Args:
+            host: Host donde escuchar
+            port: Puerto donde escuchar
+            sock: Socket ya enlazado (modo prefork con SO_REUSEPORT)
+
+        Raises:
+            RuntimeError: Si uvicorn no está instalado
+        """
+        try:
+            import uvicorn
+        except ImportError as e:
+            raise RuntimeError(
+                "El motor asyncio requiere uvicorn: pip install 'coprox[async]'"
+            ) from e
+
+        if sock is None:
+            uvicorn.run(self, host=host, port=port, loop="asyncio", log_level="warning")
+            return
+
+        config = uvicorn.Config(self, loop="asyncio", log_level="warning")
+        uvicorn.Server(config).run(sockets=[sock])
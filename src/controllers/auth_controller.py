@@ -10,6 +10,9 @@ FUNCIONAMIENTO:
 - Gestiona la rotación automática de tokens cuando se agotan cuotas
 - Mantiene el estado de autenticación actualizado en los modelos
 - Implementa lógica de recuperación de cuentas agotadas
+- Refresca periódicamente la cuota de todas las cuentas en paralelo (al
+  arrancar con cuentas persistidas, solo las de verificación caducada)
+- Vigila los directorios de tokens para cargar y retirar cuentas al momento
 
 PARÁMETROS DE ENTRADA:
 - add_account_request: Boolean para iniciar proceso de nueva cuenta
@@ -29,10 +32,15 @@ PROCESAMIENTO DE DATOS:
 - Actualiza auth_model con información de nuevas cuentas
 - Implementa lógica para detectar y manejar tokens expirados
 - Gestiona numeración secuencial de archivos de tokens
+- Revisa TokensAgotados/ en paralelo con una verificación por token, omite los
+  archivos sin cambios revisados recientemente y mueve fuera los recuperados;
+  en segundo plano repite la revisión cada RECOVERY_SCAN_INTERVAL segundos
 
 INTERACCIONES CON OTROS MÓDULOS:
 - Utiliza: oauth_service.py (autenticación OAuth)
 - Utiliza: file_service.py (guardar/leer tokens)
+- Utiliza: quota_refresh_service.py (refresco periódico de cuotas en paralelo)
+- Utiliza: token_watch_service.py (vigilancia de directorios de tokens)
 - Actualiza: auth_model.py (estado de autenticación)
 - Notifica a: auth_view.py (cambios en cuentas)
 - Coordina con: proxy_controller.py (tokens para solicitudes)
@@ -46,18 +54,36 @@ Metodología: Test-Driven Development (TDD)
 Fase: GREEN - Implementación que hace pasar los tests
 """
 
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Tuple
+import json
+import os
 import requests
+import shutil
+import threading
 import time
 import logging
 
+from src.models.account_store_model import create_account_store
 from src.models.auth_model import AuthModel
+from src.services.quota_refresh_service import QuotaRefreshService
+from src.services.token_watch_service import TokenWatchService
 from src.models.config_model import (
     CLIENT_ID, 
     OAUTH_SCOPE, 
     REQUEST_TIMEOUT,
     OAUTH_DEVICE_CODE_URL,
-    OAUTH_TOKEN_URL
+    OAUTH_TOKEN_URL,
+    COPILOT_TOKEN_URL,
+    QUOTA_REFRESH_INTERVAL,
+    RECOVERY_CHECK_WORKERS,
+    RECOVERY_RECHECK_INTERVAL,
+    RECOVERY_REJECTED_STATUS_CODES,
+    RECOVERY_SCAN_INTERVAL,
+    RECOVERY_STATE_FILE,
+    TOKEN_DIRECTORY,
+    TOKEN_FILE_EXTENSION,
+    TOKENS_EXHAUSTED_DIR
 )
 
 # Configurar logger
@@ -72,16 +98,33 @@ class AuthController:
     https://docs.github.com/en/apps/oauth-apps/building-oauth-apps/authorizing-oauth-apps#device-flow
     """
     
-    def __init__(self, auth_model: Optional[AuthModel] = None):
+    def __init__(
+        self,
+        auth_model: Optional[AuthModel] = None,
+        quota_refresher: Optional[QuotaRefreshService] = None
+    ):
         """
         Inicializa el controlador de autenticación.
         
         Args:
             auth_model: Modelo de autenticación opcional. Si no se proporciona,
-                       se crea uno por defecto.
+                       se crea uno por defecto (con el almacén persistente
+                       si ACCOUNT_STORE_ENABLED).
+            quota_refresher: Refresco de cuotas opcional. Si no se proporciona,
+                            se crea uno que verifica con verify_token_quota
+                            (su hilo no arranca hasta start_quota_refresh).
         """
-        self._auth_model = auth_model if auth_model is not None else AuthModel()
+        self._auth_model = auth_model if auth_model is not None else AuthModel(
+            store=create_account_store()
+        )
         self._device_code_data: Optional[Dict[str, Any]] = None
+        self._quota_refresher = quota_refresher if quota_refresher is not None else QuotaRefreshService(
+            self._auth_model,
+            self.verify_token_quota
+        )
+        self._token_watcher: Optional[TokenWatchService] = None
+        self._recovery_stop = threading.Event()
+        self._recovery_thread: Optional[threading.Thread] = None
     
     def request_device_code(self) -> Dict[str, Any]:
         """
@@ -338,7 +381,7 @@ class AuthController:
             from src.models.config_model import HEADERS_BASE
             
             response = requests.get(
-                "https://api.github.com/copilot_internal/v2/token",
+                COPILOT_TOKEN_URL,
                 headers={
                     "authorization": f"token {access_token}",
                     **HEADERS_BASE
@@ -348,7 +391,8 @@ class AuthController:
             
             if response.status_code != 200:
                 raise requests.RequestException(
-                    f"GitHub Copilot API returned status {response.status_code}"
+                    f"GitHub Copilot API returned status {response.status_code}",
+                    response=response
                 )
             
             data = response.json()
@@ -360,7 +404,10 @@ class AuthController:
             return data
             
         except requests.RequestException as e:
-            raise requests.RequestException(f"Error verifying token quota: {e}") from e
+            raise requests.RequestException(
+                f"Error verifying token quota: {e}",
+                response=e.response
+            ) from e
         except ValueError as e:
             raise ValueError(f"Invalid quota response: {e}") from e
     
@@ -405,7 +452,7 @@ class AuthController:
         # Paso 3: Verificar si el token ya existe (detectar duplicados)
         try:
             # Intentar obtener el token actual - si existe, es duplicado
-            current_token = self._auth_model.get_current_token()
+            current_token = self._auth_model.peek_current_token()
             is_duplicate = (current_token == access_token)
         except (KeyError, ValueError):
             # No hay tokens, no es duplicado
@@ -463,19 +510,149 @@ class AuthController:
             logger.warning("Error verificando token: %s", e)
             return False
     
-    def check_exhausted_tokens(self, exhausted_dir: Optional[str] = None) -> list[str]:
+    def refresh_all_quotas(self) -> Dict[str, Any]:
+        """
+        Verifica en paralelo la cuota de todas las cuentas y actualiza
+        AuthModel en una sola operación.
+        
+        Returns:
+            Dict con el resultado del refresco:
+                - checked: int - Cuentas verificadas
+                - updated: int - Cuentas actualizadas
+                - failed: int - Verificaciones fallidas (conservan su cuota)
+                - duration: float - Segundos empleados
+        
+        Example:
+            >>> controller = AuthController()
+            >>> result = controller.refresh_all_quotas()
+            >>> print(f"{result['updated']} cuentas en {result['duration']:.1f}s")
+        """
+        return self._quota_refresher.refresh_all()
+    
+    def refresh_stale_quotas(self, max_age: float = QUOTA_REFRESH_INTERVAL) -> Dict[str, Any]:
+        """
+        Verifica solo las cuentas sin verificación reciente (p. ej. al
+        arrancar con las cuentas cargadas del almacén persistente).
+        
+        Args:
+            max_age: Segundos tras los que una verificación caduca
+        
+        Returns:
+            Dict con el resultado del refresco (ver refresh_all_quotas)
+        """
+        return self._quota_refresher.refresh_all(self._auth_model.get_stale_accounts(max_age))
+    
+    def start_quota_refresh(self, refresh_stale: bool = False) -> None:
+        """
+        Arranca el refresco periódico de cuotas en segundo plano.
+        
+        Args:
+            refresh_stale: Si True, el hilo verifica primero las cuentas sin
+                          verificación reciente (p. ej. cargadas del almacén)
+        """
+        first = self._auth_model.get_stale_accounts(QUOTA_REFRESH_INTERVAL) if refresh_stale else None
+        self._quota_refresher.start(first)
+    
+    def stop_quota_refresh(self) -> None:
+        """Detiene el refresco periódico de cuotas"""
+        self._quota_refresher.stop()
+    
+    def get_quota_refresher(self) -> QuotaRefreshService:
+        """Retorna el servicio de refresco de cuotas"""
+        return self._quota_refresher
+    
+    def start_token_watch(
+        self,
+        token_dir: Optional[str] = None,
+        exhausted_dir: Optional[str] = None
+    ) -> TokenWatchService:
+        """
+        Carga los tokens del disco y vigila sus directorios en segundo plano.
+        
+        Las cuentas nuevas se verifican con el refresco de cuotas en cuanto
+        aparecen; las de archivos eliminados se retiran de AuthModel.
+        
+        Args:
+            token_dir: Directorio de tokens activos (por defecto TOKEN_DIRECTORY)
+            exhausted_dir: Directorio de tokens agotados (por defecto TOKENS_EXHAUSTED_DIR)
+        
+        Returns:
+            TokenWatchService: El servicio de vigilancia en marcha
+        """
+        if self._token_watcher is None:
+            self._token_watcher = TokenWatchService(
+                self._auth_model,
+                token_dir=token_dir or TOKEN_DIRECTORY,
+                exhausted_dir=exhausted_dir or TOKENS_EXHAUSTED_DIR,
+                on_added=self._quota_refresher.refresh_all
+            )
+        self._token_watcher.start()
+        return self._token_watcher
+    
+    def stop_token_watch(self) -> None:
+        """Detiene la vigilancia de los directorios de tokens"""
+        if self._token_watcher is not None:
+            self._token_watcher.stop()
+    
+    def start_exhausted_recovery(self, interval: float = RECOVERY_SCAN_INTERVAL) -> None:
+        """
+        Revisa TokensAgotados/ en segundo plano: al arrancar y después cada
+        interval segundos (ver check_exhausted_tokens).
+        
+        Args:
+            interval: Segundos entre revisiones
+        """
+        if self._recovery_thread is not None:
+            return
+        self._recovery_stop.clear()
+        self._recovery_thread = threading.Thread(
+            target=self._run_exhausted_recovery,
+            args=(interval,),
+            name="token-recovery",
+            daemon=True
+        )
+        self._recovery_thread.start()
+    
+    def stop_exhausted_recovery(self) -> None:
+        """Detiene la revisión periódica de TokensAgotados/"""
+        thread, self._recovery_thread = self._recovery_thread, None
+        self._recovery_stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=30)
+    
+    def _run_exhausted_recovery(self, interval: float) -> None:
+        """Bucle del hilo de revisión de TokensAgotados/"""
+        while True:
+            try:
+                self.check_exhausted_tokens()
+            except Exception as e:  # pylint: disable=broad-except
+                # Un error en una revisión no debe detener las siguientes
+                logger.error("Error revisando tokens agotados: %s", e)
+            if self._recovery_stop.wait(interval):
+                return
+    
+    def check_exhausted_tokens(
+        self,
+        exhausted_dir: Optional[str] = None,
+        restore_dir: Optional[str] = None
+    ) -> list[str]:
         """
         Verifica tokens en TokensAgotados/ y restaura los que tienen cuota.
         
         Este método:
-        1. Escanea la carpeta TokensAgotados/
-        2. Verifica la cuota de cada token
-        3. Restaura tokens con cuota disponible agregándolos al AuthModel
-        4. Actualiza las estadísticas del modelo
+        1. Escanea la carpeta TokensAgotados/ y omite los archivos sin cambios
+           verificados hace menos de RECOVERY_RECHECK_INTERVAL segundos
+        2. Verifica la cuota de cada token una sola vez, en paralelo (hasta
+           RECOVERY_CHECK_WORKERS verificaciones simultáneas)
+        3. Restaura tokens con cuota disponible agregándolos al AuthModel y
+           mueve su archivo fuera de TokensAgotados/
+        4. Guarda la última verificación de cada archivo en RECOVERY_STATE_FILE
         
         Args:
             exhausted_dir: Ruta a la carpeta de tokens exhaustos (opcional).
                           Por defecto usa "TokensAgotados"
+            restore_dir: Carpeta a la que se mueven los tokens restaurados
+                        (opcional). Por defecto la que contiene exhausted_dir
         
         Returns:
             Lista de tokens que fueron restaurados exitosamente
@@ -485,11 +662,11 @@ class AuthController:
             >>> restored = controller.check_exhausted_tokens()
             >>> print(f"Tokens restaurados: {len(restored)}")
         """
-        import os
-        
         # Usar directorio por defecto si no se especifica
         if exhausted_dir is None:
-            exhausted_dir = "TokensAgotados"
+            exhausted_dir = TOKENS_EXHAUSTED_DIR
+        if restore_dir is None:
+            restore_dir = os.path.dirname(os.path.abspath(exhausted_dir))
         
         logger.info("Verificando tokens exhaustos en: %s", exhausted_dir)
         
@@ -498,51 +675,203 @@ class AuthController:
             logger.info("Directorio %s no existe", exhausted_dir)
             return []
         
-        restored_tokens = []
-        
         try:
             # Obtener todos los archivos .copilot_token en la carpeta
-            token_files = [
+            token_files = sorted(
                 f for f in os.listdir(exhausted_dir)
-                if f.endswith(".copilot_token")
-            ]
+                if f.endswith(TOKEN_FILE_EXTENSION)
+            )
+        except OSError as e:
+            # Error accediendo a la carpeta
+            logger.error("Error accediendo a %s: %s", exhausted_dir, e)
+            return []
+        
+        state_path = os.path.join(exhausted_dir, RECOVERY_STATE_FILE)
+        state = self._load_recovery_state(state_path)
+        now = time.time()
+        
+        # Omitir archivos sin cambios verificados recientemente
+        next_state: Dict[str, Any] = {}
+        pending = []
+        for token_file in token_files:
+            token_path = os.path.join(exhausted_dir, token_file)
+            try:
+                file_stat = os.stat(token_path)
+            except OSError as e:
+                logger.warning("Error procesando %s: %s", token_file, e)
+                continue
             
-            logger.info("Encontrados %d archivos de tokens", len(token_files))
+            signature = [file_stat.st_mtime_ns, file_stat.st_size]
+            entry = state.get(token_file)
+            if (
+                isinstance(entry, dict)
+                and entry.get("signature") == signature
+                and now - entry.get("checked_at", 0) < RECOVERY_RECHECK_INTERVAL
+            ):
+                next_state[token_file] = entry
+                continue
+            pending.append((token_file, token_path, signature))
+        
+        logger.info(
+            "Encontrados %d archivos de tokens, %d por verificar",
+            len(token_files), len(pending)
+        )
+        
+        restored_tokens = []
+        if pending:
+            workers = min(RECOVERY_CHECK_WORKERS, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="token-recovery") as pool:
+                results = list(pool.map(
+                    self._check_exhausted_file,
+                    [token_path for _, token_path, _ in pending]
+                ))
             
-            for token_file in token_files:
-                try:
-                    # Leer el contenido del token
-                    token_path = os.path.join(exhausted_dir, token_file)
-                    with open(token_path, 'r', encoding='utf-8') as f:
-                        token = f.read().strip()
-                    
-                    # Verificar si el token tiene cuota
-                    if self.verify_specific_token(token):
-                        # Token tiene cuota - agregarlo al AuthModel
-                        quota_info = self.verify_token_quota(token)
-                        chat_quota = quota_info.get("limited_user_quotas", {}).get("chat", 0)
-                        
-                        self._auth_model.add_account(
-                            token=token,
-                            quota_remaining=chat_quota,
-                            quota_total=chat_quota
-                        )
-                        
-                        restored_tokens.append(token)
-                        logger.info("Token restaurado: %s", token_file)
-                        
-                        # Opcional: eliminar el archivo de TokensAgotados/
-                        # os.remove(token_path)
-                        
-                except (OSError, ValueError) as e:
-                    # Error leyendo un archivo específico - continuar con el siguiente
-                    logger.warning("Error procesando %s: %s", token_file, e)
+            for (token_file, token_path, signature), (token, chat_quota) in zip(pending, results):
+                if chat_quota is None:
+                    # Fallo transitorio: se vuelve a verificar en el próximo escaneo
                     continue
-            
-            logger.info("Proceso completado. Tokens restaurados: %d", len(restored_tokens))
-            return restored_tokens
-            
+                
+                if chat_quota > 0 and self._restore_exhausted_token(
+                    token, chat_quota, token_path, restore_dir
+                ):
+                    restored_tokens.append(token)
+                    logger.info("Token restaurado: %s", token_file)
+                    continue
+                
+                next_state[token_file] = {"signature": signature, "checked_at": now}
+        
+        self._save_recovery_state(state_path, next_state)
+        
+        logger.info("Proceso completado. Tokens restaurados: %d", len(restored_tokens))
+        return restored_tokens
+    
+    def _check_exhausted_file(self, token_path: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Lee un archivo de token agotado y verifica su cuota una sola vez.
+        
+        Args:
+            token_path: Ruta del archivo de token
+        
+        Returns:
+            Tupla (token, cuota de chat). La cuota es None si la lectura o la
+            verificación fallaron de forma transitoria (red, timeout, error de
+            la API), y 0 si el token no es válido, fue rechazado (401/403) o
+            sigue sin cuota
+        """
+        try:
+            with open(token_path, 'r', encoding='utf-8') as f:
+                token = f.read().strip()
+        except (OSError, ValueError) as e:
+            # Error leyendo un archivo específico - continuar con el siguiente
+            logger.warning("Error procesando %s: %s", token_path, e)
+            return None, None
+        
+        try:
+            quota_info = self.verify_token_quota(token)
+        except requests.RequestException as e:
+            if e.response is not None and e.response.status_code in RECOVERY_REJECTED_STATUS_CODES:
+                # Token revocado: se registra como verificado para no
+                # consultarlo de nuevo en cada escaneo
+                logger.warning("Token rechazado en %s: %s", token_path, e)
+                return token, 0
+            logger.warning("Error verificando token: %s", e)
+            return token, None
+        except ValueError as e:
+            logger.warning("Token inválido en %s: %s", token_path, e)
+            return token, 0
+        
+        return token, quota_info.get("limited_user_quotas", {}).get("chat", 0)
+    
+    def _restore_exhausted_token(
+        self,
+        token: str,
+        chat_quota: int,
+        token_path: str,
+        restore_dir: str
+    ) -> bool:
+        """
+        Agrega un token recuperado al AuthModel y mueve su archivo.
+        
+        Args:
+            token: Token con cuota disponible
+            chat_quota: Cuota de chat verificada
+            token_path: Ruta actual del archivo en TokensAgotados/
+            restore_dir: Carpeta de destino del archivo
+        
+        Returns:
+            True si el token se agregó al AuthModel
+        """
+        try:
+            self._auth_model.add_account(
+                token=token,
+                quota_remaining=chat_quota,
+                quota_total=chat_quota
+            )
+        except ValueError as e:
+            logger.warning("Token inválido en %s: %s", token_path, e)
+            return False
+        
+        try:
+            self._move_token_file(token_path, restore_dir)
         except OSError as e:
-            # Error accediendo a la carpeta
-            logger.error("Error accediendo a %s: %s", exhausted_dir, e)
-            return []
\ No newline at end of file
+            logger.warning("Token restaurado pero no se pudo mover %s: %s", token_path, e)
+        return True
+    
+    def _move_token_file(self, token_path: str, restore_dir: str) -> str:
+        """
+        Mueve un archivo de token sin sobrescribir otro con el mismo nombre.
+        
+        Args:
+            token_path: Ruta actual del archivo
+            restore_dir: Carpeta de destino
+        
+        Returns:
+            Ruta final del archivo
+        
+        Raises:
+            OSError: Si no se pudo mover el archivo
+        """
+        os.makedirs(restore_dir, exist_ok=True)
+        file_name = os.path.basename(token_path)
+        stem = file_name[:-len(TOKEN_FILE_EXTENSION)]
+        target = os.path.join(restore_dir, file_name)
+        suffix = 1
+        while os.path.lexists(target):
+            target = os.path.join(restore_dir, f"{stem}-{suffix}{TOKEN_FILE_EXTENSION}")
+            suffix += 1
+        shutil.move(token_path, target)
+        return target
+    
+    def _load_recovery_state(self, state_path: str) -> Dict[str, Any]:
+        """
+        Lee el estado de verificación de los archivos de tokens agotados.
+        
+        Args:
+            state_path: Ruta de RECOVERY_STATE_FILE
+        
+        Returns:
+            Diccionario nombre de archivo -> {signature, checked_at}, vacío si
+            no existe o no es válido
+        """
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+    
+    def _save_recovery_state(self, state_path: str, state: Dict[str, Any]) -> None:
+        """
+        Guarda el estado de verificación de forma atómica.
+        
+        Args:
+            state_path: Ruta de RECOVERY_STATE_FILE
+            state: Estado de los archivos que siguen en TokensAgotados/
+        """
+        temp_path = f"{state_path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, state_path)
+        except OSError as e:
+            logger.warning("No se pudo guardar %s: %s", state_path, e)
@@ -6,7 +6,7 @@ Este controlador gestiona el servidor HTTP proxy incluyendo endpoints Flask,
 servidor Waitress en background y toda la lógica de reenvío de solicitudes.
 
 FUNCIONAMIENTO:
-- Inicia y detiene el servidor Waitress en un hilo separado
+- Inicia y detiene el servidor (Waitress o asyncio) en un proceso separado
 - Define y maneja endpoints Flask (/v1/chat/completions, /models)
 - Coordina reenvío de solicitudes a la API oficial de GitHub Copilot
 - Implementa lógica de compatibilidad con clientes OpenAI
@@ -26,13 +26,31 @@ SALIDA ESPERADA:
 PROCESAMIENTO DE DATOS:
 - Procesa solicitudes HTTP entrantes y las valida
 - Reescribe nombres de modelo para compatibilidad con clientes
-- Maneja desactivación forzada de streaming
+- Reenvía respuestas en streaming (SSE) chunk a chunk sin acumular el cuerpo
+- Reenvía respuestas completas como bytes crudos, sin parsear el JSON
+- Parsea cada cuerpo una sola vez y serializa con json_service.py (orjson si existe)
+- Cachea /models por cuenta activa con stale-while-revalidate y ETags
+- Agrupa solicitudes idénticas en curso en una sola llamada (coalescing_service.py)
+- Reintenta con otra cuenta si la API rechaza la actual (401/402/403/429)
+- Limita las solicitudes en curso por cuenta: cada solicitud usa la cuenta menos
+  cargada o espera turno en una cola corta (admission_service.py)
+- Limita las solicitudes en curso hacia la API con un límite adaptativo que se
+  ajusta con la latencia y los errores; las sobrantes reciben 429 al momento
+- Actualiza la cuota de la cuenta con los headers de cada respuesta, en segundo plano
 - Agrega headers necesarios para comunicación con GitHub API
 - Formatea respuestas según especificación OpenAI
 
 INTERACCIONES CON OTROS MÓDULOS:
-- Utiliza: http_service.py (comunicación con API Copilot)
-- Utiliza: auth_controller.py (obtener tokens válidos)
+- Utiliza: http_service.py (pool keep-alive hacia la API Copilot)
+- Utiliza: json_service.py (codec JSON de solicitudes y respuestas)
+- Utiliza: session_token_service.py (tokens de sesión de Copilot por cuenta)
+- Utiliza: quota_tracking_service.py (cuota observada en cada respuesta)
+- Utiliza: account_sync_service.py (cuentas compartidas con los procesos servidor)
+- Utiliza: admission_service.py (solicitudes en curso y esperas por cuenta)
+- Utiliza: concurrency_limit_model.py (límite adaptativo hacia la API)
+- Utiliza: auth_controller.py (mantenimiento de cuentas en el proceso servidor:
+  refresco periódico de cuotas, recuperación de tokens agotados y vigilancia
+  de los archivos de tokens)
 - Actualiza: proxy_model.py (estadísticas del servidor)
 - Notifica a: proxy_view.py (cambios de estado)
 - Coordina con: android_service.py (notificaciones de estado)
@@ -44,23 +62,105 @@ INTERACCIONES CON MAIN:
 """
 
 import multiprocessing
+import re
 import signal
+import socket
 import sys
-from typing import Dict, Any, Tuple, Optional
-from flask import Flask, request, jsonify
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Callable, Iterator, List, Mapping, Tuple, Optional
+from flask import Flask, Response, request, jsonify
 import requests
 import waitress
 
+# Importar controladores
+from src.controllers.auth_controller import AuthController
+
 # Importar modelos
 from src.models.config_model import (
+    ACCOUNT_ADMISSION_ENABLED,
+    ACCOUNT_SYNC_ENABLED,
     API_URL,
+    COOLDOWN_DEFAULT_SECONDS,
+    COOLDOWN_MAX_SECONDS,
+    COOLDOWN_STATUS_CODES,
+    COPILOT_TOKEN_URL,
+    FAILOVER_MAX_ATTEMPTS,
+    FAILOVER_STATUS_CODES,
     HEADERS_BASE,
     DEFAULT_HOST,
     DEFAULT_PORT,
-    REQUEST_TIMEOUT
+    ASYNC_MAX_CONNECTIONS,
+    SERVER_ENGINE,
+    SERVER_ENGINES,
+    SERVER_THREADS,
+    SERVER_WORKERS,
+    SSE_CONTENT_TYPE,
+    TOKEN_WATCH_ENABLED,
+    MODELS_CACHE_ENABLED,
+    PASSTHROUGH_CHUNK_SIZE,
+    QUOTA_REFRESH_ENABLED,
+    QUOTA_TRACKING_ENABLED,
+    RECOVERY_SCAN_ENABLED,
+    REQUEST_COALESCING,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_PASSTHROUGH,
+    SESSION_TOKENS_ENABLED,
+    STREAMING_PASSTHROUGH,
+    UPSTREAM_LIMIT_ENABLED,
+    UPSTREAM_LIMIT_MIN,
+    UPSTREAM_LIMIT_RETRY_AFTER,
+    WORKER_SUPERVISE_INTERVAL
 )
+from src.models.account_store_model import create_account_store
 from src.models.auth_model import AuthModel
+from src.models.concurrency_limit_model import AdaptiveConcurrencyLimit
+from src.models.models_cache_model import ModelsCacheEntry, ModelsCacheModel
 from src.models.proxy_model import ProxyModel
+from src.models.response_cache_model import CachedResponse, ResponseCacheModel
+from src.services.account_sync_service import AccountSyncService
+from src.services.admission_service import AccountLease, AdmissionService
+from src.services.coalescing_service import CoalescingService
+from src.services.http_service import HttpService
+from src.services.json_service import CodecJSONProvider, JsonCodec, get_codec
+from src.services.quota_tracking_service import QuotaTrackingService
+from src.services.session_token_service import SessionTokenService
+
+
+# Primer campo "model" de una respuesta JSON de chat completion. Dentro de
+# strings JSON las comillas van escapadas, por lo que el patrón solo puede
+# coincidir con claves reales.
+_MODEL_FIELD_PATTERN = re.compile(rb'"model"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Headers de la API que se reenvían tal cual en modo passthrough
+_PASSTHROUGH_HEADERS = ("content-type", "content-encoding", "content-length")
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> float:
+    """
+    Obtiene el enfriamiento indicado por el header Retry-After de la API.
+    
+    Args:
+        headers: Headers de la respuesta (requests o httpx)
+        
+    Returns:
+        Segundos de enfriamiento: Retry-After en segundos o como fecha HTTP,
+        COOLDOWN_DEFAULT_SECONDS si falta o no es válido, y como mucho
+        COOLDOWN_MAX_SECONDS
+    """
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return COOLDOWN_DEFAULT_SECONDS
+    
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return COOLDOWN_DEFAULT_SECONDS
+    return min(max(seconds, 0.0), COOLDOWN_MAX_SECONDS)
 
 
 class ProxyController:
@@ -69,21 +169,103 @@ class ProxyController:
     y coordina todas las operaciones de reenvío.
     """
     
-    def __init__(self):
-        """Inicializa el controlador del proxy con modelos integrados"""
+    def __init__(
+        self,
+        http_service: Optional[HttpService] = None,
+        json_codec: Optional[JsonCodec] = None,
+        response_cache: Optional[ResponseCacheModel] = None,
+        models_cache: Optional[ModelsCacheModel] = None,
+        session_tokens: Optional[SessionTokenService] = None
+    ):
+        """
+        Inicializa el controlador del proxy con modelos integrados
+        
+        Args:
+            http_service: Cliente HTTP hacia la API. Si no se proporciona,
+                         se crea uno con pool dimensionado según SERVER_THREADS.
+            json_codec: Codec JSON para solicitudes y respuestas. Si no se
+                       proporciona, se usa el configurado en JSON_CODEC.
+            response_cache: Caché de completions deterministas. Si no se
+                           proporciona, se crea solo con RESPONSE_CACHE_ENABLED.
+            models_cache: Caché de /models. Si no se proporciona, se crea
+                         solo con MODELS_CACHE_ENABLED.
+            session_tokens: Caché de tokens de sesión. Si no se proporciona,
+                           se crea solo con SESSION_TOKENS_ENABLED; su hilo de
+                           refresco arranca en cada proceso servidor.
+        """
         self._running = False
         self._server_process: Optional[multiprocessing.Process] = None
         self._host = DEFAULT_HOST
         self._port = DEFAULT_PORT
+        self._engine = SERVER_ENGINE
+        self._workers = 1
+        
+        # Pool de workers (modo prefork con SO_REUSEPORT)
+        self._worker_processes: List[multiprocessing.Process] = []
+        self._workers_lock = threading.Lock()
+        self._supervisor_stop = threading.Event()
+        self._supervisor_thread: Optional[threading.Thread] = None
+        self._streaming_enabled = STREAMING_PASSTHROUGH
+        self._passthrough_enabled = RESPONSE_PASSTHROUGH
+        self._json_codec = json_codec if json_codec is not None else get_codec()
+        if response_cache is None and RESPONSE_CACHE_ENABLED:
+            response_cache = ResponseCacheModel()
+        self._response_cache = response_cache
+        if models_cache is None and MODELS_CACHE_ENABLED:
+            models_cache = ModelsCacheModel()
+        self._models_cache = models_cache
         self._app = self._create_flask_app()
         
         # Modelos integrados
-        self._auth_model = AuthModel()
+        self._auth_model = AuthModel(store=create_account_store())
         self._proxy_model = ProxyModel()
         
+        # Mantenimiento de las cuentas (sus hilos arrancan en el proceso servidor)
+        self._auth_controller = AuthController(auth_model=self._auth_model)
+        
+        # Estado de cuentas compartido con los procesos servidor
+        self._account_sync = AccountSyncService(
+            self._auth_model
+        ) if ACCOUNT_SYNC_ENABLED else None
+        
+        # Límite de solicitudes en curso por cuenta
+        self._admission = AdmissionService(
+            self._auth_model
+        ) if ACCOUNT_ADMISSION_ENABLED else None
+        
+        # Límite adaptativo de solicitudes en curso hacia la API
+        self._upstream_limit = self._create_upstream_limit(SERVER_ENGINE)
+        
+        # Cliente HTTP compartido con conexiones keep-alive
+        self._http_service = http_service if http_service is not None else HttpService(
+            pool_maxsize=SERVER_THREADS,
+            on_checkout=self._proxy_model.record_connection_checkout
+        )
+        
+        # Tokens de sesión de Copilot (intercambiados en segundo plano)
+        if session_tokens is None and SESSION_TOKENS_ENABLED:
+            session_tokens = SessionTokenService(self._exchange_session_token)
+        self._session_tokens = session_tokens
+        if session_tokens is not None:
+            # Las cuentas eliminadas o agotadas dejan de intercambiarse
+            self._auth_model.set_retire_listener(session_tokens.invalidate)
+        
+        # Cuota observada en las respuestas (se aplica en segundo plano)
+        self._quota_tracker = QuotaTrackingService(
+            self._auth_model
+        ) if QUOTA_TRACKING_ENABLED else None
+        
+        # Coalescencia de solicitudes idénticas en curso
+        self._coalescing = CoalescingService(
+            on_wait=self._proxy_model.record_coalescing_wait
+        ) if REQUEST_COALESCING else None
+        
     def _create_flask_app(self) -> Flask:
         """Crea y configura la aplicación Flask"""
         app = Flask(__name__)
+        json_provider = CodecJSONProvider(app)
+        json_provider.codec = self._json_codec
+        app.json = json_provider
         
         # Endpoint principal: /v1/chat/completions
         @app.route("/v1/chat/completions", methods=["POST"])
@@ -91,16 +273,27 @@ class ProxyController:
         def chat_completions():
             """Endpoint para completions de chat"""
             try:
+                # Parsear el cuerpo una sola vez
+                data = self._parse_request_body()
+                
+                # Caché de respuestas: un acierto no necesita token ni API
+                cache_key = self.get_response_cache_key(data)
+                if cache_key is not None:
+                    cached = self.lookup_cached_completion(cache_key)
+                    if cached is not None:
+                        return self._serve_cached_completion(cached)
+                
                 # Validar y preparar solicitud
-                validation_result = self._validate_chat_completion_request(request.json)
+                validation_result = self._validate_chat_completion_request(data)
                 if validation_result is not None:
                     return validation_result
                 
-                data = request.json
                 assert data is not None, "Data should not be None after validation"
                 
-                # Procesar solicitud
-                return self._process_chat_completion(data)
+                # Procesar solicitud (las idénticas en curso comparten la llamada)
+                if self._coalescing is not None and not data.get('stream'):
+                    return self._process_coalesced_chat_completion(data, cache_key)
+                return self._process_chat_completion(data, cache_key)
                 
             except (requests.RequestException, ValueError, KeyError, TypeError, 
                     AttributeError, AssertionError) as e:
@@ -117,37 +310,149 @@ class ProxyController:
         
         return app
     
-    def start_server(self, host: str = '0.0.0.0', port: int = 5000) -> bool:
+    def start_server(
+        self, 
+        host: str = '0.0.0.0', 
+        port: int = 5000,
+        engine: str = SERVER_ENGINE,
+        workers: int = SERVER_WORKERS
+    ) -> bool:
         """
-        Inicia el servidor Waitress en un proceso separado
+        Inicia el servidor en uno o varios procesos separados
+        
+        Con workers > 1 cada proceso abre su propio socket con SO_REUSEPORT
+        sobre el mismo puerto y el kernel reparte las conexiones entre ellos.
+        Un hilo supervisor reinicia los procesos que terminen inesperadamente.
         
         Args:
             host: Host donde escuchar
             port: Puerto donde escuchar
+            engine: Motor del servidor ("waitress" o "asyncio")
+            workers: Número de procesos servidor
             
         Returns:
             True si se inició correctamente, False si ya estaba corriendo
+            
+        Raises:
+            ValueError: Si el motor no está soportado, workers < 1, o el
+                        sistema no soporta SO_REUSEPORT con workers > 1
         """
+        if engine not in SERVER_ENGINES:
+            raise ValueError(f"Motor de servidor no soportado: {engine}")
+        
+        if workers < 1:
+            raise ValueError("workers debe ser un entero positivo")
+        
+        if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+            raise ValueError("SO_REUSEPORT no está disponible en esta plataforma")
+        
         if self._running:
             return False
         
         self._host = host
         self._port = port
+        self._engine = engine
+        self._workers = workers
         self._running = True
         
-        # Crear proceso separado (NO daemon para graceful shutdown)
-        self._server_process = multiprocessing.Process(
+        # Contadores en memoria compartida: slot 0 para este proceso,
+        # un slot por worker (deben existir antes del fork)
+        self._proxy_model.use_shared_memory(slots=workers + 1)
+        
+        # Tabla de cuentas compartida (también debe existir antes del fork)
+        if self._account_sync is not None:
+            self._auth_model.use_shared_table()
+            self._account_sync.start()
+        
+        if workers == 1:
+            # Crear proceso separado (NO daemon para graceful shutdown)
+            self._server_process = multiprocessing.Process(
+                target=self._run_server_process,
+                args=(host, port, engine),
+                daemon=False
+            )
+            self._server_process.start()
+            return True
+        
+        with self._workers_lock:
+            self._worker_processes = [
+                self._spawn_worker(index) for index in range(workers)
+            ]
+        
+        self._supervisor_stop.clear()
+        self._supervisor_thread = threading.Thread(
+            target=self._supervise_workers,
+            name="proxy-worker-supervisor",
+            daemon=True
+        )
+        self._supervisor_thread.start()
+        
+        return True
+    
+    def _spawn_worker(self, index: int) -> multiprocessing.Process:
+        """
+        Crea e inicia un proceso worker que comparte el puerto con SO_REUSEPORT
+        
+        Args:
+            index: Posición del worker en el pool
+            
+        Returns:
+            Proceso iniciado
+        """
+        process = multiprocessing.Process(
             target=self._run_server_process,
-            args=(host, port),
+            args=(self._host, self._port, self._engine, True, index + 1),
+            name=f"proxy-worker-{index}",
             daemon=False
         )
-        self._server_process.start()
+        process.start()
+        return process
+    
+    def _supervise_workers(self) -> None:
+        """Reinicia los workers que hayan terminado mientras el servidor corre"""
+        while not self._supervisor_stop.wait(WORKER_SUPERVISE_INTERVAL):
+            with self._workers_lock:
+                if not self._running:
+                    return
+                
+                for index, process in enumerate(self._worker_processes):
+                    if process.is_alive():
+                        continue
+                    
+                    print(f"Worker {index} terminó (código {process.exitcode}), reiniciando...")
+                    process.join(timeout=0)
+                    self._worker_processes[index] = self._spawn_worker(index)
+    
+    def _create_reuseport_socket(self, host: str, port: int) -> socket.socket:
+        """
+        Crea un socket de escucha compartible entre procesos con SO_REUSEPORT
         
-        return True
+        Args:
+            host: Host donde escuchar
+            port: Puerto donde escuchar
+            
+        Returns:
+            Socket enlazado y escuchando
+        """
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+        sock.listen(socket.SOMAXCONN)
+        sock.setblocking(False)
+        return sock
     
-    def _run_server_process(self, host: str, port: int):
+    def _run_server_process(
+        self, 
+        host: str, 
+        port: int, 
+        engine: str = SERVER_ENGINE,
+        reuse_port: bool = False,
+        stats_slot: int = 1
+    ):
         """
-        Ejecuta el servidor Waitress en un proceso separado
+        Ejecuta el servidor en un proceso separado
         
         Esta función se ejecuta en un proceso diferente, lo que permite
         que el servidor y la UI de Flet coexistan sin bloquearse.
@@ -155,36 +460,118 @@ class ProxyController:
         Args:
             host: Host donde escuchar
             port: Puerto donde escuchar
+            engine: Motor del servidor ("waitress" o "asyncio")
+            reuse_port: Si True, escucha en un socket propio con SO_REUSEPORT
+            stats_slot: Slot de estadísticas compartidas de este proceso
         """
-        # Configurar manejo de señales para shutdown graceful
+        # Escribir contadores en el slot propio del bloque compartido
+        self._proxy_model.bind_stats_slot(stats_slot)
+        
+        # Dimensionar el límite hacia la API según el motor que atiende
+        if engine != SERVER_ENGINE:
+            self._upstream_limit = self._create_upstream_limit(engine)
+        
+        # Aplicar los cambios de cuentas hechos en otros procesos
+        if self._account_sync is not None:
+            self._account_sync.start()
+        
+        # Mantener las cuentas: con la tabla compartida basta un proceso, que
+        # publica los cambios al resto
+        if self._account_sync is None or stats_slot == 1:
+            self.start_account_maintenance()
+        
+        # Intercambiar los tokens de sesión de todas las cuentas
+        if self._session_tokens is not None:
+            self._session_tokens.start(self._auth_model.get_all_accounts())
+        
+        # Configurar manejo de señales para shutdown graceful (uvicorn instala
+        # sus propios handlers; el motor asyncio llama a shutdown_server_process
+        # desde el evento lifespan.shutdown)
         def signal_handler(signum, frame):  # pylint: disable=unused-argument
             """Handler para señales SIGTERM/SIGINT. Los parámetros son requeridos por signal API."""
             print("Recibida señal de shutdown, cerrando servidor...")
+            self.shutdown_server_process()
             sys.exit(0)
         
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
         
         try:
-            print(f"Servidor proxy iniciado en {host}:{port}")
+            sock = self._create_reuseport_socket(host, port) if reuse_port else None
+            
+            print(f"Servidor proxy iniciado en {host}:{port} (motor {engine})")
+            if engine == "asyncio":
+                # Importación diferida: uvicorn y httpx son opcionales
+                from src.controllers.async_proxy_controller import AsyncProxyController
+                AsyncProxyController(self).serve(host, port, sock=sock)
+                return
+            
+            if sock is not None:
+                waitress.serve(
+                    self._app,
+                    sockets=[sock],
+                    threads=SERVER_THREADS,
+                    channel_timeout=30
+                )
+                return
+            
             waitress.serve(
                 self._app,
                 host=host,
                 port=port,
-                threads=4,
+                threads=SERVER_THREADS,
                 channel_timeout=30
             )
         except (OSError, RuntimeError, ValueError) as e:
             # Errores de red, configuración o servidor
             print(f"Error en servidor: {e}")
     
+    def start_account_maintenance(self) -> None:
+        """
+        Arranca en segundo plano el mantenimiento de las cuentas de este
+        proceso: el refresco periódico de cuotas, que verifica primero las
+        cuentas de verificación caducada, la vigilancia de los archivos de
+        tokens (las cuentas nuevas se verifican al aparecer) y la revisión de
+        TokensAgotados/.
+        """
+        if QUOTA_REFRESH_ENABLED:
+            self._auth_controller.start_quota_refresh(refresh_stale=True)
+        if TOKEN_WATCH_ENABLED:
+            try:
+                self._auth_controller.start_token_watch()
+            except OSError as e:
+                # Backend de vigilancia no disponible: el servidor sigue con
+                # las cuentas ya cargadas
+                print(f"No se pudo vigilar los directorios de tokens: {e}")
+        if RECOVERY_SCAN_ENABLED:
+            self._auth_controller.start_exhausted_recovery()
+    
+    def stop_account_maintenance(self) -> None:
+        """Detiene el mantenimiento de las cuentas arrancado con start_account_maintenance"""
+        self._auth_controller.stop_token_watch()
+        self._auth_controller.stop_exhausted_recovery()
+        self._auth_controller.stop_quota_refresh()
+    
+    def shutdown_server_process(self) -> None:
+        """
+        Cierra el proceso servidor: detiene el mantenimiento de las cuentas,
+        la sincronización de cuentas y el refresco de tokens de sesión y
+        guarda las cuotas y el último uso.
+        """
+        self.stop_account_maintenance()
+        if self._account_sync is not None:
+            self._account_sync.stop()
+        if self._session_tokens is not None:
+            self._session_tokens.stop()
+        self._auth_model.flush_store()
+    
     def stop_server(self) -> bool:
         """
         Detiene el servidor de forma graceful
         
-        Envía señal SIGTERM al proceso del servidor y espera hasta 5 segundos
-        a que termine procesando las solicitudes actuales. Si no responde,
-        fuerza el cierre con SIGKILL.
+        Envía señal SIGTERM a todos los procesos del servidor y espera hasta
+        5 segundos en total a que terminen procesando las solicitudes actuales.
+        Los que no respondan se fuerzan con SIGKILL.
         
         Returns:
             True si se detuvo correctamente, False si no estaba corriendo
@@ -192,26 +579,51 @@ class ProxyController:
         if not self._running:
             return False
         
-        self._running = False
+        # Detener la supervisión antes de terminar workers (evita reinicios)
+        with self._workers_lock:
+            self._running = False
+        self._supervisor_stop.set()
+        if self._supervisor_thread is not None:
+            self._supervisor_thread.join(timeout=WORKER_SUPERVISE_INTERVAL + 1.0)
+            self._supervisor_thread = None
+        
+        if self._worker_processes:
+            processes = list(self._worker_processes)
+        elif self._server_process is not None:
+            processes = [self._server_process]
+        else:
+            processes = []
         
         try:
-            if self._server_process and self._server_process.is_alive():
+            alive = [process for process in processes if process.is_alive()]
+            if alive:
                 print("Deteniendo servidor proxy...")
                 
-                # Enviar señal SIGTERM (shutdown graceful)
-                self._server_process.terminate()
+                # Enviar señal SIGTERM (shutdown graceful) a todos a la vez
+                for process in alive:
+                    process.terminate()
                 
-                # Esperar hasta 5 segundos a que termine
-                self._server_process.join(timeout=5.0)
+                # Esperar hasta 5 segundos en total a que terminen
+                deadline = time.monotonic() + 5.0
+                for process in alive:
+                    process.join(timeout=max(0.0, deadline - time.monotonic()))
                 
-                # Si después de 5 segundos sigue vivo, forzar cierre
-                if self._server_process.is_alive():
-                    print("Servidor no respondió, forzando cierre...")
-                    self._server_process.kill()
-                    self._server_process.join(timeout=1.0)
+                # Los que sigan vivos se fuerzan
+                for process in alive:
+                    if process.is_alive():
+                        print("Servidor no respondió, forzando cierre...")
+                        process.kill()
+                        process.join(timeout=1.0)
                 
                 print("Servidor detenido correctamente")
             
+            self._worker_processes = []
+            
+            # Liberar la memoria compartida conservando los totales
+            self._proxy_model.close()
+            if self._account_sync is not None:
+                self._account_sync.stop()
+                self._auth_model.close_shared_table()
             return True
             
         except (OSError, RuntimeError) as e:
@@ -223,18 +635,110 @@ class ProxyController:
         """Retorna si el servidor está corriendo"""
         return self._running
     
+    def is_streaming_enabled(self) -> bool:
+        """Retorna si se aceptan solicitudes con stream=true"""
+        return self._streaming_enabled
+    
+    def is_passthrough_enabled(self) -> bool:
+        """Retorna si las respuestas sin streaming se reenvían sin decodificar"""
+        return self._passthrough_enabled
+    
     def get_status(self) -> Dict[str, Any]:
         """Retorna el estado del servidor"""
+        with self._workers_lock:
+            workers_alive = sum(1 for process in self._worker_processes if process.is_alive())
+        
         return {
             'running': self._running,
             'host': self._host,
-            'port': self._port
+            'port': self._port,
+            'engine': self._engine,
+            'workers': self._workers,
+            'workers_alive': workers_alive
         }
     
     def get_flask_app(self) -> Flask:
         """Retorna la instancia de Flask para testing"""
         return self._app
     
+    def _parse_request_body(self) -> Optional[Dict]:
+        """
+        Decodifica el cuerpo JSON de la solicitud actual con el codec.
+        
+        Returns:
+            Objeto JSON de la solicitud, o None si no es un objeto JSON válido
+        """
+        try:
+            data = self._json_codec.loads(request.get_data(cache=False))
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    
+    def get_response_cache_key(self, data: Optional[Dict]) -> Optional[str]:
+        """
+        Calcula la clave de caché si la solicitud es elegible.
+        
+        Args:
+            data: Datos de la solicitud (sin validar)
+            
+        Returns:
+            Clave de la caché, o None si la caché está desactivada o la
+            solicitud no es válida o no es determinista
+        """
+        if self._response_cache is None or not self.validate_chat_request(data)[0]:
+            return None
+        assert data is not None
+        if not self._response_cache.is_cacheable(data):
+            return None
+        return self._response_cache.make_key(data)
+    
+    def lookup_cached_completion(self, cache_key: str) -> Optional[CachedResponse]:
+        """
+        Busca una respuesta en la caché y registra el resultado.
+        
+        Args:
+            cache_key: Clave de la solicitud
+            
+        Returns:
+            Respuesta almacenada o None
+        """
+        assert self._response_cache is not None
+        cached = self._response_cache.get(cache_key)
+        self._proxy_model.record_cache_lookup(cached is not None)
+        return cached
+    
+    def store_cached_completion(self, cache_key: Optional[str], body: bytes, content_type: str) -> None:
+        """
+        Almacena una respuesta exitosa en la caché.
+        
+        Args:
+            cache_key: Clave de la solicitud (None si no es elegible)
+            body: Cuerpo final enviado al cliente
+            content_type: Content-Type de la respuesta
+        """
+        if cache_key is None or self._response_cache is None:
+            return
+        evicted = self._response_cache.put(cache_key, body, content_type)
+        self._proxy_model.record_cache_evictions(evicted)
+    
+    def _serve_cached_completion(self, cached: CachedResponse) -> Tuple[Any, int]:
+        """
+        Responde con una completion almacenada en la caché.
+        
+        Args:
+            cached: Respuesta almacenada
+            
+        Returns:
+            Tupla (response, status_code)
+        """
+        self._proxy_model.update_last_request_time()
+        self.increment_request_counter()
+        return Response(
+            cached.body,
+            content_type=cached.content_type,
+            headers={"x-cache": "HIT"}
+        ), 200
+    
     def _validate_chat_completion_request(self, data: Optional[Dict]) -> Optional[Tuple[Any, int]]:
         """
         Valida solicitud de chat y retorna error si no es válida.
@@ -250,34 +754,241 @@ class ProxyController:
         if not is_valid:
             return jsonify(self.format_error_response(error or "Invalid request")), 400
         
-        # Validar streaming
-        if data and data.get('stream'):
+        # Validar streaming (solo si el reenvío SSE está desactivado)
+        if data and data.get('stream') and not self.is_streaming_enabled():
             return jsonify(self.format_streaming_disabled_response()), 200
         
-        # Validar disponibilidad de token
-        token = self.get_current_token()
-        if token is None:
+        # Validar disponibilidad de token (sin consumir el turno de la
+        # política: la cuenta se elige al reservarla)
+        if self.peek_current_token() is None:
             return jsonify(self.format_error_response(
                 "No authentication tokens available"
             )), 503
         
         return None
     
-    def _process_chat_completion(self, data: Dict) -> Tuple[Any, int]:
+    def _process_coalesced_chat_completion(self, data: Dict, cache_key: Optional[str] = None) -> Tuple[Any, int]:
         """
-        Procesa una solicitud de chat completion.
+        Procesa una solicitud de chat compartiendo la llamada a la API con
+        las solicitudes idénticas que estén en curso.
         
         Args:
-            data: Datos validados de la solicitud
+            data: Datos validados de la solicitud (sin streaming)
+            cache_key: Clave de la caché de respuestas (None si no aplica)
             
         Returns:
             Tupla (response, status_code)
         """
+        assert self._coalescing is not None
+        # El cuerpo puede reenviarse comprimido: solo se comparte entre
+        # clientes que aceptan la misma codificación
+        key = "{}|{}".format(
+            cache_key if cache_key is not None else self._coalescing.make_key(data),
+            request.headers.get("accept-encoding", "identity")
+        )
+        
+        (body, status, headers), coalesced = self._coalescing.run(
+            key,
+            lambda: self._buffer_chat_completion(data, cache_key)
+        )
+        
+        if coalesced:
+            self._proxy_model.record_coalesced_request()
+            self._proxy_model.update_last_request_time()
+            self.increment_request_counter()
+        
+        return Response(body, headers=dict(headers)), status
+    
+    def _buffer_chat_completion(
+        self,
+        data: Dict,
+        cache_key: Optional[str]
+    ) -> Tuple[bytes, int, Tuple[Tuple[str, str], ...]]:
+        """
+        Procesa una solicitud de chat y devuelve la respuesta ya leída.
+        
+        Args:
+            data: Datos validados de la solicitud (sin streaming)
+            cache_key: Clave de la caché de respuestas (None si no aplica)
+            
+        Returns:
+            Tupla inmutable (cuerpo, status_code, headers de contenido y
+            Retry-After)
+        """
+        response, status = self._process_chat_completion(data, cache_key, buffer_body=True)
+        headers = tuple(
+            (name, response.headers[name])
+            for name in ("content-type", "content-encoding", "retry-after")
+            if name in response.headers
+        )
+        return response.get_data(), status, headers
+    
+    def _process_chat_completion(
+        self,
+        data: Dict,
+        cache_key: Optional[str] = None,
+        buffer_body: bool = False
+    ) -> Tuple[Any, int]:
+        """
+        Procesa una solicitud de chat completion reservando antes un hueco en
+        el límite de concurrencia hacia la API y en la cuenta menos cargada.
+        
+        Los huecos se liberan al terminar la solicitud; si el cuerpo se
+        reenvía en bloques, al terminar de enviarlo.
+        
+        Args:
+            data: Datos validados de la solicitud
+            cache_key: Clave para guardar la respuesta en caché (None si no aplica)
+            buffer_body: Leer el cuerpo completo en vez de reenviarlo en bloques
+            
+        Returns:
+            Tupla (response, status_code); 429 si se alcanzó el límite de
+            concurrencia, 503 si ninguna cuenta tiene hueco
+        """
+        if not self.try_upstream_slot():
+            response = jsonify(self.format_upstream_limited_response())
+            response.headers["retry-after"] = str(UPSTREAM_LIMIT_RETRY_AFTER)
+            return response, 429
+        releases: List[Callable[[], None]] = [self.release_upstream_slot]
+        
+        try:
+            lease = self._acquire_account()
+            if lease is None:
+                return jsonify(self.format_error_response(
+                    "All accounts are busy, try again later"
+                )), 503
+            releases.append(lease.release)
+            
+            response, status = self._forward_chat_completion(data, lease, cache_key, buffer_body)
+            if isinstance(response, Response) and response.is_streamed:
+                response.response = self._release_after(response.response, releases)
+                releases = []
+            return response, status
+        finally:
+            for release in releases:
+                release()
+    
+    @staticmethod
+    def _create_upstream_limit(engine: str) -> Optional[AdaptiveConcurrencyLimit]:
+        """
+        Crea el límite adaptativo hacia la API para un motor de servidor.
+        
+        El límite parte de la concurrencia del motor y no la supera: con
+        waitress nunca hay más de SERVER_THREADS solicitudes en curso, así
+        que un límite mayor no rechazaría ninguna.
+        
+        Args:
+            engine: Motor del servidor ("waitress" o "asyncio")
+            
+        Returns:
+            El límite, o None si UPSTREAM_LIMIT_ENABLED está desactivado
+        """
+        if not UPSTREAM_LIMIT_ENABLED:
+            return None
+        concurrency = ASYNC_MAX_CONNECTIONS if engine == "asyncio" else SERVER_THREADS
+        return AdaptiveConcurrencyLimit(
+            concurrency,
+            min_limit=min(UPSTREAM_LIMIT_MIN, concurrency)
+        )
+    
+    def try_upstream_slot(self) -> bool:
+        """
+        Reserva un hueco en el límite de concurrencia hacia la API.
+        
+        Returns:
+            True si la solicitud puede continuar (debe llamar a
+            release_upstream_slot), False si se rechazó
+        """
+        if self._upstream_limit is None or self._upstream_limit.try_acquire():
+            return True
+        self._proxy_model.record_upstream_rejection()
+        return False
+    
+    def release_upstream_slot(self) -> None:
+        """Libera el hueco reservado con try_upstream_slot"""
+        if self._upstream_limit is not None:
+            self._upstream_limit.release()
+    
+    def record_upstream_call(self, started: float, status_code: Optional[int]) -> None:
+        """
+        Entrega al límite adaptativo el resultado de una llamada a la API.
+        
+        Args:
+            started: Momento (time.monotonic) en que se envió la llamada
+            status_code: Código HTTP recibido, None si la llamada falló
+        """
+        if self._upstream_limit is not None:
+            # Un 429 es la API pidiendo menos concurrencia: cuenta como fallo
+            self._upstream_limit.record(
+                time.monotonic() - started,
+                status_code is not None and status_code < 500 and status_code != 429
+            )
+    
+    def _acquire_account(self) -> Optional[AccountLease]:
+        """
+        Reserva la cuenta que atenderá una solicitud.
+        
+        Returns:
+            Reserva de la cuenta menos cargada (esperando turno si todas están
+            al límite), la cuenta actual sin límite si la admisión está
+            desactivada, o None si no hay cuenta
+        """
+        if self._admission is not None:
+            return self._admission.acquire()
         token = self.get_current_token()
-        assert token is not None, "Token should exist after validation"
+        return None if token is None else AccountLease(None, token)
+    
+    def _release_after(
+        self,
+        body: Iterator[bytes],
+        releases: List[Callable[[], None]]
+    ) -> Iterator[bytes]:
+        """
+        Reenvía un cuerpo en bloques y libera los huecos de la solicitud al
+        terminar o cerrarse.
+        
+        Args:
+            body: Iterador del cuerpo de la respuesta
+            releases: Liberaciones pendientes (cuenta y límite hacia la API)
+            
+        Yields:
+            Bloques del cuerpo
+        """
+        try:
+            yield from body
+        finally:
+            for release in releases:
+                release()
+    
+    def _forward_chat_completion(
+        self,
+        data: Dict,
+        lease: AccountLease,
+        cache_key: Optional[str] = None,
+        buffer_body: bool = False
+    ) -> Tuple[Any, int]:
+        """
+        Reenvía una solicitud de chat con la cuenta reservada.
+        
+        Args:
+            data: Datos validados de la solicitud
+            lease: Reserva de la cuenta (sigue a la solicitud si hay failover)
+            cache_key: Clave para guardar la respuesta en caché (None si no aplica)
+            buffer_body: Leer el cuerpo completo en vez de reenviarlo en bloques
+            
+        Returns:
+            Tupla (response, status_code)
+        """
+        token = lease.token
+        
+        if data.get('stream'):
+            return self._process_streaming_chat_completion(data, token, lease)
+        
+        if self.is_passthrough_enabled():
+            return self._process_passthrough_chat_completion(data, token, cache_key, buffer_body, lease)
         
         # Reenviar a Copilot
-        response = self.forward_to_copilot(data, token)
+        response = self.forward_to_copilot(data, token, lease)
         
         # Actualizar ProxyModel
         self._proxy_model.update_last_request_time()
@@ -291,7 +1002,233 @@ class ProxyController:
         # Incrementar contador
         self.increment_request_counter()
         
-        return jsonify(formatted), 200
+        response = jsonify(formatted)
+        if 'error' not in formatted:
+            self.store_cached_completion(cache_key, response.get_data(), response.content_type)
+        return response, 200
+    
+    def _process_passthrough_chat_completion(
+        self,
+        data: Dict,
+        token: str,
+        cache_key: Optional[str] = None,
+        buffer_body: bool = False,
+        lease: Optional[AccountLease] = None
+    ) -> Tuple[Any, int]:
+        """
+        Procesa una solicitud de chat reenviando los bytes crudos de la API.
+        
+        Evita decodificar y volver a codificar el JSON de la respuesta. Solo
+        cuando rewrite_model_name debe cambiar el modelo se lee el cuerpo y
+        se parchea el campo "model" a nivel de bytes. Las respuestas que se
+        guardan en caché o se comparten entre solicitudes también se leen
+        completas.
+        
+        Args:
+            data: Datos validados de la solicitud
+            token: Token de autenticación
+            cache_key: Clave para guardar la respuesta en caché (None si no aplica)
+            buffer_body: Leer el cuerpo completo (sin descomprimir) en vez de
+                        reenviarlo en bloques
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+            
+        Returns:
+            Tupla (response, status_code)
+        """
+        target_model = self.get_rewritten_model(data)
+        relay_raw = target_model is None and cache_key is None
+        
+        # Sin reescritura los bytes comprimidos pueden reenviarse tal cual,
+        # siempre que el cliente acepte la misma codificación
+        accept_encoding = (
+            request.headers.get("accept-encoding", "identity")
+            if relay_raw else None
+        )
+        
+        try:
+            resp = self._post_chat_completion(
+                token,
+                self._json_codec.dumps(data),
+                extra_headers={"accept-encoding": accept_encoding} if accept_encoding else None,
+                stream=True,
+                lease=lease
+            )
+        except requests.RequestException as e:
+            return jsonify(self.format_upstream_exception(e)), 502
+        
+        # Actualizar ProxyModel
+        self._proxy_model.update_last_request_time()
+        self.increment_request_counter()
+        
+        if relay_raw:
+            headers = {
+                name: resp.headers[name]
+                for name in _PASSTHROUGH_HEADERS
+                if name in resp.headers
+            }
+            raw_body: Any = self._iter_raw_body(resp)
+            if buffer_body:
+                raw_body = b"".join(raw_body)
+            return Response(
+                raw_body,
+                headers=headers,
+                direct_passthrough=True
+            ), resp.status_code
+        
+        try:
+            body = resp.content
+        finally:
+            resp.close()
+        
+        content_type = resp.headers.get("content-type", "application/json")
+        patched = body if target_model is None else self.rewrite_model_bytes(body, target_model)
+        if patched is None:
+            # Sin campo "model" localizable: reescribir parseando el JSON
+            try:
+                response = self.rewrite_model_name(data, self._json_codec.loads(body))
+            except (ValueError, TypeError) as e:
+                return jsonify(self.format_error_response(f"Invalid API response: {str(e)}")), 502
+            formatted = jsonify(self.format_openai_response(response))
+            patched, content_type = formatted.get_data(), formatted.content_type
+        
+        if resp.status_code == 200:
+            self.store_cached_completion(cache_key, patched, content_type)
+        
+        return Response(patched, content_type=content_type), resp.status_code
+    
+    def _iter_raw_body(self, resp: requests.Response) -> Iterator[bytes]:
+        """
+        Itera el cuerpo de la API sin decodificar ni descomprimir.
+        
+        Args:
+            resp: Respuesta de la API abierta con stream=True
+            
+        Yields:
+            Bloques de bytes tal como llegaron
+        """
+        try:
+            yield from resp.raw.stream(PASSTHROUGH_CHUNK_SIZE, decode_content=False)
+        finally:
+            resp.close()
+    
+    def rewrite_model_bytes(self, body: bytes, target_model: str) -> Optional[bytes]:
+        """
+        Reemplaza el valor del campo "model" directamente en los bytes JSON.
+        
+        Args:
+            body: Cuerpo JSON de la respuesta
+            target_model: Modelo que debe aparecer en la respuesta
+            
+        Returns:
+            Cuerpo con el modelo reescrito (o el mismo si ya coincide),
+            None si no se encontró el campo
+        """
+        match = _MODEL_FIELD_PATTERN.search(body)
+        if match is None:
+            return None
+        
+        encoded = self._json_codec.dumps(target_model)
+        if match.group(1) == encoded[1:-1]:
+            return body
+        
+        start, end = match.span(1)
+        return body[:start - 1] + encoded + body[end + 1:]
+    
+    def _process_streaming_chat_completion(
+        self,
+        data: Dict,
+        token: str,
+        lease: Optional[AccountLease] = None
+    ) -> Tuple[Any, int]:
+        """
+        Procesa una solicitud de chat con stream=true reenviando el SSE.
+        
+        Los eventos se envían al cliente a medida que llegan de la API,
+        sin acumular el cuerpo completo.
+        
+        Args:
+            data: Datos validados de la solicitud
+            token: Token de autenticación
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+            
+        Returns:
+            Tupla (response, status_code)
+        """
+        resp = self._post_chat_completion(
+            token,
+            self._json_codec.dumps(data),
+            extra_headers={"accept": SSE_CONTENT_TYPE},
+            stream=True,
+            lease=lease
+        )
+        
+        # Errores de la API: devolver el cuerpo completo tal cual
+        if resp.status_code != 200:
+            try:
+                return Response(
+                    resp.content,
+                    content_type=resp.headers.get('content-type', 'application/json')
+                ), resp.status_code
+            finally:
+                resp.close()
+        
+        # Actualizar ProxyModel
+        self._proxy_model.update_last_request_time()
+        self.increment_request_counter()
+        
+        return Response(
+            self._stream_sse_events(data, resp),
+            content_type=SSE_CONTENT_TYPE,
+            headers={"cache-control": "no-cache", "x-accel-buffering": "no"}
+        ), 200
+    
+    def _stream_sse_events(self, request_data: Dict, resp: requests.Response) -> Iterator[bytes]:
+        """
+        Itera las líneas SSE de la API reescribiendo el modelo de cada chunk.
+        
+        Args:
+            request_data: Datos de la solicitud original
+            resp: Respuesta de la API abierta con stream=True
+            
+        Yields:
+            Líneas SSE listas para enviar al cliente
+        """
+        rewrite = self.get_rewritten_model(request_data) is not None
+        
+        try:
+            # chunk_size=None entrega los datos según llegan, sin esperar bloques
+            for line in resp.iter_lines(chunk_size=None):
+                if rewrite and line.startswith(b"data:"):
+                    line = self.rewrite_sse_data_line(request_data, line)
+                yield line + b"\n"
+        finally:
+            resp.close()
+    
+    def rewrite_sse_data_line(self, request_data: Dict, line: bytes) -> bytes:
+        """
+        Aplica rewrite_model_name al chunk JSON de una línea 'data:'.
+        
+        Args:
+            request_data: Datos de la solicitud original
+            line: Línea SSE recibida de la API
+            
+        Returns:
+            Línea con el modelo reescrito, o la original si no es JSON
+        """
+        payload = line[5:].strip()
+        if not payload or payload == b"[DONE]":
+            return line
+        
+        try:
+            chunk = self._json_codec.loads(payload)
+        except ValueError:
+            return line
+        
+        if not isinstance(chunk, dict):
+            return line
+        
+        chunk = self.rewrite_model_name(request_data, chunk)
+        return b"data: " + self._json_codec.dumps(chunk)
     
     def _process_list_models(self) -> Tuple[Any, int]:
         """
@@ -300,22 +1237,86 @@ class ProxyController:
         Returns:
             Tupla (response, status_code)
         """
-        token = self.get_current_token()
+        token = self.peek_current_token()
         if token is None:
             return jsonify(self.format_error_response(
                 "No authentication tokens available"
             )), 503
         
-        resp = requests.get(
+        if self._models_cache is None:
+            resp = self._fetch_models(token)
+            return resp.text, resp.status_code
+        
+        entry, needs_refresh = self._models_cache.lookup()
+        if entry is None:
+            resp = self._fetch_models(token)
+            if resp.status_code != 200:
+                return resp.text, resp.status_code
+            entry = self._models_cache.store(resp.text)
+        elif needs_refresh:
+            # Stale-while-revalidate: responder ya y refrescar en segundo plano
+            threading.Thread(
+                target=self._refresh_models_cache,
+                args=(token,),
+                daemon=True
+            ).start()
+        
+        return self._models_response(entry)
+    
+    def _fetch_models(self, token: str) -> requests.Response:
+        """
+        Obtiene la lista de modelos de la API.
+        
+        Args:
+            token: Token de autenticación
+            
+        Returns:
+            Respuesta de la API
+        """
+        return self._http_service.get(
             f"{API_URL}/models",
             headers={
-                "authorization": f"Bearer {token}",
+                "authorization": f"Bearer {self.get_credential(token)}",
                 **HEADERS_BASE
-            },
-            timeout=REQUEST_TIMEOUT
+            }
         )
+    
+    def _refresh_models_cache(self, token: str) -> None:
+        """
+        Refresca la caché de /models (ejecutado en segundo plano).
         
-        return resp.text, resp.status_code
+        Si la API falla se conserva la entrada anterior hasta que salga
+        de la ventana stale.
+        
+        Args:
+            token: Token de la cuenta activa
+        """
+        assert self._models_cache is not None
+        try:
+            resp = self._fetch_models(token)
+            if resp.status_code == 200:
+                self._models_cache.store(resp.text)
+        except requests.RequestException:
+            pass
+        finally:
+            self._models_cache.finish_refresh()
+    
+    def _models_response(self, entry: ModelsCacheEntry) -> Tuple[Any, int]:
+        """
+        Construye la respuesta de /models desde la caché.
+        
+        Args:
+            entry: Entrada de la caché
+            
+        Returns:
+            Tupla (response, status_code), 304 si el cliente ya tiene el ETag
+        """
+        if ModelsCacheModel.etag_matches(request.headers.get("if-none-match"), entry.etag):
+            response = Response(status=304)
+        else:
+            response = Response(entry.body)
+        response.set_etag(entry.etag)
+        return response, response.status_code
     
     def validate_chat_request(self, data: Optional[Dict]) -> Tuple[bool, Optional[str]]:
         """
@@ -341,37 +1342,215 @@ class ProxyController:
         
         return True, None
     
-    def forward_to_copilot(self, data: Dict, token: str) -> Dict:
+    def _post_chat_completion(
+        self,
+        token: str,
+        body: bytes,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        lease: Optional[AccountLease] = None
+    ) -> requests.Response:
+        """
+        Envía una solicitud a /chat/completions con failover de cuenta.
+        
+        Si la API responde 401 a un token de sesión, se renueva el token y
+        se reintenta una vez con la misma cuenta. Si la API rechaza la cuenta
+        (FAILOVER_STATUS_CODES), la cuenta se marca como agotada y la misma
+        solicitud se reintenta con la siguiente cuenta disponible, hasta
+        FAILOVER_MAX_ATTEMPTS intentos.
+        
+        Args:
+            token: Token de la primera cuenta a usar
+            body: Cuerpo JSON ya serializado
+            extra_headers: Headers adicionales (accept, accept-encoding)
+            stream: No leer el cuerpo de la respuesta final
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
+            
+        Returns:
+            Respuesta de la API (la última si se agotan los intentos o las cuentas)
+            
+        Raises:
+            requests.RequestException: Si falla la comunicación con la API
+        """
+        attempts = 0
+        credential = self.get_credential(token)
+        session_renewed = False
+        while True:
+            started = time.monotonic()
+            try:
+                resp = self._http_service.post(
+                    f"{API_URL}/chat/completions",
+                    headers={
+                        "authorization": f"Bearer {credential}",
+                        "content-type": "application/json",
+                        **(extra_headers or {}),
+                        **HEADERS_BASE
+                    },
+                    data=body,
+                    stream=stream
+                )
+            except requests.RequestException:
+                self.record_upstream_call(started, None)
+                raise
+            self.record_upstream_call(started, resp.status_code)
+            
+            if resp.status_code == 401 and not session_renewed:
+                session_renewed = True
+                renewed = self.renew_credential(token, credential)
+                if renewed is not None:
+                    resp.close()
+                    credential = renewed
+                    continue
+            
+            attempts += 1
+            next_token = self.next_failover_token(token, resp.status_code, attempts, resp.headers, lease)
+            if next_token is None:
+                self.observe_quota(token, resp)
+                return resp
+            resp.close()
+            token = next_token
+            credential = self.get_credential(token)
+            session_renewed = False
+    
+    def observe_quota(self, token: str, resp: Any) -> None:
+        """
+        Entrega una respuesta de la API al seguimiento de cuota.
+        
+        Args:
+            token: Token OAuth de la cuenta que atendió la solicitud
+            resp: Respuesta de la API (requests o httpx)
+        """
+        if self._quota_tracker is not None:
+            self._quota_tracker.observe(token, resp.status_code, resp.headers)
+    
+    def get_credential(self, token: str) -> str:
+        """
+        Obtiene la credencial a enviar a la API para una cuenta.
+        
+        Args:
+            token: Token OAuth de la cuenta
+            
+        Returns:
+            Token de sesión en caché o, si no hay, el token OAuth
+        """
+        if self._session_tokens is None:
+            return token
+        return self._session_tokens.credential(token)
+    
+    def renew_credential(self, token: str, rejected: str) -> Optional[str]:
+        """
+        Renueva el token de sesión de una cuenta tras un 401.
+        
+        Args:
+            token: Token OAuth de la cuenta
+            rejected: Credencial rechazada por la API
+            
+        Returns:
+            Nuevo token de sesión, o None si la credencial rechazada era el
+            token OAuth o no se pudo renovar
+        """
+        if self._session_tokens is None:
+            return None
+        return self._session_tokens.renew(token, rejected)
+    
+    def _exchange_session_token(self, token: str) -> Dict[str, Any]:
+        """
+        Intercambia el token OAuth de una cuenta por un token de sesión.
+        
+        Args:
+            token: Token OAuth de la cuenta
+            
+        Returns:
+            Respuesta JSON de copilot_internal/v2/token
+            
+        Raises:
+            requests.RequestException: Si la API no devuelve 200
+            ValueError: Si la respuesta no es JSON válido
+        """
+        resp = self._http_service.get(
+            COPILOT_TOKEN_URL,
+            headers={
+                "authorization": f"token {token}",
+                **HEADERS_BASE
+            }
+        )
+        if resp.status_code != 200:
+            raise requests.RequestException(
+                f"GitHub Copilot API returned status {resp.status_code}"
+            )
+        return resp.json()
+    
+    def next_failover_token(
+        self,
+        token: str,
+        status_code: int,
+        attempts: int,
+        headers: Optional[Mapping[str, str]] = None,
+        lease: Optional[AccountLease] = None
+    ) -> Optional[str]:
+        """
+        Decide si una respuesta de la API justifica cambiar de cuenta.
+        
+        Las limitaciones temporales (COOLDOWN_STATUS_CODES) apartan la cuenta
+        durante el Retry-After; el resto de rechazos la marcan como agotada.
+        
+        Args:
+            token: Token con el que se obtuvo la respuesta
+            status_code: Código HTTP de la respuesta
+            attempts: Intentos realizados hasta ahora
+            headers: Headers de la respuesta (para Retry-After)
+            lease: Reserva de la solicitud, que pasa a la siguiente cuenta
+            
+        Returns:
+            Token de la siguiente cuenta, o None si hay que devolver la
+            respuesta actual al cliente
+        """
+        if status_code not in FAILOVER_STATUS_CODES or attempts >= FAILOVER_MAX_ATTEMPTS:
+            return None
+        
+        try:
+            if status_code in COOLDOWN_STATUS_CODES:
+                self._auth_model.cooldown_account(token, parse_retry_after(headers))
+            else:
+                self._auth_model.mark_account_as_exhausted(token)
+        except KeyError:
+            # La cuenta se eliminó mientras tanto
+            pass
+        self._auth_model.record_failover(token)
+        self._proxy_model.record_failover()
+        
+        next_token = self.peek_current_token()
+        if next_token is None or next_token == token:
+            return None
+        if lease is not None:
+            # Sin hueco en otra cuenta se devuelve la respuesta actual
+            next_token = lease.move_to(next_token)
+        return next_token
+    
+    def forward_to_copilot(
+        self,
+        data: Dict,
+        token: str,
+        lease: Optional[AccountLease] = None
+    ) -> Dict:
         """
         Reenvía una solicitud a la API de GitHub Copilot
         
         Args:
             data: Datos de la solicitud
             token: Token de autenticación
+            lease: Reserva de la cuenta, que pasa a la siguiente si hay failover
             
         Returns:
             Respuesta de la API o error formateado
         """
         try:
-            resp = requests.post(
-                f"{API_URL}/chat/completions",
-                headers={
-                    "authorization": f"Bearer {token}",
-                    "content-type": "application/json",
-                    **HEADERS_BASE
-                },
-                json=data,
-                timeout=REQUEST_TIMEOUT
-            )
+            resp = self._post_chat_completion(token, self._json_codec.dumps(data), lease=lease)
             
             return resp.json()
             
-        except requests.Timeout:
-            return self.format_error_response("Request timeout: API took too long to respond")
-        except requests.ConnectionError:
-            return self.format_error_response("Connection error: Could not reach GitHub Copilot API")
         except requests.RequestException as e:
-            return self.format_error_response(f"API request failed: {str(e)}")
+            return self.format_upstream_exception(e)
         except (ValueError, TypeError, KeyError) as e:
             # Errores al parsear JSON o acceder a datos de respuesta
             return self.format_error_response(f"Invalid API response: {str(e)}")
@@ -387,13 +1566,30 @@ class ProxyController:
         Returns:
             Respuesta con modelo reescrito
         """
+        requested_model = self.get_rewritten_model(request_data)
+        
+        if requested_model is not None:
+            response_data['model'] = requested_model
+        
+        return response_data
+    
+    def get_rewritten_model(self, request_data: Dict) -> Optional[str]:
+        """
+        Determina el nombre de modelo que debe aparecer en la respuesta.
+        
+        Args:
+            request_data: Datos de la solicitud original
+            
+        Returns:
+            Modelo solicitado si debe mantenerse, None si no se reescribe
+        """
         requested_model = request_data.get('model', '')
         
         # Mantener nombre para modelos específicos
         if any(model in requested_model.lower() for model in ["claude-3.5-sonnet", "gpt-4o"]):
-            response_data['model'] = requested_model
+            return requested_model
         
-        return response_data
+        return None
     
     def handle_streaming(self, request_data: Dict) -> Dict:
         """
@@ -438,6 +1634,34 @@ class ProxyController:
             }
         }
     
+    def format_upstream_exception(self, error: requests.RequestException) -> Dict:
+        """
+        Formatea un error de comunicación con la API de Copilot
+        
+        Args:
+            error: Excepción de requests
+            
+        Returns:
+            Error formateado
+        """
+        if isinstance(error, requests.Timeout):
+            return self.format_error_response("Request timeout: API took too long to respond")
+        if isinstance(error, requests.ConnectionError):
+            return self.format_error_response("Connection error: Could not reach GitHub Copilot API")
+        return self.format_error_response(f"API request failed: {str(error)}")
+    
+    def format_upstream_limited_response(self) -> Dict:
+        """
+        Formatea el error de una solicitud rechazada por el límite de
+        concurrencia hacia la API.
+        
+        Returns:
+            Error formateado
+        """
+        return self.format_error_response(
+            "Too many concurrent requests to GitHub Copilot API, retry later"
+        )
+    
     def format_streaming_disabled_response(self) -> Dict:
         """
         Retorna un mensaje indicando que el streaming debe desactivarse
@@ -458,11 +1682,26 @@ class ProxyController:
         """Retorna métricas del servidor usando modelos"""
         proxy_stats = self._proxy_model.get_statistics()
         auth_stats = self._auth_model.get_statistics()
+        admission_stats = self._admission.get_statistics() if self._admission is not None else {}
+        limit_stats = self._upstream_limit.get_statistics() if self._upstream_limit is not None else {}
         
         return {
             'total_requests': proxy_stats['total_requests'],
             'current_quota': auth_stats.get('current_quota'),
-            'total_accounts': auth_stats['total_accounts']
+            'total_accounts': auth_stats['total_accounts'],
+            'failovers': proxy_stats['failovers'],
+            'response_cache_enabled': self._response_cache is not None,
+            'response_cache_hits': proxy_stats['cache_hits'],
+            'response_cache_misses': proxy_stats['cache_misses'],
+            'response_cache_evictions': proxy_stats['cache_evictions'],
+            'accounts_in_flight': auth_stats['in_flight'],
+            'accounts_queued': auth_stats['queued'],
+            'admission_queued': admission_stats.get('queued', 0),
+            'admission_rejected': admission_stats.get('rejected', 0),
+            'admission_timeouts': admission_stats.get('timeouts', 0),
+            'upstream_limit': limit_stats.get('limit'),
+            'upstream_in_flight': limit_stats.get('in_flight', 0),
+            'upstream_rejections': proxy_stats['upstream_rejections']
         }
     
     def increment_request_counter(self):
@@ -478,10 +1717,54 @@ class ProxyController:
         """Retorna la instancia de ProxyModel"""
         return self._proxy_model
     
+    def get_http_service(self) -> HttpService:
+        """Retorna el cliente HTTP compartido"""
+        return self._http_service
+    
+    def get_response_cache(self) -> Optional[ResponseCacheModel]:
+        """Retorna la caché de respuestas (None si está desactivada)"""
+        return self._response_cache
+    
+    def get_models_cache(self) -> Optional[ModelsCacheModel]:
+        """Retorna la caché de /models (None si está desactivada)"""
+        return self._models_cache
+    
+    def get_coalescing_service(self) -> Optional[CoalescingService]:
+        """Retorna el servicio de coalescencia (None si está desactivado)"""
+        return self._coalescing
+    
+    def get_admission_service(self) -> Optional[AdmissionService]:
+        """Retorna el servicio de admisión por cuenta (None si está desactivado)"""
+        return self._admission
+    
+    def get_upstream_limit(self) -> Optional[AdaptiveConcurrencyLimit]:
+        """Retorna el límite adaptativo hacia la API (None si está desactivado)"""
+        return self._upstream_limit
+    
+    def get_session_token_service(self) -> Optional[SessionTokenService]:
+        """Retorna la caché de tokens de sesión (None si está desactivada)"""
+        return self._session_tokens
+    
+    def get_auth_controller(self) -> AuthController:
+        """Retorna el controlador que mantiene las cuentas"""
+        return self._auth_controller
+    
+    def get_quota_tracker(self) -> Optional[QuotaTrackingService]:
+        """Retorna el seguimiento de cuota (None si está desactivado)"""
+        return self._quota_tracker
+    
+    def get_json_codec(self) -> JsonCodec:
+        """Retorna el codec JSON usado por el proxy"""
+        return self._json_codec
+    
     def get_current_token(self) -> Optional[str]:
         """Obtiene el token actual desde AuthModel"""
         return self._auth_model.get_current_token()
     
+    def peek_current_token(self) -> Optional[str]:
+        """Consulta el token actual sin contarlo como usado (ver AuthModel.peek_current_token)"""
+        return self._auth_model.peek_current_token()
+    
     def get_api_url(self) -> str:
         """Retorna la URL de la API desde ConfigModel"""
         return API_URL
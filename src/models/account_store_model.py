@@ -0,0 +1,321 @@
+"""
+Modelo de Almacén de Cuentas - CoProx
+
+PROPÓSITO:
+Este módulo persiste las cuentas de AuthModel en SQLite para que, al arrancar,
+el proxy disponga en milisegundos del último pool conocido (cuotas, último uso
+y última verificación) y solo tenga que volver a verificar las cuentas
+caducadas.
+
+FUNCIONAMIENTO:
+- La base usa journal_mode=WAL: las lecturas no bloquean las escrituras y
+  varios procesos servidor pueden compartirla
+- save/delete solo anotan el cambio en memoria (write-behind); un hilo en
+  segundo plano los escribe cada ACCOUNT_STORE_FLUSH_INTERVAL segundos en una
+  única transacción
+- Varios cambios de la misma cuenta dentro de un intervalo se escriben una vez
+- El hilo termina al quedar sin cambios y se recrea con el siguiente; tras un
+  fork el proceso hijo abre su propia conexión
+
+PARÁMETROS DE ENTRADA:
+- path: Ruta de la base SQLite
+- flush_interval: Segundos entre escrituras agrupadas
+- busy_timeout: Segundos de espera si otro proceso tiene la base bloqueada
+
+SALIDA ESPERADA:
+- load: Lista de StoredAccount con todas las cuentas guardadas
+- flush: Número de cambios escritos
+- get_statistics: Cambios pendientes, escritos y transacciones
+
+PROCESAMIENTO DE DATOS:
+- Una fila por cuenta: token, cuota restante y total, agotada, último uso,
+  número de failovers y momento de la última verificación (epoch)
+- Las filas se escriben con los valores vigentes en el momento del volcado
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: auth_model.py (carga inicial y cada escritura de cuenta)
+- Creado por: proxy_controller.py y auth_controller.py (create_account_store)
+- Utiliza: config_model.py (ruta, intervalo y espera)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Desactivado por defecto (ACCOUNT_STORE_ENABLED)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.models.config_model import (
+    ACCOUNT_STORE_BUSY_TIMEOUT,
+    ACCOUNT_STORE_ENABLED,
+    ACCOUNT_STORE_FLUSH_INTERVAL,
+    ACCOUNT_STORE_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    token TEXT PRIMARY KEY,
+    quota_remaining INTEGER NOT NULL,
+    quota_total INTEGER NOT NULL,
+    is_exhausted INTEGER NOT NULL,
+    last_used REAL,
+    failover_count INTEGER NOT NULL,
+    verified_at REAL
+)
+"""
+_UPSERT = "INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?, ?, ?, ?)"
+_DELETE = "DELETE FROM accounts WHERE token = ?"
+_SELECT = (
+    "SELECT token, quota_remaining, quota_total, is_exhausted, last_used, "
+    "failover_count, verified_at FROM accounts"
+)
+
+
+class StoredAccount(NamedTuple):
+    """Cuenta tal como está guardada en el almacén"""
+    token: str
+    quota_remaining: int
+    quota_total: int
+    is_exhausted: bool
+    last_used: Optional[float]
+    failover_count: int
+    verified_at: Optional[float]
+
+
+class SQLiteAccountStore:
+    """
+    Almacén SQLite (WAL) de cuentas con escritura diferida por lotes.
+    """
+
+    def __init__(
+        self,
+        path: str = ACCOUNT_STORE_PATH,
+        flush_interval: float = ACCOUNT_STORE_FLUSH_INTERVAL,
+        busy_timeout: float = ACCOUNT_STORE_BUSY_TIMEOUT
+    ):
+        """
+        Inicializa el almacén y crea la tabla si no existe.
+
+        Args:
+            path: Ruta de la base SQLite
+            flush_interval: Segundos entre escrituras agrupadas
+            busy_timeout: Segundos de espera ante bloqueos de otros procesos
+
+        Raises:
+            sqlite3.Error: Si no se puede abrir o crear la base
+        """
+        self._path = path
+        self._flush_interval = flush_interval
+        self._busy_timeout = busy_timeout
+        self._flushes = 0
+        self._written = 0
+        self._reset_process_state()
+
+        with self._db_lock:
+            self._connection().execute(_SCHEMA)
+
+    def _reset_process_state(self) -> None:
+        """Crea conexión, cambios pendientes y estado del hilo para este proceso"""
+        self._pid = os.getpid()
+        self._conn: Optional[sqlite3.Connection] = None
+        # token -> (registro, verified_at), o None para eliminar la fila
+        self._pending: Dict[str, Optional[Tuple[Any, Optional[float]]]] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """Abre la conexión del proceso (llamar con _db_lock tomado)"""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self._path,
+                timeout=self._busy_timeout,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Con WAL, NORMAL solo sincroniza en los checkpoints
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def load(self) -> List[StoredAccount]:
+        """
+        Lee todas las cuentas guardadas.
+
+        Returns:
+            Lista de StoredAccount (vacía si la base no tiene cuentas)
+        """
+        self._check_process()
+        with self._db_lock:
+            rows = self._connection().execute(_SELECT).fetchall()
+        return [
+            StoredAccount(
+                token,
+                quota_remaining,
+                quota_total,
+                bool(is_exhausted),
+                last_used,
+                failover_count,
+                verified_at
+            )
+            for token, quota_remaining, quota_total, is_exhausted, last_used,
+            failover_count, verified_at in rows
+        ]
+
+    def save(self, token: str, account: Any, verified_at: Optional[float] = None) -> None:
+        """
+        Anota el estado de una cuenta para la próxima escritura.
+
+        Los campos se leen de account al escribir, así una cuenta cuyo
+        last_used cambia en sitio se guarda con el valor vigente.
+
+        Args:
+            token: Token de la cuenta
+            account: Registro con quota_remaining, quota_total, is_exhausted,
+                     last_used y failover_count (AccountRecord)
+            verified_at: Momento (epoch) de la última verificación de cuota
+        """
+        self._check_process()
+        with self._lock:
+            self._pending[token] = (account, verified_at)
+        self._ensure_writer()
+
+    def delete(self, token: str) -> None:
+        """
+        Anota la eliminación de una cuenta para la próxima escritura.
+
+        Args:
+            token: Token de la cuenta
+        """
+        self._check_process()
+        with self._lock:
+            self._pending[token] = None
+        self._ensure_writer()
+
+    def flush(self) -> int:
+        """
+        Escribe ahora todos los cambios pendientes en una transacción.
+
+        Returns:
+            Número de cuentas escritas o eliminadas
+        """
+        self._check_process()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        upserts = []
+        deletes = []
+        for token, entry in pending.items():
+            if entry is None:
+                deletes.append((token,))
+                continue
+            account, verified_at = entry
+            upserts.append((
+                token,
+                account.quota_remaining,
+                account.quota_total,
+                int(account.is_exhausted),
+                account.last_used,
+                account.failover_count,
+                verified_at
+            ))
+
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(_UPSERT, upserts)
+                    conn.executemany(_DELETE, deletes)
+        except sqlite3.Error as e:
+            # Conservar los cambios para el siguiente intento salvo que haya
+            # llegado uno más reciente de la misma cuenta
+            logger.warning("Error escribiendo el almacén de cuentas: %s", e)
+            with self._lock:
+                for token, entry in pending.items():
+                    self._pending.setdefault(token, entry)
+            return 0
+
+        with self._lock:
+            self._flushes += 1
+            self._written += len(pending)
+        return len(pending)
+
+    def close(self) -> None:
+        """Escribe los cambios pendientes y cierra la conexión"""
+        self.flush()
+        self._wakeup.set()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores del almacén en este proceso.
+
+        Returns:
+            Diccionario con pending, written (cambios escritos) y flushes
+            (transacciones)
+        """
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'written': self._written,
+                'flushes': self._flushes
+            }
+
+    def _check_process(self) -> None:
+        """Tras un fork, descarta conexión e hilo heredados del padre"""
+        if self._pid != os.getpid():
+            # Los cambios heredados los escribe el padre
+            self._reset_process_state()
+
+    def _ensure_writer(self) -> None:
+        """Arranca el hilo de escritura si no está activo"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        threading.Thread(
+            target=self._run,
+            name="account-store-writer",
+            daemon=True
+        ).start()
+
+    def _run(self) -> None:
+        """Bucle del hilo: escribe por lotes hasta quedar sin cambios"""
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+
+
+def create_account_store(enabled: bool = ACCOUNT_STORE_ENABLED) -> Optional[SQLiteAccountStore]:
+    """
+    Crea el almacén de cuentas configurado.
+
+    Args:
+        enabled: Si False no se persisten las cuentas
+
+    Returns:
+        SQLiteAccountStore, o None si está desactivado o la base no se puede abrir
+    """
+    if not enabled:
+        return None
+    try:
+        return SQLiteAccountStore()
+    except sqlite3.Error as e:
+        logger.warning("Almacén de cuentas no disponible: %s", e)
+        return None
@@ -0,0 +1,315 @@
+"""
+Modelo de Tabla de Cuentas Compartida - CoProx
+
+PROPÓSITO:
+Este módulo comparte el estado de las cuentas entre el proceso del controlador y
+los procesos servidor: una cuenta agregada, agotada o eliminada en cualquiera de
+ellos se ve en todos en milisegundos, sin reiniciar el servidor.
+
+FUNCIONAMIENTO:
+- Bloque multiprocessing.shared_memory con una cabecera (versión global) y una
+  fila por cuenta; se crea antes del fork y lo heredan los procesos hijos
+- Cada escritura modifica solo la fila de su cuenta, le asigna la siguiente
+  versión global y avanza la cabecera, bajo un lock entre procesos
+- Cada proceso recuerda la última versión aplicada: poll compara la cabecera
+  (sin lock) y, si avanzó, retorna solo las filas con versión posterior
+- Los descuentos de cuota se aplican sobre el valor de la fila, así no se
+  pierden descuentos concurrentes de distintos procesos
+
+PARÁMETROS DE ENTRADA:
+- capacity: Número máximo de cuentas en la tabla
+- token_size: Bytes reservados para el token en cada fila
+
+SALIDA ESPERADA:
+- poll: Lista de (token, SharedAccountState o None si se eliminó)
+- get_statistics: Versión, filas ocupadas y capacidad
+
+PROCESAMIENTO DE DATOS:
+- Fila: versión, cuota restante, cuota total, failovers, flags (existe,
+  agotada) como enteros de 64 bits, fin del enfriamiento (epoch, 0 sin
+  enfriamiento) como double y el token en ASCII relleno con ceros
+- Las filas eliminadas conservan el token para que los procesos atrasados
+  vean la eliminación; se reutilizan cuando no quedan filas libres
+- last_used no se comparte: es una marca local de cada proceso
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: auth_model.py (publica cada escritura y aplica las ajenas)
+- Sondeado por: account_sync_service.py (hilo de sincronización)
+- Utiliza: config_model.py (capacidad y tamaño de token)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- proxy_controller.py crea la tabla al iniciar el servidor y la libera al detenerlo
+"""
+
+import logging
+import multiprocessing
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.models.config_model import ACCOUNT_SYNC_CAPACITY, ACCOUNT_SYNC_TOKEN_SIZE
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<q")
+_ROW_FIELDS = struct.Struct("<qqqqqd")
+_FLAG_PRESENT = 1
+_FLAG_EXHAUSTED = 2
+
+
+class SharedAccountState(NamedTuple):
+    """Estado compartido de una cuenta"""
+    quota_remaining: int
+    quota_total: int
+    is_exhausted: bool
+    failover_count: int
+    cooldown_until: float = 0.0
+
+
+class SharedAccountTable:
+    """
+    Tabla de cuentas en memoria compartida con versiones por fila.
+
+    Las escrituras toman un lock entre procesos; la comprobación de
+    cambios en poll solo lee la versión global.
+    """
+
+    def __init__(
+        self,
+        capacity: int = ACCOUNT_SYNC_CAPACITY,
+        token_size: int = ACCOUNT_SYNC_TOKEN_SIZE
+    ):
+        """
+        Crea el bloque compartido vacío.
+
+        Args:
+            capacity: Número máximo de cuentas
+            token_size: Bytes reservados para cada token
+
+        Raises:
+            ValueError: Si capacity o token_size no son positivos
+        """
+        if capacity < 1 or token_size < 1:
+            raise ValueError("capacity y token_size deben ser enteros positivos")
+
+        self._capacity = capacity
+        self._token_size = token_size
+        self._row = struct.Struct(f"<qqqqqd{token_size}s")
+        self._owner_pid = os.getpid()
+        self._shm = shared_memory.SharedMemory(
+            create=True,
+            size=_HEADER.size + capacity * self._row.size
+        )
+        self._buf = self._shm.buf
+        self._buf[:len(self._buf)] = bytes(len(self._buf))
+        self._lock = multiprocessing.Lock()
+        self._closed = False
+
+        # Estado local del proceso (se hereda en el fork junto con su AuthModel)
+        self._slots: Dict[str, int] = {}
+        self._seen_version = 0
+        self._row_tokens: Dict[int, str] = {}
+
+    def _offset(self, index: int) -> int:
+        """Posición de una fila en el bloque"""
+        return _HEADER.size + index * self._row.size
+
+    def _read_token(self, index: int) -> str:
+        """Token guardado en una fila ('' si nunca se usó)"""
+        start = self._offset(index) + _ROW_FIELDS.size
+        return bytes(self._buf[start:start + self._token_size]).rstrip(b"\0").decode("ascii")
+
+    def _find_slot(self, token: str, allocate: bool) -> Optional[int]:
+        """
+        Busca (o asigna) la fila de un token (llamar con el lock tomado).
+
+        Args:
+            token: Token de la cuenta
+            allocate: Si True, asigna una fila libre cuando no existe
+
+        Returns:
+            Índice de fila, o None si no existe y no se asignó
+        """
+        index = self._slots.get(token)
+        if index is not None and self._read_token(index) == token:
+            return index
+
+        free = None
+        removed = None
+        for index in range(self._capacity):
+            stored = self._read_token(index)
+            if stored == token:
+                self._slots[token] = index
+                return index
+            if not stored:
+                # Las filas se ocupan en orden: tras la primera libre no hay más tokens
+                free = index
+                break
+            if removed is None:
+                flags = _ROW_FIELDS.unpack_from(self._buf, self._offset(index))[4]
+                if not flags & _FLAG_PRESENT:
+                    removed = index
+
+        if not allocate:
+            return None
+        index = free if free is not None else removed
+        if index is not None:
+            self._slots[token] = index
+        return index
+
+    def _write_row(self, index: int, token: str, values: Tuple[int, int, int, int, float]) -> None:
+        """Escribe una fila con la siguiente versión global (lock tomado)"""
+        version = _HEADER.unpack_from(self._buf, 0)[0] + 1
+        self._row.pack_into(
+            self._buf,
+            self._offset(index),
+            version,
+            *values,
+            token.encode("ascii")
+        )
+        _HEADER.pack_into(self._buf, 0, version)
+
+    def publish(
+        self,
+        token: str,
+        account: Any,
+        consumed: int = 0,
+        cooldown_until: float = 0.0
+    ) -> bool:
+        """
+        Publica el estado de una cuenta para el resto de procesos.
+
+        Args:
+            token: Token de la cuenta
+            account: Registro con quota_remaining, quota_total, is_exhausted
+                     y failover_count (AccountRecord)
+            consumed: Si es mayor que 0, la escritura es un descuento y se
+                      aplica sobre la cuota de la fila en lugar de sustituirla
+            cooldown_until: Fin del enfriamiento de la cuenta (0: ninguno)
+
+        Returns:
+            True si se publicó, False si la tabla está llena o el token no cabe
+        """
+        if len(token) > self._token_size:
+            logger.warning("Token demasiado largo para la tabla compartida")
+            return False
+
+        quota_remaining = account.quota_remaining
+        is_exhausted = account.is_exhausted
+        with self._lock:
+            index = self._find_slot(token, allocate=True)
+            if index is None:
+                logger.warning("Tabla de cuentas compartida llena (%d)", self._capacity)
+                return False
+
+            if consumed > 0:
+                _, stored_remaining, _, _, flags, _ = _ROW_FIELDS.unpack_from(self._buf, self._offset(index))
+                if flags & _FLAG_PRESENT:
+                    quota_remaining = max(stored_remaining - consumed, 0)
+                    is_exhausted = is_exhausted or quota_remaining <= 0
+
+            flags = _FLAG_PRESENT | (_FLAG_EXHAUSTED if is_exhausted else 0)
+            self._write_row(index, token, (
+                quota_remaining,
+                account.quota_total,
+                account.failover_count,
+                flags,
+                cooldown_until
+            ))
+        return True
+
+    def remove(self, token: str) -> None:
+        """
+        Publica la eliminación de una cuenta.
+
+        Args:
+            token: Token de la cuenta
+        """
+        with self._lock:
+            index = self._find_slot(token, allocate=False)
+            if index is not None:
+                self._write_row(index, token, (0, 0, 0, 0, 0.0))
+
+    def version(self) -> int:
+        """Versión global actual (lectura sin lock)"""
+        return _HEADER.unpack_from(self._buf, 0)[0]
+
+    def poll(self) -> List[Tuple[str, Optional[SharedAccountState]]]:
+        """
+        Obtiene los cambios publicados desde el último poll de este proceso.
+
+        Returns:
+            Lista de (token, estado), con estado None si la cuenta se eliminó
+        """
+        if self.version() == self._seen_version:
+            return []
+
+        changes = []
+        with self._lock:
+            since = self._seen_version
+            for index in range(self._capacity):
+                offset = self._offset(index)
+                version = _HEADER.unpack_from(self._buf, offset)[0]
+                if version == 0:
+                    break
+                if version <= since:
+                    continue
+
+                row_version, quota_remaining, quota_total, failover_count, flags, \
+                    cooldown_until, raw = self._row.unpack_from(self._buf, offset)
+                token = raw.rstrip(b"\0").decode("ascii")
+
+                # Fila reutilizada por otra cuenta: la anterior se eliminó
+                previous = self._row_tokens.get(index)
+                if previous is not None and previous != token:
+                    changes.append((previous, None))
+                self._row_tokens[index] = token
+
+                if flags & _FLAG_PRESENT:
+                    changes.append((token, SharedAccountState(
+                        quota_remaining,
+                        quota_total,
+                        bool(flags & _FLAG_EXHAUSTED),
+                        failover_count,
+                        cooldown_until
+                    )))
+                else:
+                    changes.append((token, None))
+            self._seen_version = _HEADER.unpack_from(self._buf, 0)[0]
+        return changes
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene el estado de la tabla.
+
+        Returns:
+            Diccionario con version, accounts (filas con cuenta) y capacity
+        """
+        accounts = 0
+        for index in range(self._capacity):
+            row_version, _, _, _, flags, _ = _ROW_FIELDS.unpack_from(self._buf, self._offset(index))
+            if row_version == 0:
+                break
+            if flags & _FLAG_PRESENT:
+                accounts += 1
+        return {
+            'version': self.version(),
+            'accounts': accounts,
+            'capacity': self._capacity
+        }
+
+    def close(self) -> None:
+        """Libera el bloque compartido; solo el proceso creador lo elimina"""
+        if self._closed:
+            return
+        self._closed = True
+        self._buf = None
+        self._shm.close()
+        if os.getpid() == self._owner_pid:
+            self._shm.unlink()
+
+    def __del__(self):
+        if getattr(self, "_closed", True) is False:
+            self.close()
@@ -0,0 +1,302 @@
+"""
+Modelo de Admisión por Cuenta - CoProx
+
+PROPÓSITO:
+Este módulo limita cuántas solicitudes hay en curso a la vez con cada cuenta y
+reparte la carga entre ellas: cada solicitud toma la cuenta disponible menos
+cargada y, si todas están al límite, espera su turno en una cola corta de una
+cuenta en lugar de concentrar ráfagas sobre la misma cuenta.
+
+FUNCIONAMIENTO:
+- Cada cuenta disponible tiene una ocupación: solicitudes en curso más
+  solicitudes en su cola de espera
+- Las cuentas se agrupan en niveles por ocupación; elegir la menos cargada
+  recorre como mucho ACCOUNT_MAX_IN_FLIGHT + ACCOUNT_QUEUE_SIZE niveles, sin
+  depender del número de cuentas
+- Por debajo de ACCOUNT_MAX_IN_FLIGHT la solicitud entra directamente; por
+  encima espera en la cola FIFO más corta
+- Al liberar un hueco se entrega directamente al primero de la cola de esa
+  cuenta, así una solicitud nueva no adelanta a las que ya esperaban
+- Si la cuenta deja de estar disponible (agotada, en enfriamiento o eliminada)
+  sus esperas se avisan para que elijan otra cuenta
+
+PARÁMETROS DE ENTRADA:
+- max_in_flight: Solicitudes en curso permitidas por cuenta
+- queue_size: Esperas permitidas por cuenta
+- token: String con el token de la cuenta
+- waiter: AccountWaiter con el callback de aviso de una espera
+
+SALIDA ESPERADA:
+- select: Token de la cuenta menos cargada con hueco libre, o None
+- try_acquire: Si se reservó hueco en una cuenta concreta
+- enqueue: Token de la cuenta en cuya cola se espera, o None si todas están llenas
+- statistics: Solicitudes en curso y en cola por cuenta
+
+PROCESAMIENTO DE DATOS:
+- Dentro de un nivel las cuentas se ordenan por llegada: a igual carga se elige
+  la que lleva más tiempo en ese nivel
+- Los contadores de una cuenta sobreviven a sus cambios de disponibilidad: las
+  solicitudes ya en curso siguen contando hasta liberarse
+- No es thread-safe: auth_model.py lo usa bajo su propio lock, y los avisos se
+  hacen con ese lock tomado (deben ser inmediatos)
+- statistics es la excepción: copia dos diccionarios de contadores, cada uno en
+  una sola operación del intérprete, y puede leerse sin el lock
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: auth_model.py (admisión y liberación de solicitudes por cuenta)
+- Esperado por: admission_service.py (esperas síncronas y asíncronas)
+- Utiliza: config_model.py (límite en curso y tamaño de cola)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from src.models.config_model import ACCOUNT_MAX_IN_FLIGHT, ACCOUNT_QUEUE_SIZE
+
+
+class AccountWaiter:
+    """
+    Solicitud en espera de un hueco en alguna cuenta.
+
+    notify se llama cuando la espera termina: granted contiene la cuenta
+    concedida, o None si la cuenta dejó de estar disponible y hay que volver
+    a elegir.
+    """
+
+    __slots__ = ("notify", "queued_on", "granted")
+
+    def __init__(self, notify: Callable[[], None]):
+        self.notify = notify
+        self.queued_on: Optional[str] = None
+        self.granted: Optional[str] = None
+
+
+class AccountAdmission:
+    """
+    Índice de ocupación por cuenta con colas de espera FIFO
+    (no thread-safe: el llamador sincroniza).
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = ACCOUNT_MAX_IN_FLIGHT,
+        queue_size: int = ACCOUNT_QUEUE_SIZE
+    ):
+        """
+        Crea el índice vacío.
+
+        Args:
+            max_in_flight: Solicitudes en curso permitidas por cuenta
+            queue_size: Esperas permitidas por cuenta
+
+        Raises:
+            ValueError: Si max_in_flight < 1 o queue_size < 0
+        """
+        if max_in_flight < 1 or queue_size < 0:
+            raise ValueError("max_in_flight debe ser >= 1 y queue_size >= 0")
+
+        self._max_in_flight = max_in_flight
+        self._in_flight: Dict[str, int] = {}
+        self._queues: Dict[str, Deque[AccountWaiter]] = {}
+        # Longitud de cada cola, para que statistics no recorra las colas
+        self._queued: Dict[str, int] = {}
+        # Cuentas disponibles por ocupación; las llenas (cola incluida) no
+        # están en ningún nivel
+        self._levels: List[Dict[str, None]] = [{} for _ in range(max_in_flight + queue_size)]
+        self._level_of: Dict[str, int] = {}
+
+    @property
+    def max_in_flight(self) -> int:
+        """Solicitudes en curso permitidas por cuenta"""
+        return self._max_in_flight
+
+    def __bool__(self) -> bool:
+        """True si hay alguna solicitud en curso o en espera"""
+        return bool(self._in_flight) or bool(self._queues)
+
+    def in_flight(self, token: str) -> int:
+        """Solicitudes en curso con una cuenta"""
+        return self._in_flight.get(token, 0)
+
+    def set_eligible(self, token: str) -> None:
+        """
+        Registra una cuenta disponible.
+
+        Args:
+            token: Token de la cuenta
+        """
+        if token not in self._level_of:
+            self._place(token)
+
+    def set_ineligible(self, token: str) -> None:
+        """
+        Retira una cuenta de la selección y avisa a sus esperas para que
+        elijan otra cuenta.
+
+        Args:
+            token: Token de la cuenta
+        """
+        self._unplace(token)
+        queue = self._queues.pop(token, None)
+        self._queued.pop(token, None)
+        for waiter in queue or ():
+            waiter.queued_on = None
+            waiter.notify()
+
+    def select(self, preferred: Optional[str] = None) -> Optional[str]:
+        """
+        Elige la cuenta menos cargada con hueco libre.
+
+        Args:
+            preferred: Cuenta propuesta por la política de selección; se
+                       elige si está libre
+
+        Returns:
+            Token elegido o None si todas las cuentas están al límite
+        """
+        if preferred is not None and self._level_of.get(preferred) == 0:
+            return preferred
+        for level in range(self._max_in_flight):
+            bucket = self._levels[level]
+            if bucket:
+                return next(iter(bucket))
+        return None
+
+    def acquire(self, token: str) -> None:
+        """
+        Cuenta una solicitud en curso con una cuenta (sin comprobar el límite).
+
+        Args:
+            token: Token de la cuenta
+        """
+        self._in_flight[token] = self._in_flight.get(token, 0) + 1
+        self._replace(token)
+
+    def try_acquire(self, token: str) -> bool:
+        """
+        Cuenta una solicitud en curso con una cuenta concreta solo si está
+        disponible, tiene hueco libre y nadie espera en su cola.
+
+        Args:
+            token: Token de la cuenta
+
+        Returns:
+            True si se reservó el hueco
+        """
+        if self._level_of.get(token, self._max_in_flight) >= self._max_in_flight:
+            return False
+        self.acquire(token)
+        return True
+
+    def release(self, token: str) -> None:
+        """
+        Libera el hueco de una solicitud terminada; si hay esperas en la
+        cuenta, el hueco pasa directamente a la primera.
+
+        Args:
+            token: Token de la cuenta
+        """
+        queue = self._queues.get(token)
+        if queue:
+            waiter = queue.popleft()
+            self._count_queue(token, queue)
+            waiter.queued_on = None
+            waiter.granted = token
+            self._replace(token)
+            waiter.notify()
+            return
+
+        count = self._in_flight.get(token, 0) - 1
+        if count > 0:
+            self._in_flight[token] = count
+        else:
+            self._in_flight.pop(token, None)
+        self._replace(token)
+
+    def enqueue(self, waiter: AccountWaiter) -> Optional[str]:
+        """
+        Pone una espera en la cola más corta de las cuentas al límite.
+
+        Args:
+            waiter: Espera a encolar
+
+        Returns:
+            Token de la cuenta en cuya cola espera, o None si todas las
+            colas están llenas
+        """
+        for level in range(self._max_in_flight, len(self._levels)):
+            bucket = self._levels[level]
+            if bucket:
+                token = next(iter(bucket))
+                queue = self._queues.setdefault(token, deque())
+                queue.append(waiter)
+                self._count_queue(token, queue)
+                waiter.queued_on = token
+                waiter.granted = None
+                self._replace(token)
+                return token
+        return None
+
+    def cancel(self, waiter: AccountWaiter) -> bool:
+        """
+        Quita una espera de su cola (tiempo agotado o solicitud cancelada).
+
+        Args:
+            waiter: Espera a quitar
+
+        Returns:
+            True si seguía en cola; False si ya se le concedió o retiró la cuenta
+        """
+        token = waiter.queued_on
+        if token is None:
+            return False
+        queue = self._queues[token]
+        queue.remove(waiter)
+        self._count_queue(token, queue)
+        waiter.queued_on = None
+        self._replace(token)
+        return True
+
+    def statistics(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Obtiene la carga de cada cuenta ocupada (puede llamarse sin el lock).
+
+        Returns:
+            Tupla (en curso, en cola), diccionarios token -> solicitudes
+        """
+        return dict(self._in_flight), dict(self._queued)
+
+    def _count_queue(self, token: str, queue: Deque[AccountWaiter]) -> None:
+        """Actualiza la longitud publicada de una cola y retira las vacías"""
+        if queue:
+            self._queued[token] = len(queue)
+        else:
+            self._queues.pop(token, None)
+            self._queued.pop(token, None)
+
+    def _occupancy(self, token: str) -> int:
+        """Solicitudes en curso más esperas de una cuenta"""
+        queue = self._queues.get(token)
+        return self._in_flight.get(token, 0) + (len(queue) if queue else 0)
+
+    def _place(self, token: str) -> None:
+        """Coloca una cuenta disponible en el nivel de su ocupación"""
+        level = self._occupancy(token)
+        self._level_of[token] = level
+        if level < len(self._levels):
+            self._levels[level][token] = None
+
+    def _unplace(self, token: str) -> None:
+        """Quita una cuenta de su nivel"""
+        level = self._level_of.pop(token, None)
+        if level is not None and level < len(self._levels):
+            self._levels[level].pop(token, None)
+
+    def _replace(self, token: str) -> None:
+        """Mueve una cuenta disponible al nivel de su nueva ocupación"""
+        if token in self._level_of:
+            self._unplace(token)
+            self._place(token)
@@ -8,8 +8,17 @@ Mantiene información sobre cuentas activas, cuotas disponibles y tokens válido
 FUNCIONAMIENTO:
 - Almacena el estado actual de autenticación de todas las cuentas
 - Rastrea cuotas disponibles y límites de uso por cuenta
-- Mantiene contadores de cuentas activas y agotadas
+- Mantiene índices de cuentas disponibles y agotadas y totales de cuota que se
+  actualizan en cada escritura, así las lecturas son O(1)
+- Publica instantáneas inmutables (copy-on-write) para que los lectores no
+  bloqueen a los escritores
 - Proporciona información sobre el token actualmente en uso
+- Opcionalmente persiste las cuentas en un almacén (account_store_model.py) y
+  arranca con el último estado guardado
+- Con el servidor en marcha publica cada cambio en una tabla compartida entre
+  procesos (account_sync_model.py) y aplica los cambios de los demás
+- Avisa al listener registrado cuando una cuenta se elimina o se agota (p. ej.
+  para descartar su token de sesión)
 
 PARÁMETROS DE ENTRADA:
 - token_data: Diccionario con información del token actual
@@ -26,15 +35,31 @@ SALIDA ESPERADA:
 
 PROCESAMIENTO DE DATOS:
 - Valida formato de tokens antes de almacenarlos
+- Guarda cada cuenta en un AccountRecord compacto (__slots__, last_used como
+  timestamp epoch) que se lee como diccionario por compatibilidad
 - Calcula estadísticas agregadas de cuotas
-- Determina qué cuenta usar basándose en cuota disponible
+- Determina qué cuenta usar mediante la política de selección configurada
+  (scheduler_model.py), sin recorrer todas las cuentas
 - Actualiza contadores cuando se agotan cuentas
+- Aparta temporalmente las cuentas limitadas (429) en una rueda de
+  temporización y las devuelve a la rotación al vencer su enfriamiento
+- Cuenta las solicitudes en curso por cuenta (admission_model.py): cada
+  solicitud toma la cuenta disponible menos cargada o espera turno
+- Registra cuándo se verificó la cuota de cada cuenta para refrescar solo las
+  caducadas
 
 INTERACCIONES CON OTROS MÓDULOS:
 - Actualizado por: auth_controller.py (nuevos tokens, cuotas)
+- Actualizado por: quota_tracking_service.py (cuota observada en respuestas)
 - Leído por: proxy_controller.py (token actual para solicitudes)
 - Consultado por: auth_view.py (mostrar estado de cuentas)
 - Modificado por: oauth_service.py (nuevos tokens autenticados)
+- Utiliza: scheduler_model.py (selección de la cuenta actual)
+- Utiliza: account_store_model.py (persistencia opcional de cuentas)
+- Utiliza: account_sync_model.py (estado compartido entre procesos)
+- Utiliza: timing_wheel_model.py (vencimiento de enfriamientos)
+- Utiliza: admission_model.py (solicitudes en curso y colas por cuenta)
+- Sincronizado por: account_sync_service.py (aplica los cambios compartidos)
 
 INTERACCIONES CON MAIN:
 - main.py inicializa este modelo al arrancar la aplicación
@@ -43,8 +68,101 @@ INTERACCIONES CON MAIN:
 """
 
 import threading
-from typing import Optional
+import time
+from collections.abc import Mapping as MappingABC
 from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from src.models.account_store_model import SQLiteAccountStore
+from src.models.admission_model import AccountAdmission, AccountWaiter
+from src.models.account_sync_model import SharedAccountState, SharedAccountTable
+from src.models.scheduler_model import AccountScheduler, create_scheduler
+from src.models.timing_wheel_model import TimingWheel
+
+
+class AccountCounts(NamedTuple):
+    """Contadores agregados publicados por AuthModel"""
+    total: int
+    available: int
+    quota_remaining: int
+    quota_total: int
+    cooling_down: int = 0
+
+
+class AccountRecord(MappingABC):
+    """
+    Registro compacto de una cuenta.
+    
+    Usa __slots__ y guarda last_used como timestamp epoch (float) en lugar
+    de un diccionario con un datetime por cuenta. Se comporta como un
+    diccionario de solo lectura con las claves históricas, así que
+    get_all_accounts mantiene su vista {token: {campo: valor}}; al leer
+    'last_used' por clave se obtiene un datetime como antes.
+    
+    Los registros no se modifican tras crearse: las escrituras crean uno
+    nuevo con replace(). La excepción es last_used, una marca orientativa
+    que se actualiza en sitio sin lock para no serializar las solicitudes.
+    """
+    
+    __slots__ = (
+        'token',
+        'quota_remaining',
+        'quota_total',
+        'is_exhausted',
+        'last_used',
+        'failover_count'
+    )
+    
+    def __init__(
+        self,
+        token: str,
+        quota_remaining: int = 0,
+        quota_total: int = 0,
+        is_exhausted: bool = False,
+        last_used: Optional[float] = None,
+        failover_count: int = 0
+    ):
+        self.token = token
+        self.quota_remaining = quota_remaining
+        self.quota_total = quota_total
+        self.is_exhausted = is_exhausted
+        self.last_used = last_used
+        self.failover_count = failover_count
+    
+    def replace(self, **changes: Any) -> "AccountRecord":
+        """
+        Crea una copia del registro con los campos indicados cambiados.
+        
+        Args:
+            **changes: Campos a sustituir
+            
+        Returns:
+            Nuevo registro
+        """
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return AccountRecord(**fields)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if key == 'last_used' and value is not None:
+            return datetime.fromtimestamp(value)
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+    
+    def __len__(self) -> int:
+        return len(self.__slots__)
+    
+    def __repr__(self) -> str:
+        return f"AccountRecord({dict(self)!r})"
+
+
+_EMPTY_ACCOUNTS: Mapping[str, AccountRecord] = MappingProxyType({})
 
 
 class AuthModel:
@@ -53,18 +171,81 @@ class AuthModel:
     
     Gestiona múltiples cuentas, rastrea cuotas y proporciona rotación automática
     de tokens cuando se agotan.
+    
+    Los registros de cuenta (AccountRecord) son copy-on-write: cada escritura
+    sustituye el registro en lugar de modificarlo, por lo que las
+    instantáneas publicadas nunca cambian y las lecturas no toman el lock.
     """
     
-    def __init__(self):
-        """Inicializa el modelo de autenticación vacío"""
-        self._accounts: dict[str, dict] = {}
+    def __init__(
+        self,
+        scheduler: Optional[AccountScheduler] = None,
+        store: Optional[SQLiteAccountStore] = None,
+        admission: Optional[AccountAdmission] = None
+    ):
+        """
+        Inicializa el modelo de autenticación.
+        
+        Args:
+            scheduler: Política de selección de cuentas (por defecto la
+                       configurada en ACCOUNT_SCHEDULER)
+            store: Almacén persistente opcional; si se indica, el modelo
+                   arranca con las cuentas guardadas y persiste cada cambio
+            admission: Índice de solicitudes en curso por cuenta (por
+                       defecto con ACCOUNT_MAX_IN_FLIGHT y ACCOUNT_QUEUE_SIZE)
+        """
+        self._accounts: dict[str, AccountRecord] = {}
+        self._available: set[str] = set()
+        self._exhausted: set[str] = set()
+        self._quota_remaining = 0
+        self._quota_total = 0
+        self._scheduler = scheduler if scheduler is not None else create_scheduler()
+        self._verified_at: dict[str, float] = {}
+        self._account_store = store
+        self._shared_table: Optional[SharedAccountTable] = None
+        # Fin del enfriamiento (epoch) de las cuentas apartadas por un 429;
+        # copy-on-write para que get_statistics lo lea sin el lock
+        self._cooldowns: Mapping[str, float] = {}
+        self._cooldown_wheel = TimingWheel()
+        self._admission = admission if admission is not None else AccountAdmission()
+        # Aviso al retirar una cuenta (eliminada o agotada); los retiros se
+        # anotan con el lock tomado y se avisan después de soltarlo
+        self._retire_listener: Optional[Callable[[str], None]] = None
+        self._retired: list[str] = []
         self._lock = threading.Lock()
+        
+        # Estado publicado para lectores sin lock
+        self._counts = AccountCounts(0, 0, 0, 0)
+        # La instantánea se reconstruye al leerla tras alguna escritura, no
+        # en cada escritura
+        self._snapshot: Mapping[str, AccountRecord] = _EMPTY_ACCOUNTS
+        self._snapshot_dirty = False
+        
+        if store is not None:
+            self._load_from_store()
+    
+    def _load_from_store(self) -> None:
+        """Carga las cuentas guardadas en el almacén sin volver a escribirlas"""
+        with self._lock:
+            for stored in self._account_store.load():
+                if stored.verified_at is not None:
+                    self._verified_at[stored.token] = stored.verified_at
+                self._store(stored.token, AccountRecord(
+                    stored.token,
+                    quota_remaining=stored.quota_remaining,
+                    quota_total=stored.quota_total,
+                    is_exhausted=stored.is_exhausted,
+                    last_used=stored.last_used,
+                    failover_count=stored.failover_count
+                ), persist=False)
+        self._flush_retired()
     
     def add_account(
         self, 
         token: str, 
         quota_remaining: int = 0, 
-        quota_total: int = 0
+        quota_total: int = 0,
+        pending: bool = False
     ) -> None:
         """
         Agrega una nueva cuenta o actualiza una existente.
@@ -73,6 +254,8 @@ class AuthModel:
             token: Token de autenticación de GitHub
             quota_remaining: Cuota restante de la cuenta
             quota_total: Cuota total de la cuenta
+            pending: Si True, la cuota aún no se conoce: la cuenta entra en la
+                     rotación sin marcarse agotada hasta que se verifique
             
         Raises:
             ValueError: Si el token no tiene un formato válido
@@ -80,13 +263,19 @@ class AuthModel:
         self._validate_token(token)
         
         with self._lock:
-            self._accounts[token] = {
-                'token': token,
-                'quota_remaining': quota_remaining,
-                'quota_total': quota_total,
-                'is_exhausted': quota_remaining <= 0,
-                'last_used': None
-            }
+            # Una cuota total conocida viene de una verificación; sin ella la
+            # cuenta queda pendiente de verificar
+            if quota_total > 0:
+                self._verified_at[token] = time.time()
+            else:
+                self._verified_at.pop(token, None)
+            self._store(token, AccountRecord(
+                token,
+                quota_remaining=quota_remaining,
+                quota_total=quota_total,
+                is_exhausted=quota_remaining <= 0 and not pending
+            ))
+        self._flush_retired()
     
     def mark_account_as_exhausted(self, token: str) -> None:
         """
@@ -102,8 +291,87 @@ class AuthModel:
             if token not in self._accounts:
                 raise KeyError(f"Token no encontrado: {token}")
             
-            self._accounts[token]['is_exhausted'] = True
-            self._accounts[token]['quota_remaining'] = 0
+            # El agotamiento sustituye a cualquier enfriamiento pendiente
+            self._clear_cooldown(token)
+            self._store(token, self._accounts[token].replace(
+                is_exhausted=True,
+                quota_remaining=0
+            ))
+        self._flush_retired()
+    
+    def cooldown_account(self, token: str, seconds: float) -> float:
+        """
+        Aparta una cuenta de la rotación durante un tiempo (p. ej. tras un 429
+        con Retry-After) sin marcarla como agotada.
+        
+        La cuenta conserva su cuota y vuelve sola a la rotación al vencer el
+        enfriamiento; programar y vencer cuesta O(1) con independencia del
+        número de cuentas apartadas.
+        
+        Args:
+            token: Token de la cuenta
+            seconds: Duración del enfriamiento
+            
+        Returns:
+            Momento (epoch) en que termina el enfriamiento
+            
+        Raises:
+            KeyError: Si el token no existe
+        """
+        until = time.time() + max(seconds, 0.0)
+        with self._lock:
+            if token not in self._accounts:
+                raise KeyError(f"Token no encontrado: {token}")
+            
+            self._set_cooldown(token, until)
+            self._store(token, self._accounts[token])
+        return until
+    
+    def _set_cooldown(self, token: str, until: float) -> None:
+        """Programa el enfriamiento de una cuenta (llamar con el lock tomado)"""
+        self._cooldowns = {**self._cooldowns, token: until}
+        self._cooldown_wheel.schedule(token, until)
+    
+    def _clear_cooldown(self, token: str) -> bool:
+        """Quita el enfriamiento de una cuenta (llamar con el lock tomado)"""
+        if token not in self._cooldowns:
+            return False
+        self._cooldowns = {key: until for key, until in self._cooldowns.items() if key != token}
+        self._cooldown_wheel.cancel(token)
+        return True
+    
+    def _expire_cooldowns(self, now: float) -> None:
+        """
+        Devuelve a la rotación las cuentas cuyo enfriamiento venció
+        (llamar con el lock tomado).
+        
+        Args:
+            now: Momento actual (epoch)
+        """
+        expired = [token for token in self._cooldown_wheel.advance(now) if token in self._cooldowns]
+        if not expired:
+            return
+        self._cooldowns = {
+            token: until for token, until in self._cooldowns.items() if token not in expired
+        }
+        for token in expired:
+            if token in self._accounts:
+                self._store(token, self._accounts[token])
+    
+    def record_failover(self, token: str) -> None:
+        """
+        Registra que una solicitud tuvo que reintentarse en otra cuenta
+        porque la API rechazó esta.
+        
+        Args:
+            token: Token de la cuenta rechazada
+        """
+        with self._lock:
+            account = self._accounts.get(token)
+            if account is not None:
+                self._store(token, account.replace(
+                    failover_count=account.failover_count + 1
+                ))
     
     def update_account_quota(
         self, 
@@ -126,47 +394,374 @@ class AuthModel:
             if token not in self._accounts:
                 raise KeyError(f"Token no encontrado: {token}")
             
-            self._accounts[token]['quota_remaining'] = quota_remaining
-            if quota_total is not None:
-                self._accounts[token]['quota_total'] = quota_total
-            
-            # Actualizar estado de agotamiento
-            self._accounts[token]['is_exhausted'] = quota_remaining <= 0
+            account = self._accounts[token]
+            self._verified_at[token] = time.time()
+            self._store(token, account.replace(
+                quota_remaining=quota_remaining,
+                quota_total=account.quota_total if quota_total is None else quota_total,
+                # Actualizar estado de agotamiento
+                is_exhausted=quota_remaining <= 0
+            ))
+        self._flush_retired()
+    
+    def update_account_quotas(
+        self,
+        quotas: Mapping[str, Tuple[int, Optional[int]]]
+    ) -> int:
+        """
+        Actualiza la cuota de varias cuentas en una sola operación.
+    
+        Todas las cuentas se actualizan bajo una única toma del lock, así los
+        lectores ven el lote completo o nada de él. Los tokens que ya no
+        existen se ignoran.
+    
+        Args:
+            quotas: Diccionario token -> (quota_remaining, quota_total), con
+                    quota_total None para conservar el actual
+    
+        Returns:
+            Número de cuentas actualizadas
+        """
+        updated = 0
+        now = time.time()
+        with self._lock:
+            for token, (quota_remaining, quota_total) in quotas.items():
+                account = self._accounts.get(token)
+                if account is None:
+                    continue
+    
+                self._verified_at[token] = now
+                self._store(token, account.replace(
+                    quota_remaining=quota_remaining,
+                    quota_total=account.quota_total if quota_total is None else quota_total,
+                    is_exhausted=quota_remaining <= 0
+                ))
+                updated += 1
+        self._flush_retired()
+        return updated
+    
+    def consume_account_quota(self, token: str, amount: int = 1) -> None:
+        """
+        Descuenta cuota de una cuenta tras una solicitud servida.
+    
+        A diferencia de update_account_quota, el descuento se hace bajo el
+        lock sobre el valor vigente, por lo que no se pierden descuentos
+        concurrentes. Si la cuenta ya no existe no se hace nada.
+    
+        Args:
+            token: Token de la cuenta
+            amount: Unidades de cuota consumidas
+        """
+        with self._lock:
+            account = self._accounts.get(token)
+            if account is None:
+                return
+    
+            quota_remaining = max(account.quota_remaining - amount, 0)
+            self._store(token, account.replace(
+                quota_remaining=quota_remaining,
+                is_exhausted=quota_remaining <= 0
+            ), consumed=amount)
+        self._flush_retired()
+    
+    def remove_account(self, token: str) -> bool:
+        """
+        Elimina una cuenta (p. ej. su archivo de token se borró del disco).
+    
+        Args:
+            token: Token de la cuenta a eliminar
+    
+        Returns:
+            True si la cuenta existía
+        """
+        with self._lock:
+            if not self._discard(token):
+                return False
+    
+            if self._account_store is not None:
+                self._account_store.delete(token)
+            if self._shared_table is not None:
+                self._shared_table.remove(token)
+        self._flush_retired()
+        return True
+    
+    def _discard(self, token: str) -> bool:
+        """
+        Quita una cuenta de índices, totales y política de selección
+        (llamar con el lock tomado).
+        
+        Args:
+            token: Token de la cuenta
+        
+        Returns:
+            True si la cuenta existía
+        """
+        account = self._accounts.pop(token, None)
+        if account is None:
+            return False
+        
+        self._verified_at.pop(token, None)
+        self._clear_cooldown(token)
+        self._quota_remaining -= account.quota_remaining
+        self._quota_total -= account.quota_total
+        self._available.discard(token)
+        self._exhausted.discard(token)
+        self._scheduler.set_unavailable(token)
+        self._admission.set_ineligible(token)
+        self._publish_counts()
+        self._notify_retired(token)
+        return True
+    
+    def set_retire_listener(self, listener: Optional[Callable[[str], None]]) -> None:
+        """
+        Registra la función a la que se avisa cuando una cuenta se elimina o
+        se agota, también por cambios aplicados desde otros procesos.
+        
+        Se llama después de soltar el lock del modelo, en el hilo que hizo el
+        cambio, por lo que puede tomar sus propios locks sin riesgo de
+        bloqueo mutuo con el modelo.
+        
+        Args:
+            listener: Función que recibe el token retirado (None para quitarla)
+        """
+        self._retire_listener = listener
+    
+    def _notify_retired(self, token: str) -> None:
+        """Anota una cuenta retirada para avisarla al soltar el lock (lock tomado)"""
+        if self._retire_listener is not None:
+            self._retired.append(token)
+    
+    def _flush_retired(self) -> None:
+        """Avisa de las cuentas retiradas pendientes (llamar sin el lock)"""
+        if not self._retired:
+            return
+        with self._lock:
+            retired, self._retired = self._retired, []
+        listener = self._retire_listener
+        if listener is not None:
+            for token in retired:
+                listener(token)
+    
+    def _store(
+        self,
+        token: str,
+        account: AccountRecord,
+        persist: bool = True,
+        consumed: int = 0
+    ) -> None:
+        """
+        Sustituye el registro de una cuenta y actualiza índices, totales,
+        política de selección y estado publicado (llamar con el lock tomado).
+        
+        Args:
+            token: Token de la cuenta
+            account: Nuevo registro completo (no se modifica después)
+            persist: Si False no se anota en el almacén ni se publica a otros
+                     procesos (carga inicial y cambios recibidos de otros)
+            consumed: Cuota descontada, si la escritura es un descuento
+        """
+        previous = self._accounts.get(token)
+        if previous is not None:
+            self._quota_remaining -= previous.quota_remaining
+            self._quota_total -= previous.quota_total
+        
+        self._accounts[token] = account
+        self._quota_remaining += account.quota_remaining
+        self._quota_total += account.quota_total
+        
+        if account.is_exhausted:
+            self._available.discard(token)
+            self._exhausted.add(token)
+            self._scheduler.set_unavailable(token)
+            self._admission.set_ineligible(token)
+            if previous is None or not previous.is_exhausted:
+                self._notify_retired(token)
+        elif token in self._cooldowns:
+            # En enfriamiento: fuera de la rotación sin estar agotada
+            self._available.discard(token)
+            self._exhausted.discard(token)
+            self._scheduler.set_unavailable(token)
+            self._admission.set_ineligible(token)
+        else:
+            self._exhausted.discard(token)
+            self._available.add(token)
+            self._scheduler.set_available(token, account.quota_remaining)
+            self._admission.set_eligible(token)
+        
+        self._publish_counts()
+        
+        if not persist:
+            return
+        if self._account_store is not None:
+            self._account_store.save(token, account, self._verified_at.get(token))
+        if self._shared_table is not None:
+            self._shared_table.publish(token, account, consumed, self._cooldowns.get(token, 0.0))
+    
+    def _publish_counts(self) -> None:
+        """Publica contadores y descarta la instantánea (llamar con el lock tomado)"""
+        self._counts = AccountCounts(
+            len(self._accounts),
+            len(self._available),
+            self._quota_remaining,
+            self._quota_total,
+            len(self._accounts) - len(self._available) - len(self._exhausted)
+        )
+        self._invalidate_snapshot()
+    
+    def _invalidate_snapshot(self) -> None:
+        """Marca la instantánea publicada como desfasada (llamar con el lock tomado)"""
+        self._snapshot_dirty = True
     
     def get_current_token(self) -> Optional[str]:
         """
-        Obtiene el primer token disponible (no agotado).
+        Obtiene un token disponible (no agotado) según la política de selección.
+        
+        Con la política por defecto (first_fit) es el primer token disponible
+        en orden de alta.
         
         Returns:
             Token disponible o None si todos están agotados
         """
         with self._lock:
-            for token, account in self._accounts.items():
-                if not account['is_exhausted']:
-                    account['last_used'] = datetime.now()
-                    return token
-            return None
+            if self._cooldowns:
+                self._expire_cooldowns(time.time())
+            token = self._scheduler.select()
+            if token is None:
+                return None
+            record = self._accounts[token]
+        
+        # Asignación de un atributo: atómica, no necesita el lock ni invalida
+        # la instantánea publicada (comparte el mismo registro)
+        record.last_used = time.time()
+        return token
     
-    def get_statistics(self) -> dict:
+    def peek_current_token(self) -> Optional[str]:
         """
-        Obtiene estadísticas agregadas de las cuentas.
+        Consulta el token que devolvería get_current_token sin usarlo: no
+        avanza la rotación de la política ni actualiza last_used.
+        
+        Sirve para comprobar que hay cuenta disponible, o elegir una para
+        operaciones que no cuentan como uso (/models, failover).
         
         Returns:
-            Diccionario con estadísticas de cuentas
+            Token disponible o None si todos están agotados
         """
         with self._lock:
-            total = len(self._accounts)
-            available = sum(
-                1 for acc in self._accounts.values() 
-                if not acc['is_exhausted']
-            )
-            exhausted = total - available
+            if self._cooldowns:
+                self._expire_cooldowns(time.time())
+            return self._scheduler.peek()
+    
+    def acquire_account(self, waiter: Optional[AccountWaiter] = None) -> Optional[str]:
+        """
+        Reserva un hueco en la cuenta disponible menos cargada para una
+        solicitud.
+        
+        Si la cuenta que propone la política de selección está libre se usa
+        esa; si no, la que tiene menos solicitudes en curso. Si todas están
+        al límite y se indica waiter, la espera queda en la cola más corta y
+        waiter.notify avisará cuando se le conceda un hueco.
+        
+        Args:
+            waiter: Espera a encolar si no hay hueco libre (opcional)
             
-            return {
-                'total_accounts': total,
-                'available_accounts': available,
-                'exhausted_accounts': exhausted
-            }
+        Returns:
+            Token reservado, o None si no hay hueco libre (waiter.queued_on
+            indica la cuenta en cuya cola espera, o None si no se encoló)
+        """
+        with self._lock:
+            if self._cooldowns:
+                self._expire_cooldowns(time.time())
+            token = self._admission.select(self._scheduler.select())
+            if token is None:
+                if waiter is not None:
+                    self._admission.enqueue(waiter)
+                return None
+            self._admission.acquire(token)
+            record = self._accounts[token]
+        
+        record.last_used = time.time()
+        return token
+    
+    def try_claim_account(self, token: str) -> bool:
+        """
+        Reserva un hueco en una cuenta concreta si no está al límite (p. ej.
+        al reintentar con otra cuenta tras un rechazo).
+        
+        Args:
+            token: Token de la cuenta
+            
+        Returns:
+            True si se reservó; False si la cuenta no está disponible o no
+            tiene hueco libre
+        """
+        with self._lock:
+            return self._admission.try_acquire(token)
+    
+    def release_account(self, token: str) -> None:
+        """
+        Libera el hueco reservado con acquire_account o try_claim_account; si hay
+        solicitudes esperando en la cuenta, el hueco pasa a la primera.
+        
+        Args:
+            token: Token de la cuenta
+        """
+        with self._lock:
+            self._admission.release(token)
+    
+    def cancel_wait(self, waiter: AccountWaiter) -> Optional[str]:
+        """
+        Abandona una espera encolada por acquire_account.
+        
+        Args:
+            waiter: Espera a abandonar
+            
+        Returns:
+            Token concedido si el hueco llegó antes de cancelar (el llamador
+            debe usarlo o liberarlo), None si la espera se canceló
+        """
+        with self._lock:
+            if self._admission.cancel(waiter):
+                return None
+            return waiter.granted
+    
+    def get_statistics(self) -> dict:
+        """
+        Obtiene estadísticas agregadas de las cuentas.
+        
+        Se leen de contadores y enfriamientos publicados en cada escritura y
+        de la ocupación por cuenta de la admisión, sin tomar el lock. Solo se
+        toma si algún enfriamiento ya terminó y aún no se ha vencido.
+        
+        Returns:
+            Diccionario con estadísticas de cuentas; cooldowns indica los
+            segundos de enfriamiento restantes de cada cuenta apartada, e
+            in_flight y queued las solicitudes en curso y en espera de cada
+            cuenta ocupada
+        """
+        now = time.time()
+        published = self._cooldowns
+        if any(until <= now for until in published.values()):
+            with self._lock:
+                self._expire_cooldowns(now)
+            published = self._cooldowns
+        cooldowns = {
+            token: round(max(until - now, 0.0), 3)
+            for token, until in published.items()
+        }
+        in_flight, queued = self._admission.statistics()
+        
+        counts = self._counts
+        return {
+            'total_accounts': counts.total,
+            'available_accounts': counts.available,
+            'exhausted_accounts': counts.total - counts.available - counts.cooling_down,
+            'cooling_down_accounts': counts.cooling_down,
+            'total_quota_remaining': counts.quota_remaining,
+            'total_quota': counts.quota_total,
+            'cooldowns': cooldowns,
+            'in_flight': in_flight,
+            'queued': queued
+        }
     
     def get_available_accounts_count(self) -> int:
         """
@@ -175,11 +770,7 @@ class AuthModel:
         Returns:
             Número de cuentas con cuota disponible
         """
-        with self._lock:
-            return sum(
-                1 for acc in self._accounts.values() 
-                if not acc['is_exhausted']
-            )
+        return self._counts.available
     
     def get_total_accounts_count(self) -> int:
         """
@@ -188,18 +779,150 @@ class AuthModel:
         Returns:
             Número total de cuentas registradas
         """
+        return self._counts.total
+    
+    def get_all_accounts(self) -> Mapping[str, AccountRecord]:
+        """
+        Obtiene una instantánea inmutable de todas las cuentas registradas.
+        
+        La instantánea se comparte entre lectores hasta la siguiente
+        escritura y se reconstruye en la primera lectura posterior, así
+        varias escrituras seguidas se copian una sola vez; el lock solo se
+        toma para copiar el índice de cuentas.
+        
+        Returns:
+            Mapping de solo lectura {token: account_info}; cada AccountRecord
+            se lee como un diccionario de solo lectura
+        """
+        if not self._snapshot_dirty:
+            return self._snapshot
+        
+        with self._lock:
+            if self._snapshot_dirty:
+                self._snapshot = MappingProxyType(self._accounts.copy())
+                self._snapshot_dirty = False
+            return self._snapshot
+    
+    def has_account(self, token: str) -> bool:
+        """
+        Indica si una cuenta está registrada, sin construir la instantánea.
+        
+        Args:
+            token: Token de la cuenta
+            
+        Returns:
+            True si la cuenta existe
+        """
+        return token in self._accounts
+    
+    def get_stale_accounts(self, max_age: float) -> List[str]:
+        """
+        Obtiene las cuentas cuya cuota no se ha verificado recientemente.
+        
+        Args:
+            max_age: Segundos desde la última verificación a partir de los que
+                     una cuenta se considera caducada
+        
+        Returns:
+            Tokens nunca verificados o verificados hace más de max_age segundos
+        """
+        limit = time.time() - max_age
+        with self._lock:
+            return [
+                token for token in self._accounts
+                if self._verified_at.get(token, 0.0) < limit
+            ]
+    
+    def flush_store(self) -> int:
+        """
+        Guarda ya todas las cuentas en el almacén (p. ej. antes de cerrar),
+        incluido su last_used vigente.
+        
+        Returns:
+            Número de cuentas escritas (0 sin almacén)
+        """
+        if self._account_store is None:
+            return 0
+        with self._lock:
+            for token, account in self._accounts.items():
+                self._account_store.save(token, account, self._verified_at.get(token))
+        return self._account_store.flush()
+    
+    def use_shared_table(self) -> None:
+        """
+        Publica las cuentas en una tabla en memoria compartida entre procesos.
+        
+        Debe llamarse antes de crear los procesos servidor, que heredan la
+        tabla; desde entonces cada escritura se publica y apply_shared_changes
+        aplica las de los demás procesos. Si ya hay tabla no hace nada.
+        """
+        if self._shared_table is not None:
+            return
+        
+        table = SharedAccountTable()
         with self._lock:
-            return len(self._accounts)
+            for token, account in self._accounts.items():
+                table.publish(token, account)
+            # Las publicaciones propias ya están aplicadas
+            table.poll()
+            self._shared_table = table
     
-    def get_all_accounts(self) -> dict[str, dict]:
+    def close_shared_table(self) -> None:
+        """Deja de compartir las cuentas y libera la tabla compartida"""
+        with self._lock:
+            table, self._shared_table = self._shared_table, None
+        if table is not None:
+            table.close()
+    
+    def apply_shared_changes(self) -> int:
         """
-        Obtiene una copia de todas las cuentas registradas.
+        Aplica los cambios de cuentas publicados por otros procesos.
+        
+        Si la tabla no cambió desde la última llamada solo se lee su versión.
         
         Returns:
-            Diccionario con todas las cuentas {token: account_info}
+            Número de cambios aplicados
         """
+        table = self._shared_table
+        if table is None:
+            return 0
+        
+        changes = table.poll()
+        if not changes:
+            return 0
+        
+        now = time.time()
         with self._lock:
-            return self._accounts.copy()
+            for token, state in changes:
+                if state is None:
+                    self._discard(token)
+                    continue
+                
+                if state.cooldown_until > now:
+                    self._set_cooldown(token, state.cooldown_until)
+                else:
+                    self._clear_cooldown(token)
+                self._store(token, self._shared_record(token, state), persist=False)
+        self._flush_retired()
+        return len(changes)
+    
+    def _shared_record(self, token: str, state: SharedAccountState) -> AccountRecord:
+        """Registro local con el estado compartido de una cuenta (lock tomado)"""
+        current = self._accounts.get(token)
+        if current is None:
+            return AccountRecord(
+                token,
+                quota_remaining=state.quota_remaining,
+                quota_total=state.quota_total,
+                is_exhausted=state.is_exhausted,
+                failover_count=state.failover_count
+            )
+        return current.replace(
+            quota_remaining=state.quota_remaining,
+            quota_total=state.quota_total,
+            is_exhausted=state.is_exhausted,
+            failover_count=state.failover_count
+        )
     
     def _validate_token(self, token: str) -> None:
         """
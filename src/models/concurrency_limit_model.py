@@ -0,0 +1,185 @@
+"""
+Modelo de Límite de Concurrencia Adaptativo - CoProx
+
+PROPÓSITO:
+Este módulo limita cuántas solicitudes hay en curso a la vez hacia la API de
+Copilot y ajusta ese límite según la respuesta de la API: crece mientras la
+latencia se mantiene estable y se reduce cuando la latencia o los errores
+aumentan. Así, cuando la API se ralentiza, las solicitudes sobrantes se
+rechazan de inmediato en lugar de acumularse hasta agotar REQUEST_TIMEOUT.
+
+FUNCIONAMIENTO:
+- try_acquire admite una solicitud si las que hay en curso no alcanzan el límite
+- record recibe la latencia de cada llamada a la API y si fue correcta
+- AIMD: cada llamada correcta con la API ocupada suma 1/límite (≈ +1 por
+  ventana completa); un error o una subida de latencia multiplica el límite
+  por UPSTREAM_LIMIT_BACKOFF
+- La subida de latencia se detecta por gradiente: la media móvil rápida supera
+  UPSTREAM_LIMIT_TOLERANCE veces la media móvil lenta (la latencia habitual)
+- Tras una reducción no se vuelve a reducir hasta completar una ventana de
+  llamadas, para no desplomar el límite con una sola ráfaga de errores
+
+PARÁMETROS DE ENTRADA:
+- max_limit: Concurrencia del motor del servidor (SERVER_THREADS en waitress,
+  ASYNC_MAX_CONNECTIONS en asyncio); por encima de ella el límite no
+  rechazaría nada, así que es el techo y el punto de partida
+- initial, min_limit: Límite inicial (por defecto max_limit) y mínimo
+- backoff: Factor de reducción ante errores o latencia alta
+- tolerance: Cociente entre latencia reciente y habitual que se tolera
+
+SALIDA ESPERADA:
+- try_acquire: True si la solicitud puede llamar a la API
+- get_statistics: Límite actual, solicitudes en curso, rechazos y latencias
+
+PROCESAMIENTO DE DATOS:
+- Latencias en segundos; medias móviles exponenciales con factores fijos
+- El límite es un float; se admite mientras en curso < int(límite)
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py y async_proxy_controller.py (chat completions)
+- Utiliza: config_model.py (límites, reducción y tolerancia)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Cada proceso servidor ajusta su propio límite
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from src.models.config_model import (
+    UPSTREAM_LIMIT_BACKOFF,
+    UPSTREAM_LIMIT_MIN,
+    UPSTREAM_LIMIT_TOLERANCE
+)
+
+# Factores de las medias móviles de latencia: la rápida sigue las últimas
+# llamadas y la lenta representa la latencia habitual
+_SHORT_ALPHA = 0.2
+_LONG_ALPHA = 0.02
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Límite de concurrencia AIMD guiado por latencia y errores (thread-safe).
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        initial: Optional[int] = None,
+        min_limit: int = UPSTREAM_LIMIT_MIN,
+        backoff: float = UPSTREAM_LIMIT_BACKOFF,
+        tolerance: float = UPSTREAM_LIMIT_TOLERANCE
+    ):
+        """
+        Crea el límite sin solicitudes en curso.
+
+        Args:
+            max_limit: Límite máximo (la concurrencia del motor del servidor)
+            initial: Límite inicial (None = max_limit)
+            min_limit: Límite mínimo (>= 1)
+            backoff: Factor de reducción, entre 0 y 1
+            tolerance: Cociente de latencia tolerado, mayor que 1
+
+        Raises:
+            ValueError: Si los parámetros no son coherentes
+        """
+        if initial is None:
+            initial = max_limit
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Se requiere 1 <= min_limit <= initial <= max_limit")
+        if not 0 < backoff < 1 or tolerance <= 1:
+            raise ValueError("backoff debe estar entre 0 y 1 y tolerance ser mayor que 1")
+
+        self._limit = float(initial)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._backoff = backoff
+        self._tolerance = tolerance
+        self._in_flight = 0
+        self._rejected = 0
+        self._short_latency: Optional[float] = None
+        self._long_latency: Optional[float] = None
+        # Llamadas que faltan para permitir otra reducción
+        self._hold = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Solicitudes en curso permitidas ahora"""
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """
+        Admite una solicitud si no se ha alcanzado el límite.
+
+        Returns:
+            True si la solicitud ocupa un hueco (debe llamar a release),
+            False si se rechaza
+        """
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                self._rejected += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        """Libera el hueco de una solicitud admitida con try_acquire"""
+        with self._lock:
+            if self._in_flight > 0:
+                self._in_flight -= 1
+
+    def record(self, latency: float, ok: bool) -> None:
+        """
+        Ajusta el límite con el resultado de una llamada a la API.
+
+        Args:
+            latency: Segundos hasta recibir la respuesta
+            ok: False si la llamada falló o la API pidió frenar (error de
+                red, 429 o 5xx)
+        """
+        with self._lock:
+            if self._hold > 0:
+                self._hold -= 1
+
+            if not ok:
+                self._decrease()
+                return
+
+            if self._short_latency is None or self._long_latency is None:
+                self._short_latency = self._long_latency = latency
+                return
+            self._short_latency += _SHORT_ALPHA * (latency - self._short_latency)
+            self._long_latency += _LONG_ALPHA * (latency - self._long_latency)
+
+            if self._short_latency > self._tolerance * self._long_latency:
+                self._decrease()
+            elif self._in_flight * 2 >= self._limit:
+                # Solo se crece si el límite se está usando
+                self._limit = min(self._limit + 1 / self._limit, float(self._max_limit))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene el estado del límite.
+
+        Returns:
+            Diccionario con limit, in_flight, rejected y las latencias medias
+            reciente y habitual en segundos (None sin muestras)
+        """
+        with self._lock:
+            return {
+                'limit': int(self._limit),
+                'in_flight': self._in_flight,
+                'rejected': self._rejected,
+                'latency_recent': self._short_latency,
+                'latency_baseline': self._long_latency
+            }
+
+    def _decrease(self) -> None:
+        """Reduce el límite una vez por ventana (llamar con el lock tomado)"""
+        if self._hold > 0:
+            return
+        self._limit = max(self._limit * self._backoff, float(self._min_limit))
+        self._hold = int(self._limit)
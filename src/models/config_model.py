@@ -90,6 +90,12 @@ Todos los endpoints se construyen a partir de esta URL.
 Fuente: proxy_original.py línea 28
 """
 
+COPILOT_TOKEN_URL: Final[str] = "https://api.github.com/copilot_internal/v2/token"
+"""
+URL que intercambia el token OAuth de una cuenta por un token de sesión de
+Copilot de corta duración (y devuelve además sus cuotas).
+"""
+
 REQUEST_TIMEOUT: Final[int] = 30
 """
 Timeout en segundos para todas las solicitudes HTTP.
@@ -128,6 +134,313 @@ Fuente: proxy_original.py líneas 34-40
 # CONFIGURACIÓN DEL SERVIDOR PROXY
 # ============================================================================
 
+STREAMING_PASSTHROUGH: Final[bool] = True
+"""
+Reenvía las solicitudes stream=true como Server-Sent Events chunk a chunk.
+Si es False, se responde con el mensaje que pide desactivar el streaming.
+"""
+
+RESPONSE_PASSTHROUGH: Final[bool] = True
+"""
+Reenvía el cuerpo de las completions sin decodificar ni recodificar el JSON.
+El campo "model" solo se parchea a nivel de bytes cuando debe cambiar.
+"""
+
+PASSTHROUGH_CHUNK_SIZE: Final[int] = 64 * 1024
+"""
+Tamaño en bytes de los bloques reenviados en modo passthrough.
+"""
+
+RESPONSE_CACHE_ENABLED: Final[bool] = False
+"""
+Activa la caché en memoria de completions deterministas (temperature 0,
+sin streaming). Un acierto no consume cuota ni llama a la API.
+"""
+
+RESPONSE_CACHE_MAX_ENTRIES: Final[int] = 512
+"""
+Número máximo de respuestas almacenadas en la caché de cada proceso.
+"""
+
+RESPONSE_CACHE_MAX_BYTES: Final[int] = 32 * 1024 * 1024
+"""
+Tamaño máximo en bytes de los cuerpos almacenados en la caché de cada proceso.
+"""
+
+RESPONSE_CACHE_TTL: Final[float] = 300.0
+"""
+Segundos que una respuesta permanece válida en la caché.
+"""
+
+FAILOVER_STATUS_CODES: Final[frozenset] = frozenset({401, 402, 403, 429})
+"""
+Códigos de la API que indican que la cuenta no puede atender la solicitud
+(token revocado, sin cuota o limitado). La cuenta se marca como agotada (o se
+aparta temporalmente, ver COOLDOWN_STATUS_CODES) y la solicitud se reintenta
+con la siguiente cuenta disponible.
+"""
+
+FAILOVER_MAX_ATTEMPTS: Final[int] = 3
+"""
+Intentos máximos (cuentas distintas) por solicitud antes de devolver el error
+de la API al cliente.
+"""
+
+COOLDOWN_STATUS_CODES: Final[frozenset] = frozenset({429})
+"""
+Códigos de FAILOVER_STATUS_CODES que indican una limitación temporal: la cuenta
+no se marca como agotada sino que se aparta durante el tiempo indicado en
+Retry-After y vuelve sola a la rotación.
+"""
+
+COOLDOWN_DEFAULT_SECONDS: Final[float] = 60.0
+"""
+Enfriamiento de una cuenta limitada cuando la respuesta no trae Retry-After
+(o no es válido).
+"""
+
+COOLDOWN_MAX_SECONDS: Final[float] = 3600.0
+"""
+Enfriamiento máximo de una cuenta limitada, aunque Retry-After indique más.
+"""
+
+COOLDOWN_TICK: Final[float] = 1.0
+"""
+Resolución en segundos de la rueda de temporización de enfriamientos.
+"""
+
+COOLDOWN_WHEEL_SLOTS: Final[int] = 64
+"""
+Ranuras por nivel de la rueda de temporización.
+"""
+
+COOLDOWN_WHEEL_LEVELS: Final[int] = 3
+"""
+Niveles de la rueda de temporización (con 64 ranuras de 1 s cubren 64^3 s,
+unos 3 días; los vencimientos posteriores se recolocan al acercarse).
+"""
+
+ACCOUNT_SCHEDULER: Final[str] = "first_fit"
+"""
+Política para elegir la cuenta de cada solicitud:
+"first_fit" usa la primera cuenta disponible hasta agotarla, "round_robin"
+rota entre todas, "lru" elige la usada hace más tiempo y "quota" la que
+tiene más cuota restante.
+"""
+
+ACCOUNT_SCHEDULERS: Final[tuple] = ("first_fit", "round_robin", "lru", "quota")
+"""
+Valores admitidos para ACCOUNT_SCHEDULER.
+"""
+
+ACCOUNT_ADMISSION_ENABLED: Final[bool] = True
+"""
+Limita las solicitudes en curso por cuenta y envía cada solicitud a la cuenta
+disponible menos cargada. Con la política de selección solo se decide entre
+cuentas libres.
+"""
+
+ACCOUNT_MAX_IN_FLIGHT: Final[int] = 4
+"""
+Solicitudes en curso permitidas a la vez con una misma cuenta, en cada proceso
+servidor.
+"""
+
+ACCOUNT_QUEUE_SIZE: Final[int] = 8
+"""
+Solicitudes que pueden esperar turno en cada cuenta cuando todas están al
+límite; por encima se responde 503.
+"""
+
+ACCOUNT_QUEUE_TIMEOUT: Final[float] = 10.0
+"""
+Segundos que una solicitud espera turno antes de responder 503.
+"""
+
+ACCOUNT_SYNC_QUEUE_TIMEOUT: Final[float] = 0.5
+"""
+Espera máxima de turno con el motor síncrono (Waitress): la espera ocupa uno de
+los SERVER_THREADS hilos del servidor, así que se responde 503 mucho antes que
+en el motor asyncio.
+"""
+
+UPSTREAM_LIMIT_ENABLED: Final[bool] = True
+"""
+Limita las solicitudes en curso hacia la API con un límite adaptativo (AIMD):
+crece mientras la latencia es estable y se reduce ante errores o latencia alta.
+Las solicitudes por encima del límite se responden al momento con 429.
+"""
+
+UPSTREAM_LIMIT_MIN: Final[int] = 1
+"""
+Límite mínimo: aunque la API vaya lenta se admiten al menos estas solicitudes.
+El límite inicial y el máximo son la concurrencia del motor del servidor
+(SERVER_THREADS en waitress, ASYNC_MAX_CONNECTIONS en asyncio): un límite
+mayor nunca se alcanzaría y no rechazaría ninguna solicitud.
+"""
+
+UPSTREAM_LIMIT_BACKOFF: Final[float] = 0.9
+"""
+Factor por el que se multiplica el límite ante un error o una subida de latencia.
+"""
+
+UPSTREAM_LIMIT_TOLERANCE: Final[float] = 2.0
+"""
+Veces que la latencia reciente puede superar la habitual antes de reducir el límite.
+"""
+
+UPSTREAM_LIMIT_RETRY_AFTER: Final[int] = 1
+"""
+Segundos indicados en el header Retry-After de las solicitudes rechazadas.
+"""
+
+SESSION_TOKENS_ENABLED: Final[bool] = True
+"""
+Envía a la API el token de sesión de Copilot de cada cuenta en lugar del token
+OAuth. Los tokens de sesión se intercambian y refrescan en segundo plano.
+"""
+
+SESSION_TOKEN_REFRESH_MARGIN: Final[float] = 120.0
+"""
+Segundos antes de la caducidad de un token de sesión en los que se refresca.
+"""
+
+SESSION_TOKEN_RETRY_DELAY: Final[float] = 30.0
+"""
+Segundos de espera antes de reintentar un intercambio de token fallido.
+Se duplica con cada fallo consecutivo de la misma cuenta.
+"""
+
+SESSION_TOKEN_RETRY_MAX_DELAY: Final[float] = 1800.0
+"""
+Espera máxima entre reintentos de intercambio de una cuenta que sigue fallando.
+"""
+
+SESSION_TOKEN_DEFAULT_TTL: Final[float] = 1500.0
+"""
+Vida asumida de un token de sesión cuando la respuesta no indica su caducidad.
+"""
+
+QUOTA_TRACKING_ENABLED: Final[bool] = True
+"""
+Actualiza la cuota de cada cuenta a partir de las respuestas de la API, en un
+hilo en segundo plano fuera del camino de la respuesta.
+"""
+
+QUOTA_TRACKING_QUEUE_SIZE: Final[int] = 4096
+"""
+Observaciones pendientes como máximo. Si la cola está llena la observación se
+descarta en vez de bloquear la respuesta.
+"""
+
+QUOTA_TRACKING_IDLE_TIMEOUT: Final[float] = 30.0
+"""
+Segundos sin observaciones tras los que el hilo de seguimiento termina (se
+vuelve a crear con la siguiente respuesta).
+"""
+
+QUOTA_TRACKING_ESTIMATE: Final[bool] = False
+"""
+Descuenta una unidad de cuota por cada respuesta servida sin headers de cuota.
+Es una estimación: desactivada, solo se aplica la cuota que informa la API y
+la verificación periódica corrige el resto.
+"""
+
+QUOTA_REFRESH_ENABLED: Final[bool] = True
+"""
+Verifica periódicamente en segundo plano la cuota de todas las cuentas mientras
+el servidor está en marcha (al arrancar, primero las de verificación caducada).
+"""
+
+QUOTA_REFRESH_INTERVAL: Final[float] = 900.0
+"""
+Segundos entre verificaciones completas de la cuota de todas las cuentas.
+"""
+
+QUOTA_REFRESH_JITTER: Final[float] = 0.1
+"""
+Variación aleatoria (fracción de QUOTA_REFRESH_INTERVAL) de cada espera, para
+que varios procesos no verifiquen a la vez.
+"""
+
+QUOTA_REFRESH_WORKERS: Final[int] = 32
+"""
+Hilos del pool que verifica cuentas en paralelo.
+"""
+
+QUOTA_REFRESH_PER_HOST: Final[int] = 16
+"""
+Verificaciones simultáneas como máximo contra un mismo host.
+"""
+
+QUOTA_SNAPSHOT_HEADER: Final[str] = "x-quota-snapshot-chat"
+"""
+Header de Copilot con la cuota de chat (ent=<total>&rem=<porcentaje restante>).
+"""
+
+QUOTA_REMAINING_HEADER: Final[str] = "x-ratelimit-remaining"
+"""
+Header con las solicitudes restantes, usado si no llega QUOTA_SNAPSHOT_HEADER.
+"""
+
+QUOTA_LIMIT_HEADER: Final[str] = "x-ratelimit-limit"
+"""
+Header con el total de solicitudes que acompaña a QUOTA_REMAINING_HEADER.
+"""
+
+STATS_STRIPES: Final[int] = 8
+"""
+Franjas de contadores por proceso en el bloque de estadísticas compartido.
+Los hilos de un worker se reparten entre ellas para no competir todos por
+el mismo lock en cada solicitud.
+"""
+
+REQUEST_COALESCING: Final[bool] = True
+"""
+Agrupa las solicitudes de chat idénticas (sin streaming) que están en curso
+a la vez para que solo una llegue a la API.
+"""
+
+COALESCING_WAIT_TIMEOUT: Final[float] = 60.0
+"""
+Segundos que una solicitud agrupada espera a la primera antes de hacer su
+propia llamada a la API.
+"""
+
+MODELS_CACHE_ENABLED: Final[bool] = True
+"""
+Cachea la respuesta de /models, compartida por todas las cuentas, en vez de
+llamar a la API en cada solicitud.
+"""
+
+MODELS_CACHE_TTL: Final[float] = 300.0
+"""
+Segundos durante los cuales la lista de modelos se sirve sin revalidar.
+"""
+
+MODELS_CACHE_STALE_TTL: Final[float] = 3600.0
+"""
+Segundos adicionales durante los cuales una lista caducada se sigue sirviendo
+mientras se refresca en segundo plano (stale-while-revalidate).
+"""
+
+JSON_CODEC: Final[str] = "auto"
+"""
+Librería JSON usada para parsear solicitudes y serializar respuestas.
+"auto" usa orjson si está instalado y, si no, el módulo json estándar.
+"""
+
+JSON_CODECS: Final[tuple] = ("auto", "orjson", "json")
+"""
+Valores admitidos para JSON_CODEC.
+"""
+
+SSE_CONTENT_TYPE: Final[str] = "text/event-stream"
+"""
+Content-Type de las respuestas en streaming (Server-Sent Events).
+Usado por la API de Copilot y esperado por los clientes OpenAI.
+"""
+
 DEFAULT_HOST: Final[str] = "0.0.0.0"
 """
 Host por defecto del servidor proxy.
@@ -143,6 +456,58 @@ Fuente: proxy_original.py línea 256
 """
 
 
+SERVER_THREADS: Final[int] = 4
+"""
+Número de hilos de trabajo del servidor Waitress.
+Limita las solicitudes atendidas en paralelo por cada proceso servidor.
+"""
+
+SERVER_WORKERS: Final[int] = 1
+"""
+Número de procesos servidor por defecto.
+Con más de uno, cada proceso escucha en el mismo puerto con SO_REUSEPORT
+y el trabajo de parseo/serialización JSON se reparte entre núcleos.
+"""
+
+WORKER_SUPERVISE_INTERVAL: Final[float] = 1.0
+"""
+Segundos entre comprobaciones del supervisor de workers.
+Un worker que termina inesperadamente se reinicia en este intervalo.
+"""
+
+SERVER_ENGINE: Final[str] = "waitress"
+"""
+Motor de servidor por defecto del proxy.
+"waitress": Flask sobre Waitress con SERVER_THREADS hilos.
+"asyncio": aplicación ASGI sobre uvicorn con cliente HTTP asíncrono
+(requiere las dependencias opcionales uvicorn y httpx).
+"""
+
+SERVER_ENGINES: Final[tuple[str, ...]] = ("waitress", "asyncio")
+"""
+Motores de servidor soportados por ProxyController.start_server.
+"""
+
+ASYNC_MAX_CONNECTIONS: Final[int] = 256
+"""
+Máximo de conexiones simultáneas hacia la API en el motor asyncio.
+Cada completion en curso ocupa una conexión, no un hilo del sistema.
+"""
+
+UPSTREAM_POOL_HOSTS: Final[int] = 4
+"""
+Número de hosts distintos para los que se mantiene un pool de conexiones.
+Cubre api.githubcopilot.com y api.github.com con margen.
+"""
+
+UPSTREAM_POOL_MAXSIZE: Final[int] = SERVER_THREADS
+"""
+Conexiones keep-alive retenidas por host en el pool hacia la API.
+Igual al número de hilos del servidor: cada hilo reutiliza su conexión
+sin abrir un nuevo handshake TCP+TLS por solicitud.
+"""
+
+
 # ============================================================================
 # CONFIGURACIÓN DE ALMACENAMIENTO - Tokens
 # ============================================================================
@@ -173,4 +538,122 @@ TOKENS_EXHAUSTED_DIR: Final[str] = "TokensAgotados"
 Directorio donde se mueven los tokens sin cuota disponible.
 Permite recuperación automática cuando la cuota se restablece.
 Fuente: proxy_original.py línea 11
-"""
\ No newline at end of file
+"""
+
+TOKEN_WATCH_ENABLED: Final[bool] = True
+"""
+Carga los tokens de TOKEN_DIRECTORY al arrancar el servidor y vigila sus
+directorios para agregar y retirar cuentas según cambian los archivos.
+"""
+
+TOKEN_WATCH_BACKEND: Final[str] = "auto"
+"""
+Mecanismo para detectar cambios en los directorios de tokens:
+"inotify" (solo Linux), "polling" (revisión periódica) o "auto" (inotify si
+está disponible, si no polling).
+"""
+
+TOKEN_WATCH_BACKENDS: Final[tuple] = ("auto", "inotify", "polling")
+"""
+Valores admitidos para TOKEN_WATCH_BACKEND.
+"""
+
+TOKEN_WATCH_DEBOUNCE: Final[float] = 0.05
+"""
+Segundos sin nuevos eventos tras los que se aplica el lote de cambios.
+"""
+
+TOKEN_WATCH_POLL_INTERVAL: Final[float] = 1.0
+"""
+Segundos entre revisiones del backend de polling (y entre reintentos de
+vigilar directorios que aún no existen con inotify).
+"""
+
+RECOVERY_SCAN_ENABLED: Final[bool] = True
+"""
+Revisa TOKENS_EXHAUSTED_DIR en segundo plano mientras el servidor está en
+marcha y restaura los tokens que vuelven a tener cuota.
+"""
+
+RECOVERY_SCAN_INTERVAL: Final[float] = 300.0
+"""
+Segundos entre revisiones de TOKENS_EXHAUSTED_DIR. Los archivos sin cambios
+verificados hace menos de RECOVERY_RECHECK_INTERVAL no se vuelven a consultar,
+por lo que una revisión sin novedades no hace llamadas a la API.
+"""
+
+RECOVERY_CHECK_WORKERS: Final[int] = 8
+"""
+Verificaciones simultáneas como máximo al revisar TOKENS_EXHAUSTED_DIR.
+"""
+
+RECOVERY_RECHECK_INTERVAL: Final[float] = 3600.0
+"""
+Segundos durante los que un archivo de token agotado que no ha cambiado no se
+vuelve a verificar.
+"""
+
+RECOVERY_STATE_FILE: Final[str] = ".recovery_state.json"
+"""
+Archivo, dentro de TOKENS_EXHAUSTED_DIR, con la última verificación de cada
+archivo de token (tamaño, fecha de modificación y momento de la verificación).
+"""
+
+RECOVERY_REJECTED_STATUS_CODES: Final[frozenset] = frozenset({401, 403})
+"""
+Códigos de copilot_internal/v2/token que indican un token revocado o sin acceso.
+La recuperación los registra como verificados sin cuota (no se reintentan hasta
+RECOVERY_RECHECK_INTERVAL o hasta que el archivo cambie); los errores de red y
+otros códigos se reintentan en el siguiente escaneo.
+"""
+
+ACCOUNT_STORE_ENABLED: Final[bool] = False
+"""
+Persiste las cuentas de AuthModel (cuota, último uso y última verificación) en
+una base SQLite para arrancar con el último estado conocido.
+"""
+
+ACCOUNT_STORE_PATH: Final[str] = "coprox_accounts.db"
+"""
+Ruta de la base SQLite del almacén de cuentas.
+"""
+
+ACCOUNT_STORE_FLUSH_INTERVAL: Final[float] = 0.5
+"""
+Segundos durante los que se acumulan cambios de cuentas antes de escribirlos
+en una sola transacción.
+"""
+
+ACCOUNT_STORE_BUSY_TIMEOUT: Final[float] = 5.0
+"""
+Segundos que una escritura espera si otro proceso tiene la base bloqueada.
+"""
+
+ACCOUNT_SYNC_ENABLED: Final[bool] = True
+"""
+Comparte el estado de las cuentas entre el controlador y los procesos servidor
+mediante una tabla en memoria compartida.
+"""
+
+ACCOUNT_SYNC_CAPACITY: Final[int] = 4096
+"""
+Número máximo de cuentas en la tabla compartida.
+"""
+
+ACCOUNT_SYNC_TOKEN_SIZE: Final[int] = 128
+"""
+Bytes reservados para el token de cada cuenta en la tabla compartida.
+"""
+
+ACCOUNT_SYNC_INTERVAL: Final[float] = 0.01
+"""
+Segundos entre comprobaciones de cambios en la tabla compartida tras un cambio
+(solo se lee un entero si no hay cambios).
+"""
+
+ACCOUNT_SYNC_MAX_INTERVAL: Final[float] = 0.5
+"""
+Segundos máximos entre comprobaciones: mientras la tabla no cambia el intervalo
+se duplica desde ACCOUNT_SYNC_INTERVAL hasta este valor, así los procesos en
+reposo no se despiertan 100 veces por segundo.
+"""
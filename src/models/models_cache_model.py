@@ -0,0 +1,178 @@
+"""
+Modelo de Caché de Modelos - CoProx
+
+PROPÓSITO:
+Este módulo guarda la última respuesta de /models de la API para que los editores, que
+consultan el endpoint al arrancar y al recuperar el foco, no generen una llamada a la
+API en cada consulta.
+
+FUNCIONAMIENTO:
+- Guarda una única entrada compartida por todas las cuentas: la lista de
+  modelos es la misma para todas, así que la rotación de cuentas
+  (round_robin, lru) no la invalida
+- Dentro del TTL la entrada está fresca y se sirve directamente
+- Tras el TTL y dentro de la ventana stale se sirve y se pide un refresco
+  en segundo plano (stale-while-revalidate); solo un refresco a la vez
+- Cada entrada tiene un ETag para responder 304 a solicitudes condicionales
+
+PARÁMETROS DE ENTRADA:
+- ttl: Segundos de frescura de la entrada
+- stale_ttl: Segundos adicionales en los que se sirve caducada
+- body: Cuerpo de la respuesta de la API
+
+SALIDA ESPERADA:
+- ModelsCacheEntry: cuerpo, ETag y momento de obtención
+- lookup: Tupla (entrada o None, si hay que refrescar en segundo plano)
+
+PROCESAMIENTO DE DATOS:
+- El ETag es un hash SHA-256 truncado del cuerpo
+- Solo se guardan respuestas exitosas (lo decide el controlador)
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py y async_proxy_controller.py (endpoint /models)
+- Utiliza: config_model.py (TTL y ventana stale)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Cada proceso servidor mantiene su propia entrada
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from src.models.config_model import MODELS_CACHE_STALE_TTL, MODELS_CACHE_TTL
+
+
+class ModelsCacheEntry(NamedTuple):
+    """Respuesta de /models almacenada"""
+    body: str
+    etag: str
+    fetched_at: float
+
+
+class ModelsCacheModel:
+    """
+    Caché thread-safe de la respuesta de /models con stale-while-revalidate.
+    """
+
+    def __init__(
+        self,
+        ttl: float = MODELS_CACHE_TTL,
+        stale_ttl: float = MODELS_CACHE_STALE_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa la caché vacía.
+
+        Args:
+            ttl: Segundos de frescura
+            stale_ttl: Segundos adicionales sirviendo la entrada caducada
+            clock: Reloj monotónico (inyectable para tests)
+
+        Raises:
+            ValueError: Si ttl no es positivo o stale_ttl es negativo
+        """
+        if ttl <= 0 or stale_ttl < 0:
+            raise ValueError("ttl debe ser positivo y stale_ttl no negativo")
+
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._clock = clock
+        self._entry: Optional[ModelsCacheEntry] = None
+        self._refreshing = False
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._lock = threading.Lock()
+
+    def lookup(self) -> Tuple[Optional[ModelsCacheEntry], bool]:
+        """
+        Busca la entrada almacenada, sea cual sea la cuenta que la obtuvo.
+
+        Si la entrada está caducada pero dentro de la ventana stale, la
+        primera llamada reserva el refresco en segundo plano; el llamador
+        debe terminarlo con finish_refresh.
+
+        Returns:
+            Tupla (entrada o None, True si el llamador debe refrescar)
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entry
+            age = now - entry.fetched_at if entry is not None else 0.0
+            if entry is None or age >= self._ttl + self._stale_ttl:
+                self._misses += 1
+                return None, False
+
+            self._hits += 1
+            if age < self._ttl or self._refreshing:
+                return entry, False
+
+            self._refreshing = True
+            self._refreshes += 1
+            return entry, True
+
+    def store(self, body: str) -> ModelsCacheEntry:
+        """
+        Guarda una respuesta exitosa de /models.
+
+        Args:
+            body: Cuerpo de la respuesta
+
+        Returns:
+            Entrada almacenada
+        """
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+        entry = ModelsCacheEntry(body, digest, self._clock())
+        with self._lock:
+            self._entry = entry
+        return entry
+
+    def finish_refresh(self) -> None:
+        """Libera la reserva de refresco en segundo plano"""
+        with self._lock:
+            self._refreshing = False
+
+    def invalidate(self) -> None:
+        """Descarta la entrada almacenada"""
+        with self._lock:
+            self._entry = None
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """
+        Evalúa un header If-None-Match contra un ETag.
+
+        Args:
+            if_none_match: Valor del header (puede contener varios ETags)
+            etag: ETag de la entrada, sin comillas
+
+        Returns:
+            True si el cliente ya tiene esa versión
+        """
+        if not if_none_match:
+            return False
+
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == "*" or candidate.strip('"') == etag:
+                return True
+        return False
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores de la caché de este proceso.
+
+        Returns:
+            Diccionario con hits, misses y refreshes
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'refreshes': self._refreshes
+            }
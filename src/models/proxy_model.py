@@ -28,6 +28,7 @@ SALIDA ESPERADA:
 
 PROCESAMIENTO DE DATOS:
 - Actualiza contadores de solicitudes en tiempo real
+- Comparte contadores entre procesos mediante stats_model.py
 - Calcula estadísticas de rendimiento y uptime
 - Determina estado de salud basándose en errores recientes
 - Formatea métricas para mostrar en la interfaz
@@ -45,9 +46,13 @@ INTERACCIONES CON MAIN:
 """
 
 import threading
-from typing import Optional
+import time
+from typing import Optional, Union
 from datetime import datetime
 from src.models.config_model import DEFAULT_HOST, DEFAULT_PORT
+from src.models.stats_model import LocalStatsBackend, SharedMemoryStatsBackend
+
+StatsBackend = Union[LocalStatsBackend, SharedMemoryStatsBackend]
 
 
 class ProxyModel:
@@ -55,20 +60,95 @@ class ProxyModel:
     Modelo del servidor proxy thread-safe para gestión de estado y estadísticas.
     
     Mantiene el estado del servidor, contadores de solicitudes y métricas
-    de rendimiento con acceso thread-safe.
+    de rendimiento con acceso thread-safe. Los contadores viven en un
+    backend intercambiable: local por defecto o en memoria compartida
+    cuando el servidor corre en otros procesos.
     """
     
-    def __init__(self):
-        """Inicializa el modelo del proxy en estado detenido"""
+    # Contadores almacenados en el backend de estadísticas
+    STAT_FIELDS = (
+        'total_requests',
+        'failed_requests',
+        'last_request_time_us',
+        'pool_hits',
+        'pool_misses',
+        'cache_hits',
+        'cache_misses',
+        'cache_evictions',
+        'coalesced_requests',
+        'coalescing_waiters',
+        'failovers',
+        'upstream_rejections'
+    )
+    
+    # Contadores que se agregan por máximo entre procesos
+    STAT_MAX_FIELDS = ('last_request_time_us',)
+    
+    def __init__(self, stats_backend: Optional[StatsBackend] = None):
+        """
+        Inicializa el modelo del proxy en estado detenido
+        
+        Args:
+            stats_backend: Backend de contadores. Si no se proporciona,
+                          se usan contadores locales del proceso.
+        """
         self._running = False
         self._host = DEFAULT_HOST
         self._port = DEFAULT_PORT
         self._start_time: Optional[datetime] = None
-        self._total_requests = 0
-        self._failed_requests = 0
-        self._last_request_time: Optional[datetime] = None
+        self._stats: StatsBackend = stats_backend if stats_backend is not None else LocalStatsBackend(
+            self.STAT_FIELDS, self.STAT_MAX_FIELDS
+        )
         self._lock = threading.Lock()
     
+    def use_shared_memory(self, slots: int) -> None:
+        """
+        Traslada los contadores a un bloque de memoria compartida.
+        
+        Los valores acumulados hasta ahora se conservan en el slot 0
+        (reservado al proceso del controlador). Si ya se usa un bloque
+        compartido con suficientes slots, no hace nada.
+        
+        Args:
+            slots: Número de procesos escritores (controlador + workers)
+        """
+        current = self._stats
+        if isinstance(current, SharedMemoryStatsBackend) and current.slots >= slots:
+            return
+        
+        backend = SharedMemoryStatsBackend(self.STAT_FIELDS, slots, self.STAT_MAX_FIELDS)
+        for field, value in current.snapshot().items():
+            if field in self.STAT_MAX_FIELDS:
+                backend.set_max(field, value)
+            elif value:
+                backend.add(field, value)
+        
+        self._stats = backend
+        current.close()
+    
+    def bind_stats_slot(self, slot: int) -> None:
+        """
+        Asigna el slot de estadísticas del proceso actual.
+        
+        Args:
+            slot: Índice de slot del worker (0 es el controlador)
+        """
+        if isinstance(self._stats, SharedMemoryStatsBackend):
+            self._stats.bind_slot(slot)
+    
+    def close(self) -> None:
+        """Libera el backend de estadísticas (memoria compartida si la hay)"""
+        snapshot = self._stats.snapshot()
+        self._stats.close()
+        
+        # Conservar los valores en un backend local por si se siguen leyendo
+        self._stats = LocalStatsBackend(self.STAT_FIELDS, self.STAT_MAX_FIELDS)
+        for field, value in snapshot.items():
+            if field in self.STAT_MAX_FIELDS:
+                self._stats.set_max(field, value)
+            elif value:
+                self._stats.add(field, value)
+    
     def start_server(
         self, 
         host: str = DEFAULT_HOST, 
@@ -125,13 +205,61 @@ class ProxyModel:
     
     def increment_request_counter(self) -> None:
         """Incrementa el contador de solicitudes totales de forma thread-safe"""
-        with self._lock:
-            self._total_requests += 1
+        self._stats.add('total_requests')
     
     def increment_error_counter(self) -> None:
         """Incrementa el contador de errores de forma thread-safe"""
-        with self._lock:
-            self._failed_requests += 1
+        self._stats.add('failed_requests')
+    
+    def record_connection_checkout(self, reused: bool) -> None:
+        """
+        Registra una conexión obtenida del pool hacia la API.
+        
+        Args:
+            reused: True si se reutilizó una conexión keep-alive,
+                    False si se abrió una nueva (handshake TCP+TLS)
+        """
+        self._stats.add('pool_hits' if reused else 'pool_misses')
+    
+    def record_cache_lookup(self, hit: bool) -> None:
+        """
+        Registra una consulta a la caché de respuestas.
+        
+        Args:
+            hit: True si la respuesta se sirvió desde la caché
+        """
+        self._stats.add('cache_hits' if hit else 'cache_misses')
+    
+    def record_cache_evictions(self, count: int) -> None:
+        """
+        Registra entradas expulsadas de la caché de respuestas.
+        
+        Args:
+            count: Número de entradas expulsadas
+        """
+        if count > 0:
+            self._stats.add('cache_evictions', count)
+    
+    def record_coalesced_request(self) -> None:
+        """Registra una solicitud servida con el resultado de otra idéntica"""
+        self._stats.add('coalesced_requests')
+    
+    def record_coalescing_wait(self, delta: int) -> None:
+        """
+        Actualiza el número de solicitudes esperando a otra idéntica.
+        
+        Args:
+            delta: +1 al empezar a esperar, -1 al terminar
+        """
+        self._stats.add('coalescing_waiters', delta)
+    
+    def record_failover(self) -> None:
+        """Registra un reintento de solicitud con otra cuenta"""
+        self._stats.add('failovers')
+    
+    def record_upstream_rejection(self) -> None:
+        """Registra una solicitud rechazada por el límite de concurrencia hacia la API"""
+        self._stats.add('upstream_rejections')
     
     def get_total_requests(self) -> int:
         """
@@ -140,8 +268,7 @@ class ProxyModel:
         Returns:
             Contador de solicitudes totales
         """
-        with self._lock:
-            return self._total_requests
+        return self._stats.snapshot()['total_requests']
     
     def get_failed_requests(self) -> int:
         """
@@ -150,8 +277,7 @@ class ProxyModel:
         Returns:
             Contador de solicitudes fallidas
         """
-        with self._lock:
-            return self._failed_requests
+        return self._stats.snapshot()['failed_requests']
     
     def get_uptime_seconds(self) -> float:
         """
@@ -169,8 +295,7 @@ class ProxyModel:
     
     def update_last_request_time(self) -> None:
         """Actualiza el timestamp de la última solicitud procesada"""
-        with self._lock:
-            self._last_request_time = datetime.now()
+        self._stats.set_max('last_request_time_us', time.time_ns() // 1000)
     
     def get_last_request_time(self) -> Optional[datetime]:
         """
@@ -179,46 +304,62 @@ class ProxyModel:
         Returns:
             Datetime de última solicitud o None si no hay solicitudes
         """
-        with self._lock:
-            return self._last_request_time
+        return self._to_datetime(self._stats.snapshot()['last_request_time_us'])
+    
+    def _to_datetime(self, timestamp_us: int) -> Optional[datetime]:
+        """Convierte microsegundos desde epoch a datetime local (0 = None)"""
+        if timestamp_us <= 0:
+            return None
+        return datetime.fromtimestamp(timestamp_us / 1_000_000)
     
     def get_statistics(self) -> dict:
         """
         Obtiene estadísticas agregadas del servidor.
         
+        Los contadores se leen del backend sin bloquear a los escritores.
+        
         Returns:
             Diccionario con métricas completas del servidor
         """
+        counters = self._stats.snapshot()
+        total = counters['total_requests']
+        failed = counters['failed_requests']
+        successful = total - failed
+        
+        # Calcular tasa de éxito
+        if total > 0:
+            success_rate = successful / total
+        else:
+            success_rate = 1.0
+        
         with self._lock:
-            successful = self._total_requests - self._failed_requests
-            
-            # Calcular tasa de éxito
-            if self._total_requests > 0:
-                success_rate = successful / self._total_requests
-            else:
-                success_rate = 1.0
-            
             # Calcular uptime sin llamar a método que usa lock
             if self._running and self._start_time is not None:
                 uptime = (datetime.now() - self._start_time).total_seconds()
             else:
                 uptime = 0.0
-            
-            return {
-                'total_requests': self._total_requests,
-                'successful_requests': successful,
-                'failed_requests': self._failed_requests,
-                'uptime_seconds': uptime,
-                'last_request_time': self._last_request_time,
-                'success_rate': success_rate
-            }
+        
+        return {
+            'total_requests': total,
+            'successful_requests': successful,
+            'failed_requests': failed,
+            'uptime_seconds': uptime,
+            'last_request_time': self._to_datetime(counters['last_request_time_us']),
+            'success_rate': success_rate,
+            'pool_hits': counters['pool_hits'],
+            'pool_misses': counters['pool_misses'],
+            'cache_hits': counters['cache_hits'],
+            'cache_misses': counters['cache_misses'],
+            'cache_evictions': counters['cache_evictions'],
+            'coalesced_requests': counters['coalesced_requests'],
+            'coalescing_waiters': counters['coalescing_waiters'],
+            'failovers': counters['failovers'],
+            'upstream_rejections': counters['upstream_rejections']
+        }
     
     def reset_statistics(self) -> None:
         """Resetea todos los contadores de estadísticas a cero"""
-        with self._lock:
-            self._total_requests = 0
-            self._failed_requests = 0
-            self._last_request_time = None
+        self._stats.reset()
     
     def get_health_status(self) -> str:
         """
@@ -227,15 +368,17 @@ class ProxyModel:
         Returns:
             'healthy', 'degraded', o 'unhealthy'
         """
-        with self._lock:
-            if self._total_requests == 0:
-                return 'healthy'
-            
-            error_rate = self._failed_requests / self._total_requests
-            
-            if error_rate < 0.1:  # Menos de 10% errores
-                return 'healthy'
-            elif error_rate < 0.5:  # Entre 10% y 50% errores
-                return 'degraded'
-            else:  # Más de 50% errores
-                return 'unhealthy'
+        counters = self._stats.snapshot()
+        total = counters['total_requests']
+        
+        if total == 0:
+            return 'healthy'
+        
+        error_rate = counters['failed_requests'] / total
+        
+        if error_rate < 0.1:  # Menos de 10% errores
+            return 'healthy'
+        elif error_rate < 0.5:  # Entre 10% y 50% errores
+            return 'degraded'
+        else:  # Más de 50% errores
+            return 'unhealthy'
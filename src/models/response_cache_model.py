@@ -0,0 +1,251 @@
+"""
+Modelo de Caché de Respuestas - CoProx
+
+PROPÓSITO:
+Este módulo almacena en memoria las respuestas de chat completions deterministas para
+servir solicitudes idénticas sin consumir cuota de las cuentas ni llamar a la API.
+
+FUNCIONAMIENTO:
+- Solo son elegibles solicitudes sin streaming con temperature 0 y una única opción
+- La clave es un hash canónico del cuerpo (modelo, mensajes y parámetros de muestreo)
+- Acotada por número de entradas y por bytes totales, con expulsión LRU
+- Cada entrada caduca tras un TTL fijo
+
+PARÁMETROS DE ENTRADA:
+- max_entries: Número máximo de respuestas almacenadas
+- max_bytes: Tamaño máximo total de los cuerpos almacenados
+- ttl: Segundos de validez de cada entrada
+- request_data: Diccionario con la solicitud del cliente
+
+SALIDA ESPERADA:
+- cache_key: String hexadecimal con el hash de la solicitud
+- cached_response: CachedResponse con cuerpo y Content-Type, o None
+- statistics: Diccionario con entradas, bytes, aciertos, fallos y expulsiones
+
+PROCESAMIENTO DE DATOS:
+- El hash se calcula sobre JSON con claves ordenadas, así el orden de los campos
+  no cambia la clave
+- Los campos que no afectan a la respuesta (stream, user) se ignoran
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py y async_proxy_controller.py (antes de reenviar)
+- Usado por: coalescing_service.py (canonical_request_key)
+- Utiliza: config_model.py (límites y TTL)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Cada proceso servidor mantiene su propia caché
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from src.models.config_model import (
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL
+)
+
+
+# Campos de la solicitud que no influyen en la respuesta
+IGNORED_REQUEST_FIELDS = frozenset(('stream', 'user'))
+
+
+def canonical_request_key(request_data: Dict[str, Any]) -> str:
+    """
+    Calcula un hash canónico de una solicitud de chat.
+
+    El JSON se serializa con claves ordenadas, así el orden de los campos
+    no cambia la clave; se ignoran los campos de IGNORED_REQUEST_FIELDS.
+
+    Args:
+        request_data: Solicitud del cliente
+
+    Returns:
+        Hash SHA-256 en hexadecimal
+
+    Raises:
+        TypeError: Si la solicitud contiene valores no serializables
+    """
+    canonical = {
+        key: value
+        for key, value in request_data.items()
+        if key not in IGNORED_REQUEST_FIELDS
+    }
+    encoded = json.dumps(
+        canonical,
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False
+    ).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class CachedResponse(NamedTuple):
+    """Respuesta almacenada en la caché"""
+    body: bytes
+    content_type: str
+    expires_at: float
+
+
+class ResponseCacheModel:
+    """
+    Caché LRU thread-safe de respuestas de chat completions.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        ttl: float = RESPONSE_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa la caché vacía.
+
+        Args:
+            max_entries: Número máximo de entradas
+            max_bytes: Bytes máximos entre todos los cuerpos
+            ttl: Segundos de validez de cada entrada
+            clock: Reloj monotónico (inyectable para tests)
+
+        Raises:
+            ValueError: Si algún límite no es positivo
+        """
+        if max_entries < 1 or max_bytes < 1 or ttl <= 0:
+            raise ValueError("Los límites de la caché deben ser positivos")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, request_data: Dict[str, Any]) -> bool:
+        """
+        Indica si una solicitud es determinista y puede servirse desde caché.
+
+        Args:
+            request_data: Solicitud validada del cliente
+
+        Returns:
+            True si no usa streaming, temperature es 0 y pide una sola opción
+        """
+        if request_data.get('stream'):
+            return False
+
+        temperature = request_data.get('temperature')
+        if isinstance(temperature, bool) or not isinstance(temperature, (int, float)):
+            return False
+
+        return temperature == 0 and request_data.get('n', 1) == 1
+
+    def make_key(self, request_data: Dict[str, Any]) -> str:
+        """
+        Calcula la clave canónica de una solicitud.
+
+        Args:
+            request_data: Solicitud del cliente
+
+        Returns:
+            Hash SHA-256 en hexadecimal (ver canonical_request_key)
+        """
+        return canonical_request_key(request_data)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Busca una respuesta vigente y la marca como usada recientemente.
+
+        Args:
+            key: Clave de la solicitud
+
+        Returns:
+            Respuesta almacenada o None si no existe o caducó
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, content_type: str) -> int:
+        """
+        Almacena una respuesta, expulsando las menos usadas si hace falta.
+
+        Los cuerpos mayores que max_bytes no se almacenan.
+
+        Args:
+            key: Clave de la solicitud
+            body: Cuerpo de la respuesta
+            content_type: Content-Type de la respuesta
+
+        Returns:
+            Número de entradas expulsadas para hacer sitio
+        """
+        size = len(body)
+        if size > self._max_bytes:
+            return 0
+
+        entry = CachedResponse(body, content_type, self._clock() + self._ttl)
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            while self._entries and (
+                len(self._entries) >= self._max_entries
+                or self._bytes + size > self._max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted += 1
+
+            self._entries[key] = entry
+            self._bytes += size
+            self._evictions += evicted
+        return evicted
+
+    def _remove(self, key: str) -> None:
+        """Elimina una entrada (llamar con el lock tomado)"""
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+    def clear(self) -> None:
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene el estado de la caché de este proceso.
+
+        Returns:
+            Diccionario con entries, bytes, hits, misses y evictions
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
@@ -0,0 +1,290 @@
+"""
+Modelo de Planificación de Cuentas - CoProx
+
+PROPÓSITO:
+Este módulo decide qué cuenta atiende cada solicitud. Sustituye el recorrido lineal
+de AuthModel.get_current_token por índices mantenidos de forma incremental, de modo
+que elegir cuenta no depende del tamaño del pool.
+
+FUNCIONAMIENTO:
+- AccountScheduler: interfaz común que AuthModel alimenta con altas y bajas
+- FirstFitScheduler: primera cuenta disponible en orden de alta (comportamiento
+  histórico), con un heap por orden de alta → O(log n)
+- RoundRobinScheduler: rota entre las cuentas disponibles con un deque → O(1)
+- LeastRecentlyUsedScheduler: la cuenta usada hace más tiempo, con OrderedDict → O(1)
+- QuotaWeightedScheduler: la cuenta con más quota_remaining, con un heap → O(log n)
+- create_scheduler: crea la política configurada en ACCOUNT_SCHEDULER
+
+PARÁMETROS DE ENTRADA:
+- token: String con el token de la cuenta
+- quota_remaining: Entero con la cuota restante de la cuenta
+- name: Nombre de la política ("first_fit", "round_robin", "lru", "quota")
+
+SALIDA ESPERADA:
+- select: Token de la cuenta elegida o None si no hay cuentas disponibles
+- peek: Token que elegiría select, sin avanzar la rotación (para comprobaciones)
+
+PROCESAMIENTO DE DATOS:
+- Los heaps usan invalidación perezosa: cada token recuerda la secuencia de su
+  entrada vigente, las demás entradas (obsoletas o duplicadas) se descartan al
+  llegar a la cima y el heap se compacta si crece demasiado
+- Las políticas no son thread-safe: AuthModel las usa bajo su propio lock
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: auth_model.py (get_current_token y cambios de disponibilidad)
+- Utiliza: config_model.py (ACCOUNT_SCHEDULER)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- La política se elige por configuración al crear AuthModel
+"""
+
+import heapq
+import itertools
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from src.models.config_model import ACCOUNT_SCHEDULER, ACCOUNT_SCHEDULERS
+
+# Un heap con invalidación perezosa se reconstruye al superar este factor
+# respecto a las entradas válidas
+_HEAP_COMPACT_FACTOR = 2
+_HEAP_COMPACT_MIN = 64
+
+
+class AccountScheduler(ABC):
+    """
+    Interfaz de las políticas de selección de cuenta.
+
+    AuthModel llama a set_available cuando una cuenta pasa a tener cuota (o
+    cambia su cuota) y a set_unavailable cuando se agota. Una política que no
+    implemente todos los métodos no se puede instanciar.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def set_available(self, token: str, quota_remaining: int) -> None:
+        """
+        Registra una cuenta disponible o actualiza su cuota.
+
+        Args:
+            token: Token de la cuenta
+            quota_remaining: Cuota restante
+        """
+
+    @abstractmethod
+    def set_unavailable(self, token: str) -> None:
+        """
+        Retira una cuenta de la selección (agotada o eliminada).
+
+        Args:
+            token: Token de la cuenta
+        """
+
+    @abstractmethod
+    def select(self) -> Optional[str]:
+        """
+        Elige la cuenta para la siguiente solicitud.
+
+        Returns:
+            Token elegido o None si no hay cuentas disponibles
+        """
+
+    @abstractmethod
+    def peek(self) -> Optional[str]:
+        """
+        Consulta la cuenta que elegiría select sin contarla como elegida.
+
+        Returns:
+            Token de la siguiente cuenta o None si no hay cuentas disponibles
+        """
+
+
+class FirstFitScheduler(AccountScheduler):
+    """
+    Primera cuenta disponible en orden de alta.
+
+    Conserva el orden histórico de AuthModel: una cuenta recibe toda la
+    carga hasta agotarse.
+    """
+
+    name = "first_fit"
+
+    def __init__(self):
+        self._rank: Dict[str, int] = {}
+        # Secuencia de la entrada vigente de cada cuenta disponible
+        self._current: Dict[str, int] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._sequence = itertools.count()
+
+    def set_available(self, token: str, quota_remaining: int) -> None:
+        if token in self._current:
+            return
+        rank = self._rank.setdefault(token, len(self._rank))
+        sequence = next(self._sequence)
+        self._current[token] = sequence
+        heapq.heappush(self._heap, (rank, sequence, token))
+        _compact_if_needed(self._heap, len(self._current), self._is_valid)
+
+    def set_unavailable(self, token: str) -> None:
+        self._current.pop(token, None)
+
+    def select(self) -> Optional[str]:
+        heap = self._heap
+        while heap and not self._is_valid(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def peek(self) -> Optional[str]:
+        return self.select()
+
+    def _is_valid(self, entry: Tuple[int, int, str]) -> bool:
+        return self._current.get(entry[2]) == entry[1]
+
+
+class RoundRobinScheduler(AccountScheduler):
+    """
+    Rotación circular entre las cuentas disponibles.
+    """
+
+    name = "round_robin"
+
+    def __init__(self):
+        self._ring: Deque[str] = deque()
+        self._in_ring: Set[str] = set()
+        self._available: Set[str] = set()
+
+    def set_available(self, token: str, quota_remaining: int) -> None:
+        self._available.add(token)
+        if token not in self._in_ring:
+            self._in_ring.add(token)
+            self._ring.append(token)
+
+    def set_unavailable(self, token: str) -> None:
+        # Se retira del anillo de forma perezosa al llegar su turno
+        self._available.discard(token)
+
+    def select(self) -> Optional[str]:
+        token = self.peek()
+        if token is not None:
+            self._ring.rotate(-1)
+        return token
+
+    def peek(self) -> Optional[str]:
+        ring = self._ring
+        while ring and ring[0] not in self._available:
+            self._in_ring.discard(ring.popleft())
+        return ring[0] if ring else None
+
+
+class LeastRecentlyUsedScheduler(AccountScheduler):
+    """
+    Cuenta seleccionada hace más tiempo; las nuevas o recuperadas van primero.
+    """
+
+    name = "lru"
+
+    def __init__(self):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def set_available(self, token: str, quota_remaining: int) -> None:
+        if token not in self._order:
+            self._order[token] = None
+            self._order.move_to_end(token, last=False)
+
+    def set_unavailable(self, token: str) -> None:
+        self._order.pop(token, None)
+
+    def select(self) -> Optional[str]:
+        if not self._order:
+            return None
+        token = next(iter(self._order))
+        self._order.move_to_end(token)
+        return token
+
+    def peek(self) -> Optional[str]:
+        return next(iter(self._order), None)
+
+
+class QuotaWeightedScheduler(AccountScheduler):
+    """
+    Cuenta con mayor quota_remaining; a igual cuota, la dada de alta antes.
+    """
+
+    name = "quota"
+
+    def __init__(self):
+        self._quota: Dict[str, int] = {}
+        # Secuencia de la entrada vigente de cada cuenta disponible
+        self._current: Dict[str, int] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._sequence = itertools.count()
+
+    def set_available(self, token: str, quota_remaining: int) -> None:
+        if self._quota.get(token) == quota_remaining:
+            return
+        sequence = next(self._sequence)
+        self._quota[token] = quota_remaining
+        self._current[token] = sequence
+        heapq.heappush(self._heap, (-quota_remaining, sequence, token))
+        _compact_if_needed(self._heap, len(self._current), self._is_valid)
+
+    def set_unavailable(self, token: str) -> None:
+        self._quota.pop(token, None)
+        self._current.pop(token, None)
+
+    def select(self) -> Optional[str]:
+        heap = self._heap
+        while heap and not self._is_valid(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def peek(self) -> Optional[str]:
+        return self.select()
+
+    def _is_valid(self, entry: Tuple[int, int, str]) -> bool:
+        return self._current.get(entry[2]) == entry[1]
+
+
+def _compact_if_needed(heap: list, valid_count: int, is_valid) -> None:
+    """
+    Descarta las entradas obsoletas si el heap creció demasiado.
+
+    Solo la entrada vigente de cada cuenta es válida, así que tras compactar
+    queda una por cuenta y la siguiente compactación no llega hasta que el
+    heap vuelve a doblar su tamaño.
+    """
+    if len(heap) > max(_HEAP_COMPACT_MIN, _HEAP_COMPACT_FACTOR * valid_count):
+        heap[:] = [entry for entry in heap if is_valid(entry)]
+        heapq.heapify(heap)
+
+
+_SCHEDULERS = {
+    scheduler.name: scheduler
+    for scheduler in (
+        FirstFitScheduler,
+        RoundRobinScheduler,
+        LeastRecentlyUsedScheduler,
+        QuotaWeightedScheduler
+    )
+}
+
+
+def create_scheduler(name: str = ACCOUNT_SCHEDULER) -> AccountScheduler:
+    """
+    Crea la política de selección indicada.
+
+    Args:
+        name: Nombre de la política
+
+    Returns:
+        Instancia vacía de la política
+
+    Raises:
+        ValueError: Si la política no existe
+    """
+    if name not in ACCOUNT_SCHEDULERS:
+        raise ValueError(f"Política de selección de cuentas no soportada: {name}")
+    return _SCHEDULERS[name]()
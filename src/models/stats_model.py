@@ -0,0 +1,278 @@
+"""
+Modelo de Estadísticas Compartidas - CoProx
+
+PROPÓSITO:
+Este módulo almacena los contadores de ProxyModel de forma que sean visibles desde
+todos los procesos del proxy. El servidor corre en procesos hijos (uno o varios
+workers) y la UI lee las métricas desde el proceso del controlador.
+
+FUNCIONAMIENTO:
+- LocalStatsBackend: contadores en memoria del propio proceso, con celdas por hilo
+  (cada hilo escribe solo en las suyas, sin lock)
+- SharedMemoryStatsBackend: bloque multiprocessing.shared_memory dividido en slots
+- Cada proceso escribe solo en su propio slot (sin locks entre procesos) y, dentro
+  del slot, cada hilo en una de varias franjas con su propio lock
+- La lectura agrega celdas, franjas y slots: suma contadores y toma el máximo de
+  timestamps
+
+PARÁMETROS DE ENTRADA:
+- fields: Secuencia con los nombres de los contadores
+- max_fields: Contadores que se agregan por máximo (timestamps) en vez de suma
+- slots: Número de procesos que pueden escribir (controlador + workers)
+- stripes: Franjas por slot entre las que se reparten los hilos de un proceso
+
+SALIDA ESPERADA:
+- snapshot: Diccionario {campo: valor agregado} de todos los procesos
+
+PROCESAMIENTO DE DATOS:
+- Valores enteros de 64 bits con signo
+- Los timestamps se guardan como microsegundos desde epoch
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_model.py (almacenamiento de contadores)
+- Utiliza: config_model.py (STATS_STRIPES)
+- Configurado por: proxy_controller.py (crea el bloque al iniciar el servidor)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- El bloque compartido se libera al cerrar el controlador del proxy
+"""
+
+import itertools
+import os
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from src.models.config_model import STATS_STRIPES
+
+
+class LocalStatsBackend:
+    """
+    Backend de contadores en memoria local del proceso.
+
+    Suficiente cuando el servidor y el lector de métricas comparten proceso.
+    Cada hilo escribe en sus propias celdas sin tomar ningún lock; la
+    lectura las agrega. Las celdas de hilos terminados se acumulan en un
+    total retirado para que no crezcan con la rotación de hilos.
+    """
+
+    def __init__(self, fields: Sequence[str], max_fields: Iterable[str] = ()):
+        """
+        Inicializa los contadores a cero.
+
+        Args:
+            fields: Nombres de los contadores
+            max_fields: Contadores agregados por máximo
+        """
+        self._fields = tuple(fields)
+        self._index = {name: i for i, name in enumerate(self._fields)}
+        self._max_fields = frozenset(max_fields)
+        self._max_indexes = frozenset(self._index[name] for name in self._max_fields)
+        self._retired = [0] * len(self._fields)
+        self._cells: List[Tuple[threading.Thread, List[int]]] = []
+        self._local = threading.local()
+        # Solo protege el registro de hilos y la agregación
+        self._lock = threading.Lock()
+
+    def _thread_cells(self) -> List[int]:
+        """Retorna las celdas del hilo actual, registrándolas la primera vez"""
+        try:
+            return self._local.cells
+        except AttributeError:
+            cells = [0] * len(self._fields)
+            with self._lock:
+                self._cells.append((threading.current_thread(), cells))
+            self._local.cells = cells
+            return cells
+
+    def add(self, field: str, amount: int = 1) -> None:
+        """Suma una cantidad a un contador"""
+        self._thread_cells()[self._index[field]] += amount
+
+    def set_max(self, field: str, value: int) -> None:
+        """Actualiza un contador si el nuevo valor es mayor"""
+        cells = self._thread_cells()
+        i = self._index[field]
+        if value > cells[i]:
+            cells[i] = value
+
+    def snapshot(self) -> Dict[str, int]:
+        """Retorna una copia de todos los contadores"""
+        with self._lock:
+            self._retire_finished_threads()
+            rows = [self._retired] + [cells for _, cells in self._cells]
+            return {
+                name: (max if i in self._max_indexes else sum)(row[i] for row in rows)
+                for i, name in enumerate(self._fields)
+            }
+
+    def _retire_finished_threads(self) -> None:
+        """Acumula las celdas de hilos terminados (llamar con el lock tomado)"""
+        alive = []
+        for thread, cells in self._cells:
+            if thread.is_alive():
+                alive.append((thread, cells))
+                continue
+            for i, value in enumerate(cells):
+                if i in self._max_indexes:
+                    self._retired[i] = max(self._retired[i], value)
+                else:
+                    self._retired[i] += value
+        self._cells = alive
+
+    def reset(self) -> None:
+        """
+        Pone todos los contadores a cero.
+
+        Un incremento concurrente con el reset puede conservarse.
+        """
+        with self._lock:
+            self._retired = [0] * len(self._fields)
+            for _, cells in self._cells:
+                for i in range(len(cells)):
+                    cells[i] = 0
+
+    def close(self) -> None:
+        """Sin recursos que liberar"""
+
+
+class SharedMemoryStatsBackend:
+    """
+    Backend de contadores en un bloque de memoria compartida entre procesos.
+
+    El bloque se divide en slots y cada slot en franjas de len(fields)
+    enteros de 64 bits. Cada proceso escribe únicamente en el slot que
+    tiene asignado, por lo que no hace falta ningún lock entre procesos.
+    Dentro del proceso, cada hilo usa una franja con su propio lock, así
+    que solo compiten los hilos que comparten franja. Las lecturas no
+    toman ningún lock.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        slots: int,
+        max_fields: Iterable[str] = (),
+        stripes: int = STATS_STRIPES
+    ):
+        """
+        Crea el bloque compartido con todos los contadores a cero.
+
+        Args:
+            fields: Nombres de los contadores
+            slots: Número de procesos escritores
+            max_fields: Contadores agregados por máximo
+            stripes: Franjas por slot para repartir los hilos
+
+        Raises:
+            ValueError: Si slots < 1 o stripes < 1
+        """
+        if slots < 1:
+            raise ValueError("slots debe ser un entero positivo")
+        if stripes < 1:
+            raise ValueError("stripes debe ser un entero positivo")
+
+        self._fields = tuple(fields)
+        self._index = {name: i for i, name in enumerate(self._fields)}
+        self._max_fields = frozenset(max_fields)
+        self._width = len(self._fields)
+        self._slots = slots
+        self._stripes = stripes
+        self._slot = 0
+        self._reset_thread_state()
+
+        self._owner_pid = os.getpid()
+        self._rows = slots * stripes
+        self._shm = shared_memory.SharedMemory(create=True, size=self._rows * self._width * 8)
+        self._values = self._shm.buf.cast('q')
+        self._closed = False
+        for i in range(self._rows * self._width):
+            self._values[i] = 0
+
+    def _reset_thread_state(self) -> None:
+        """Crea los locks de franja y la asignación de hilos a franjas"""
+        self._locks = [threading.Lock() for _ in range(self._stripes)]
+        self._local = threading.local()
+        self._next_stripe = itertools.count()
+
+    def _thread_stripe(self) -> int:
+        """Retorna la franja del hilo actual, asignándola por turnos la primera vez"""
+        try:
+            return self._local.stripe
+        except AttributeError:
+            stripe = self._local.stripe = next(self._next_stripe) % self._stripes
+            return stripe
+
+    @property
+    def slots(self) -> int:
+        """Número de slots del bloque"""
+        return self._slots
+
+    def bind_slot(self, slot: int) -> None:
+        """
+        Asigna el slot en el que escribe el proceso actual.
+
+        Debe llamarse en cada proceso worker justo después del fork.
+
+        Args:
+            slot: Índice del slot (0 queda reservado al controlador)
+
+        Raises:
+            ValueError: Si el slot está fuera de rango
+        """
+        if not 0 <= slot < self._slots:
+            raise ValueError(f"Slot fuera de rango: {slot}")
+        self._slot = slot
+        # Los locks heredados del padre podrían haberse copiado tomados
+        self._reset_thread_state()
+
+    def add(self, field: str, amount: int = 1) -> None:
+        """Suma una cantidad a un contador del slot propio"""
+        stripe = self._thread_stripe()
+        i = (self._slot * self._stripes + stripe) * self._width + self._index[field]
+        with self._locks[stripe]:
+            self._values[i] += amount
+
+    def set_max(self, field: str, value: int) -> None:
+        """Actualiza un contador del slot propio si el nuevo valor es mayor"""
+        stripe = self._thread_stripe()
+        i = (self._slot * self._stripes + stripe) * self._width + self._index[field]
+        with self._locks[stripe]:
+            if value > self._values[i]:
+                self._values[i] = value
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Agrega los contadores de todas las franjas de todos los slots.
+
+        Returns:
+            Diccionario {campo: suma (o máximo) sobre todos los procesos}
+        """
+        values = self._values
+        width = self._width
+        result = {}
+        for i, name in enumerate(self._fields):
+            column = [values[row * width + i] for row in range(self._rows)]
+            result[name] = max(column) if name in self._max_fields else sum(column)
+        return result
+
+    def reset(self) -> None:
+        """Pone a cero los contadores de todos los slots"""
+        for i in range(self._rows * self._width):
+            self._values[i] = 0
+
+    def close(self) -> None:
+        """Libera el bloque compartido; solo el proceso creador lo elimina"""
+        if self._closed:
+            return
+        self._closed = True
+        self._values.release()
+        self._shm.close()
+        if os.getpid() == self._owner_pid:
+            self._shm.unlink()
+
+    def __del__(self):
+        # La vista exportada impide cerrar el mmap: liberarla antes que SharedMemory
+        if getattr(self, "_closed", True) is False:
+            self.close()
@@ -0,0 +1,179 @@
+"""
+Modelo de Rueda de Temporización - CoProx
+
+PROPÓSITO:
+Este módulo programa vencimientos (p. ej. el fin del enfriamiento de una cuenta
+limitada con 429) con coste O(1) al programar, cancelar y vencer, sin importar
+cuántas claves haya programadas.
+
+FUNCIONAMIENTO:
+- Rueda jerárquica: varios niveles de COOLDOWN_WHEEL_SLOTS ranuras; cada
+  ranura del nivel 0 dura un tick, cada una del nivel N dura slots^N ticks
+- Una clave se coloca en el nivel más bajo cuyo alcance cubre su vencimiento
+- Al avanzar, cada tick vacía una ranura del nivel 0 (claves vencidas) y, al
+  cruzar el inicio de una ranura de un nivel superior, redistribuye sus claves
+  en los niveles inferiores
+- Los vencimientos más allá del alcance total esperan en la última ranura del
+  nivel superior y se recolocan al llegar a ella
+
+PARÁMETROS DE ENTRADA:
+- tick: Segundos por tick (resolución de los vencimientos)
+- slots: Ranuras por nivel
+- levels: Número de niveles
+- start: Momento inicial (epoch, por defecto ahora)
+
+SALIDA ESPERADA:
+- advance: Lista de claves vencidas hasta el momento indicado
+- deadline: Vencimiento programado de una clave
+
+PROCESAMIENTO DE DATOS:
+- Los vencimientos se redondean hacia arriba al tick siguiente
+- Cada clave se mueve como mucho una vez por nivel
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: auth_model.py (enfriamiento de cuentas)
+- Utiliza: config_model.py (tick, ranuras y niveles)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+"""
+
+import math
+import time
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from src.models.config_model import COOLDOWN_TICK, COOLDOWN_WHEEL_LEVELS, COOLDOWN_WHEEL_SLOTS
+
+
+class TimingWheel:
+    """
+    Rueda de temporización jerárquica (no thread-safe: el llamador sincroniza).
+    """
+
+    def __init__(
+        self,
+        tick: float = COOLDOWN_TICK,
+        slots: int = COOLDOWN_WHEEL_SLOTS,
+        levels: int = COOLDOWN_WHEEL_LEVELS,
+        start: Optional[float] = None
+    ):
+        """
+        Crea la rueda vacía.
+
+        Args:
+            tick: Segundos por tick
+            slots: Ranuras por nivel
+            levels: Número de niveles
+            start: Momento inicial (epoch, por defecto ahora)
+
+        Raises:
+            ValueError: Si tick no es positivo, slots < 2 o levels < 1
+        """
+        if tick <= 0 or slots < 2 or levels < 1:
+            raise ValueError("tick debe ser positivo, slots >= 2 y levels >= 1")
+
+        self._tick = tick
+        self._slots = slots
+        self._levels = levels
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: List[List[Set[Hashable]]] = [
+            [set() for _ in range(slots)] for _ in range(levels)
+        ]
+        self._current = int((time.time() if start is None else start) // tick)
+        # clave -> (tick de vencimiento, nivel, ranura)
+        self._entries: Dict[Hashable, Tuple[int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """
+        Programa (o reprograma) el vencimiento de una clave.
+
+        Args:
+            key: Clave a programar
+            deadline: Momento de vencimiento (epoch); si ya pasó, vence en el
+                      siguiente tick
+        """
+        self.cancel(key)
+        self._place(key, max(math.ceil(deadline / self._tick), self._current + 1))
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancela el vencimiento de una clave.
+
+        Args:
+            key: Clave programada
+
+        Returns:
+            True si estaba programada
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, level, slot = entry
+        self._wheels[level][slot].discard(key)
+        return True
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """Vencimiento programado de una clave (None si no está programada)"""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0] * self._tick
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Avanza la rueda hasta now y retorna las claves vencidas.
+
+        Args:
+            now: Momento actual (epoch, por defecto ahora)
+
+        Returns:
+            Claves cuyo vencimiento es anterior o igual a now
+        """
+        target = int((time.time() if now is None else now) // self._tick)
+        expired: List[Hashable] = []
+        while self._current < target:
+            if not self._entries:
+                # Sin claves no hay nada que redistribuir: saltar al final
+                self._current = target
+                break
+
+            self._current += 1
+            tick = self._current
+            for level in range(self._levels - 1, 0, -1):
+                span = self._spans[level]
+                if tick % span == 0:
+                    self._cascade(level, (tick // span) % self._slots)
+
+            slot = tick % self._slots
+            bucket = self._wheels[0][slot]
+            if bucket:
+                self._wheels[0][slot] = set()
+                for key in bucket:
+                    del self._entries[key]
+                expired.extend(bucket)
+        return expired
+
+    def _place(self, key: Hashable, deadline_tick: int) -> None:
+        """Coloca una clave en el nivel y ranura de su vencimiento"""
+        delta = deadline_tick - self._current
+        level = 0
+        while level < self._levels - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        # Más allá del alcance total: esperar en la última ranura alcanzable
+        target = min(deadline_tick, self._current + self._spans[level + 1] - 1)
+        slot = (target // self._spans[level]) % self._slots
+        self._wheels[level][slot].add(key)
+        self._entries[key] = (deadline_tick, level, slot)
+
+    def _cascade(self, level: int, slot: int) -> None:
+        """Recoloca en niveles inferiores las claves de una ranura"""
+        bucket = self._wheels[level][slot]
+        if not bucket:
+            return
+        self._wheels[level][slot] = set()
+        for key in bucket:
+            self._place(key, self._entries[key][0])
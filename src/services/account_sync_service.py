@@ -0,0 +1,137 @@
+"""
+Servicio de Sincronización de Cuentas - CoProx
+
+PROPÓSITO:
+Este servicio mantiene el AuthModel de cada proceso al día con los cambios de
+cuentas que publican los demás procesos en la tabla compartida.
+
+FUNCIONAMIENTO:
+- Un hilo por proceso llama a AuthModel.apply_shared_changes; sin cambios solo
+  se lee la versión global
+- Tras un cambio comprueba cada ACCOUNT_SYNC_INTERVAL segundos; mientras no
+  hay cambios el intervalo se duplica hasta ACCOUNT_SYNC_MAX_INTERVAL
+- Los hilos no sobreviven al fork: cada proceso servidor llama a start tras
+  crearse y el servicio detecta que el hilo heredado no es suyo
+
+PARÁMETROS DE ENTRADA:
+- auth_model: Modelo de cuentas del proceso (con use_shared_table activo)
+- interval: Segundos entre comprobaciones tras un cambio
+- max_interval: Segundos máximos entre comprobaciones sin cambios
+
+SALIDA ESPERADA:
+- Cuentas agregadas, actualizadas o eliminadas en otros procesos visibles en
+  este en como mucho max_interval segundos
+- get_statistics: Número de cambios aplicados en este proceso
+
+PROCESAMIENTO DE DATOS:
+- Solo se aplican las filas de la tabla con versión posterior a la última vista
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py (al iniciar el servidor y en cada proceso)
+- Actualiza: auth_model.py (apply_shared_changes)
+- Utiliza: config_model.py (ACCOUNT_SYNC_INTERVAL, ACCOUNT_SYNC_MAX_INTERVAL)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from src.models.auth_model import AuthModel
+from src.models.config_model import ACCOUNT_SYNC_INTERVAL, ACCOUNT_SYNC_MAX_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class AccountSyncService:
+    """
+    Hilo que aplica al AuthModel local los cambios de la tabla compartida.
+    """
+
+    def __init__(
+        self,
+        auth_model: AuthModel,
+        interval: float = ACCOUNT_SYNC_INTERVAL,
+        max_interval: float = ACCOUNT_SYNC_MAX_INTERVAL
+    ):
+        """
+        Inicializa el servicio sin hilo.
+
+        Args:
+            auth_model: Modelo de cuentas del proceso
+            interval: Segundos entre comprobaciones tras un cambio
+            max_interval: Segundos máximos entre comprobaciones sin cambios
+        """
+        self._auth_model = auth_model
+        self._interval = interval
+        self._max_interval = max(max_interval, interval)
+        self._applied = 0
+        self._reset_process_state()
+
+    def _reset_process_state(self) -> None:
+        """Crea lock, evento y estado del hilo para el proceso actual"""
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Arranca el hilo de sincronización del proceso actual"""
+        if self._pid != os.getpid():
+            # Proceso hijo tras un fork: el hilo era del padre
+            self._reset_process_state()
+
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="account-sync",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo de sincronización"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def is_running(self) -> bool:
+        """Indica si el hilo de sincronización está activo en este proceso"""
+        return self._pid == os.getpid() and self._thread is not None
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores de la sincronización en este proceso.
+
+        Returns:
+            Diccionario con applied (cambios aplicados)
+        """
+        with self._lock:
+            return {'applied': self._applied}
+
+    def _run(self) -> None:
+        """Bucle del hilo de sincronización"""
+        interval = self._interval
+        while not self._stop.wait(interval):
+            try:
+                applied = self._auth_model.apply_shared_changes()
+            except Exception as e:  # pylint: disable=broad-except
+                # Un error al aplicar no debe detener la sincronización
+                logger.error("Error aplicando cambios de cuentas compartidos: %s", e)
+                interval = self._max_interval
+                continue
+            if not applied:
+                # Sin cambios: espaciar las comprobaciones
+                interval = min(interval * 2, self._max_interval)
+                continue
+            interval = self._interval
+            with self._lock:
+                self._applied += applied
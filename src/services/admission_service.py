@@ -0,0 +1,248 @@
+"""
+Servicio de Admisión de Solicitudes - CoProx
+
+PROPÓSITO:
+Este servicio asigna a cada solicitud un hueco en una cuenta antes de llamar a
+la API, de forma que ninguna cuenta supere ACCOUNT_MAX_IN_FLIGHT solicitudes en
+curso y la carga se reparta entre todo el pool en lugar de concentrarse en la
+cuenta que devuelve get_current_token.
+
+FUNCIONAMIENTO:
+- acquire() para hilos (Waitress) y acquire_async() para el event loop (motor
+  asyncio) reservan la cuenta menos cargada con AuthModel.acquire_account
+- Si todas las cuentas están al límite, la solicitud espera en la cola de una
+  cuenta hasta que se le entregue un hueco o venza ACCOUNT_QUEUE_TIMEOUT
+  (ACCOUNT_SYNC_QUEUE_TIMEOUT en acquire(), que ocupa un hilo del servidor)
+- Si la cuenta en cuya cola espera deja de estar disponible, la espera vuelve
+  a elegir cuenta dentro del mismo plazo
+- Cada reserva se representa con un AccountLease que se libera una sola vez y
+  que sigue a la solicitud si esta cambia de cuenta por failover, sin superar
+  el límite de la cuenta nueva
+
+PARÁMETROS DE ENTRADA:
+- auth_model: Modelo de cuentas del proceso
+- queue_timeout: Segundos máximos de espera de una solicitud en el event loop
+- sync_queue_timeout: Segundos máximos de espera de una solicitud en un hilo
+
+SALIDA ESPERADA:
+- AccountLease con el token reservado, o None si no hay hueco (colas llenas o
+  tiempo de espera agotado)
+- get_statistics: Contadores de solicitudes admitidas, encoladas, rechazadas y
+  con la espera agotada
+
+PROCESAMIENTO DE DATOS:
+- Los avisos de hueco concedido llegan con el lock de AuthModel tomado: la
+  espera síncrona solo marca un Event y la asíncrona programa el aviso en su
+  event loop con call_soon_threadsafe
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py y async_proxy_controller.py (chat completions)
+- Utiliza: auth_model.py (reserva, liberación y esperas por cuenta)
+- Utiliza: admission_model.py (AccountWaiter)
+- Utiliza: config_model.py (ACCOUNT_QUEUE_TIMEOUT, ACCOUNT_SYNC_QUEUE_TIMEOUT)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Cada proceso servidor limita sus propias solicitudes
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from src.models.admission_model import AccountWaiter
+from src.models.auth_model import AuthModel
+from src.models.config_model import ACCOUNT_QUEUE_TIMEOUT, ACCOUNT_SYNC_QUEUE_TIMEOUT
+
+
+class AccountLease:
+    """
+    Hueco reservado en una cuenta para una solicitud en curso.
+    """
+
+    __slots__ = ("token", "_auth_model", "_released")
+
+    def __init__(self, auth_model: Optional[AuthModel], token: str):
+        """
+        Args:
+            auth_model: Modelo donde se reservó el hueco; None si la
+                        admisión está desactivada y no hay nada que liberar
+            token: Token de la cuenta reservada
+        """
+        self.token = token
+        self._auth_model = auth_model
+        self._released = False
+
+    def move_to(self, token: str) -> Optional[str]:
+        """
+        Pasa la reserva a otra cuenta (reintento tras un rechazo de la API).
+
+        La nueva cuenta respeta su límite: si la propuesta está llena se
+        reserva la menos cargada con hueco libre, y si no queda ninguna la
+        reserva sigue en la cuenta actual.
+
+        Args:
+            token: Token de la cuenta propuesta
+
+        Returns:
+            Token de la cuenta reservada, o None si no había hueco
+        """
+        if self._released or token == self.token:
+            return token
+        if self._auth_model is not None:
+            if not self._auth_model.try_claim_account(token):
+                token = self._auth_model.acquire_account()
+                if token is None:
+                    return None
+                if token == self.token:
+                    # Solo queda hueco en la cuenta que acaba de fallar
+                    self._auth_model.release_account(token)
+                    return None
+            self._auth_model.release_account(self.token)
+        self.token = token
+        return token
+
+    def release(self) -> None:
+        """Libera el hueco; las llamadas posteriores no hacen nada"""
+        if self._released:
+            return
+        self._released = True
+        if self._auth_model is not None:
+            self._auth_model.release_account(self.token)
+
+
+class AdmissionService:
+    """
+    Reserva de huecos por cuenta con espera limitada en cola.
+    """
+
+    def __init__(
+        self,
+        auth_model: AuthModel,
+        queue_timeout: float = ACCOUNT_QUEUE_TIMEOUT,
+        sync_queue_timeout: float = ACCOUNT_SYNC_QUEUE_TIMEOUT
+    ):
+        """
+        Inicializa el servicio sin contadores.
+
+        Args:
+            auth_model: Modelo de cuentas del proceso
+            queue_timeout: Segundos máximos de espera por defecto en el
+                           event loop
+            sync_queue_timeout: Segundos máximos de espera por defecto de
+                                acquire(), que bloquea un hilo del servidor
+        """
+        self._auth_model = auth_model
+        self._queue_timeout = queue_timeout
+        self._sync_queue_timeout = sync_queue_timeout
+        self._counters = {'admitted': 0, 'queued': 0, 'rejected': 0, 'timeouts': 0}
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[AccountLease]:
+        """
+        Reserva un hueco esperando en cola si hace falta (bloquea el hilo).
+
+        Args:
+            timeout: Segundos máximos de espera (por defecto sync_queue_timeout)
+
+        Returns:
+            Reserva de la cuenta, o None si no se obtuvo hueco
+        """
+        deadline = time.monotonic() + (self._sync_queue_timeout if timeout is None else timeout)
+        ready = threading.Event()
+        waiter = AccountWaiter(ready.set)
+        queued = False
+        while True:
+            ready.clear()
+            token = self._auth_model.acquire_account(waiter)
+            if token is not None:
+                return self._admit(token)
+            if waiter.queued_on is None:
+                return self._reject('rejected')
+
+            if not queued:
+                queued = True
+                self._count('queued')
+            remaining = deadline - time.monotonic()
+            if remaining > 0 and ready.wait(remaining):
+                if waiter.granted is not None:
+                    return self._admit(waiter.granted)
+                # La cuenta dejó de estar disponible: elegir otra
+                continue
+            return self._give_up(waiter)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> Optional[AccountLease]:
+        """
+        Reserva un hueco esperando en cola sin bloquear el event loop.
+
+        Args:
+            timeout: Segundos máximos de espera (por defecto queue_timeout)
+
+        Returns:
+            Reserva de la cuenta, o None si no se obtuvo hueco
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self._queue_timeout if timeout is None else timeout)
+        ready = asyncio.Event()
+        # El hueco puede liberarse desde otro hilo (sincronización, executor)
+        waiter = AccountWaiter(lambda: loop.call_soon_threadsafe(ready.set))
+        queued = False
+        while True:
+            ready.clear()
+            token = self._auth_model.acquire_account(waiter)
+            if token is not None:
+                return self._admit(token)
+            if waiter.queued_on is None:
+                return self._reject('rejected')
+
+            if not queued:
+                queued = True
+                self._count('queued')
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                return self._give_up(waiter)
+            except asyncio.CancelledError:
+                # Cliente desconectado: no quedarse con un hueco ya concedido
+                token = self._auth_model.cancel_wait(waiter)
+                if token is not None:
+                    self._auth_model.release_account(token)
+                raise
+            if waiter.granted is not None:
+                return self._admit(waiter.granted)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores del servicio.
+
+        Returns:
+            Diccionario con admitted (con hueco), queued (tuvieron que
+            esperar), rejected (colas llenas) y timeouts (espera agotada)
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def _give_up(self, waiter: AccountWaiter) -> Optional[AccountLease]:
+        """Abandona una espera; el hueco concedido en el último momento se usa"""
+        token = self._auth_model.cancel_wait(waiter)
+        if token is not None:
+            return self._admit(token)
+        return self._reject('timeouts')
+
+    def _admit(self, token: str) -> AccountLease:
+        """Cuenta una solicitud admitida y crea su reserva"""
+        self._count('admitted')
+        return AccountLease(self._auth_model, token)
+
+    def _reject(self, counter: str) -> None:
+        """Cuenta una solicitud sin hueco"""
+        self._count(counter)
+
+    def _count(self, counter: str) -> None:
+        """Incrementa un contador del servicio"""
+        with self._lock:
+            self._counters[counter] += 1
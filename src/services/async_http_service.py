@@ -0,0 +1,132 @@
+"""
+Servicio HTTP Asíncrono - CoProx
+
+PROPÓSITO:
+Este servicio es la contraparte asyncio de http_service.py. Permite mantener cientos
+de completions en curso dentro de un único proceso sin dedicar un hilo a cada una.
+
+FUNCIONAMIENTO:
+- Envuelve un httpx.AsyncClient compartido con límites de conexiones
+- Reutiliza conexiones keep-alive hacia la API de GitHub Copilot
+- Expone solicitudes completas (post/get) y en streaming (stream)
+
+PARÁMETROS DE ENTRADA:
+- url: String con el endpoint a llamar
+- headers: Diccionario con headers de autenticación y metadata
+- content: Bytes con el cuerpo JSON ya serializado
+- max_connections: Entero con el máximo de conexiones simultáneas
+
+SALIDA ESPERADA:
+- response: httpx.Response con status_code, headers y cuerpo
+- stream: Context manager asíncrono que entrega la respuesta sin leer el cuerpo
+
+PROCESAMIENTO DE DATOS:
+- No transforma datos; la validación y el formateo los hace proxy_controller.py
+- Aplica REQUEST_TIMEOUT a conexión y lectura
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: async_proxy_controller.py (motor asyncio del proxy)
+- Utiliza: config_model.py (timeouts y límites)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Solo se instancia cuando el servidor arranca con el motor "asyncio"
+"""
+
+from typing import Any, AsyncContextManager, Dict, Optional
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - dependencia opcional
+    httpx = None
+
+from src.models.config_model import (
+    ASYNC_MAX_CONNECTIONS,
+    REQUEST_TIMEOUT,
+    UPSTREAM_POOL_MAXSIZE
+)
+
+
+class AsyncHttpService:
+    """
+    Cliente HTTP asíncrono compartido hacia la API de GitHub Copilot.
+
+    Todas las corrutinas deben ejecutarse en el mismo event loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = ASYNC_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = None
+    ):
+        """
+        Inicializa el cliente asíncrono.
+
+        Args:
+            max_connections: Conexiones simultáneas máximas hacia la API
+            max_keepalive_connections: Conexiones inactivas retenidas
+                                       (por defecto UPSTREAM_POOL_MAXSIZE)
+
+        Raises:
+            RuntimeError: Si httpx no está instalado
+        """
+        if httpx is None:
+            raise RuntimeError(
+                "El motor asyncio requiere httpx: pip install 'coprox[async]'"
+            )
+
+        if max_keepalive_connections is None:
+            max_keepalive_connections = max(UPSTREAM_POOL_MAXSIZE, max_connections // 4)
+
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT)
+        )
+
+    async def post(self, url: str, headers: Dict[str, str], content: bytes) -> Any:
+        """
+        Envía una solicitud POST y lee la respuesta completa.
+
+        Args:
+            url: URL de destino
+            headers: Headers de la solicitud
+            content: Cuerpo ya serializado
+
+        Returns:
+            httpx.Response con el cuerpo leído
+        """
+        return await self._client.post(url, headers=headers, content=content)
+
+    async def get(self, url: str, headers: Dict[str, str]) -> Any:
+        """
+        Envía una solicitud GET y lee la respuesta completa.
+
+        Args:
+            url: URL de destino
+            headers: Headers de la solicitud
+
+        Returns:
+            httpx.Response con el cuerpo leído
+        """
+        return await self._client.get(url, headers=headers)
+
+    def stream(self, url: str, headers: Dict[str, str], content: bytes) -> AsyncContextManager[Any]:
+        """
+        Abre una solicitud POST sin leer el cuerpo de la respuesta.
+
+        Args:
+            url: URL de destino
+            headers: Headers de la solicitud
+            content: Cuerpo ya serializado
+
+        Returns:
+            Context manager asíncrono que entrega un httpx.Response
+        """
+        return self._client.stream("POST", url, headers=headers, content=content)
+
+    async def aclose(self) -> None:
+        """Cierra todas las conexiones del cliente"""
+        await self._client.aclose()
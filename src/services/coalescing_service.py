@@ -0,0 +1,255 @@
+"""
+Servicio de Coalescencia de Solicitudes - CoProx
+
+PROPÓSITO:
+Este servicio evita reenviar a la API varias copias de la misma solicitud cuando llegan
+a la vez (reintentos de un cliente o varios agentes con el mismo prompt). Solo la
+primera copia llama a la API; las demás esperan y reciben su resultado.
+
+FUNCIONAMIENTO:
+- Agrupa las solicitudes en curso por clave (hash canónico de la solicitud)
+- La primera solicitud de cada clave ejecuta la llamada (líder)
+- Las solicitudes idénticas que llegan mientras tanto esperan al líder
+- Si el líder falla con una excepción, cada espera recibe su propia copia
+- Una espera que supera COALESCING_WAIT_TIMEOUT deja de esperar y hace su
+  propia llamada
+- En el event loop la llamada del líder corre en una tarea compartida: si el
+  cliente del líder se desconecta, la tarea sigue mientras haya esperas y solo
+  se cancela si nadie la espera
+- La clave se libera al terminar: las solicitudes posteriores vuelven a llamar
+- run() para hilos (Waitress) y run_async() para el event loop (motor asyncio)
+
+PARÁMETROS DE ENTRADA:
+- key: String con la clave de la solicitud
+- func: Función (o corrutina) que realiza la llamada a la API
+- on_wait: Callback opcional con +1/-1 al empezar/terminar cada espera
+- wait_timeout: Segundos máximos de espera al líder
+
+SALIDA ESPERADA:
+- Tupla (resultado, coalesced) donde coalesced indica si el resultado se
+  obtuvo esperando a otra solicitud
+
+PROCESAMIENTO DE DATOS:
+- El resultado se comparte tal cual entre todas las esperas, por lo que debe
+  ser inmutable (bytes, tuplas)
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py y async_proxy_controller.py (chat completions)
+- Utiliza: response_cache_model.py (canonical_request_key)
+- Utiliza: config_model.py (COALESCING_WAIT_TIMEOUT)
+- Notifica a: proxy_model.py (esperas y solicitudes coalescidas, vía controlador)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Cada proceso servidor coalesce sus propias solicitudes
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.models.config_model import COALESCING_WAIT_TIMEOUT
+from src.models.response_cache_model import canonical_request_key
+
+T = TypeVar("T")
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    Copia la excepción del líder para una espera: lanzar el mismo objeto desde
+    varios hilos o tareas mezclaría sus trazas.
+
+    Args:
+        error: Excepción compartida
+
+    Returns:
+        Copia del mismo tipo con la original como causa, o RuntimeError si
+        la excepción no admite copia
+    """
+    try:
+        copied = copy.copy(error)
+    except Exception:  # pylint: disable=broad-except
+        copied = RuntimeError(f"Solicitud agrupada fallida: {error!r}")
+    copied.__cause__ = error
+    return copied
+
+
+class _Flight:
+    """Llamada en curso compartida por las solicitudes de una clave"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncFlight:
+    """Tarea en curso compartida por las corrutinas de una clave"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class CoalescingService:
+    """
+    Coalescencia single-flight de solicitudes idénticas en curso.
+    """
+
+    def __init__(
+        self,
+        on_wait: Optional[Callable[[int], None]] = None,
+        wait_timeout: float = COALESCING_WAIT_TIMEOUT
+    ):
+        """
+        Inicializa el servicio sin llamadas en curso.
+
+        Args:
+            on_wait: Callback invocado con +1 al empezar a esperar a otra
+                     solicitud y con -1 al terminar la espera
+            wait_timeout: Segundos máximos de espera al líder; al vencer la
+                          espera hace su propia llamada
+        """
+        self._on_wait = on_wait
+        self._wait_timeout = wait_timeout
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, _AsyncFlight] = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, request_data: Dict[str, Any]) -> str:
+        """
+        Calcula la clave de coalescencia de una solicitud.
+
+        Args:
+            request_data: Solicitud validada del cliente
+
+        Returns:
+            Hash canónico de la solicitud
+        """
+        return canonical_request_key(request_data)
+
+    def run(self, key: str, func: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Ejecuta func una sola vez por clave entre hilos concurrentes.
+
+        Args:
+            key: Clave de la solicitud
+            func: Llamada a realizar por el líder
+
+        Returns:
+            Tupla (resultado, True si se esperó a otra solicitud)
+
+        Raises:
+            Exception: La excepción lanzada por func en el líder (una copia
+                       en las esperas)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            self._notify_wait(1)
+            try:
+                finished = flight.done.wait(self._wait_timeout)
+            finally:
+                self._notify_wait(-1)
+            if not finished:
+                # El líder tarda demasiado: llamar por cuenta propia
+                return func(), False
+            if flight.error is not None:
+                raise _copy_error(flight.error)
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    async def run_async(self, key: str, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Ejecuta la corrutina una sola vez por clave dentro del event loop.
+
+        Args:
+            key: Clave de la solicitud
+            func: Función que crea la corrutina del líder
+
+        Returns:
+            Tupla (resultado, True si se esperó a otra solicitud)
+
+        Raises:
+            Exception: La excepción lanzada por la corrutina del líder (una
+                       copia en las esperas)
+        """
+        flight = self._async_flights.get(key)
+        if flight is not None:
+            return await self._follow_async(flight, func)
+
+        flight = _AsyncFlight(asyncio.ensure_future(func()))
+        self._async_flights[key] = flight
+        flight.task.add_done_callback(lambda task: self._finish_async(key, flight))
+        try:
+            # shield: la desconexión del líder no cancela a sus esperas
+            return await asyncio.shield(flight.task), False
+        except asyncio.CancelledError:
+            if not flight.waiters and not flight.task.done():
+                self._finish_async(key, flight)
+                flight.task.cancel()
+            raise
+
+    async def _follow_async(self, flight: _AsyncFlight, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Espera la tarea de otra corrutina con la misma clave.
+
+        Args:
+            flight: Tarea compartida del líder
+            func: Función que crea la corrutina, por si hay que llamar aparte
+
+        Returns:
+            Tupla (resultado, True si se obtuvo de la tarea compartida)
+        """
+        flight.waiters += 1
+        self._notify_wait(1)
+        try:
+            # shield: cancelar o vencer una espera no cancela la tarea
+            result = await asyncio.wait_for(asyncio.shield(flight.task), self._wait_timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            if not flight.task.cancelled():
+                raise
+        except Exception as e:  # pylint: disable=broad-except
+            raise _copy_error(e)
+        else:
+            return result, True
+        finally:
+            flight.waiters -= 1
+            self._notify_wait(-1)
+        # El líder tarda demasiado o se canceló sin esperas: llamar aparte
+        return await func(), False
+
+    def _finish_async(self, key: str, flight: _AsyncFlight) -> None:
+        """Libera la clave de una tarea terminada o abandonada"""
+        if self._async_flights.get(key) is flight:
+            del self._async_flights[key]
+        task = flight.task
+        if task.done() and not task.cancelled():
+            # Marca la excepción como recuperada aunque nadie esperase
+            task.exception()
+
+    def _notify_wait(self, delta: int) -> None:
+        """Informa del inicio (+1) o fin (-1) de una espera"""
+        if self._on_wait is not None:
+            self._on_wait(delta)
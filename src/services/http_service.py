@@ -9,7 +9,8 @@ FUNCIONAMIENTO:
 - Envía solicitudes POST a la API de chat completions de GitHub Copilot
 - Maneja autenticación usando tokens Bearer en headers
 - Realiza solicitudes GET para obtener lista de modelos disponibles
-- Implementa reintentos automáticos y manejo de errores de red
+- Reutiliza conexiones keep-alive mediante un pool compartido y thread-safe
+- Contabiliza aciertos (conexión reutilizada) y fallos (nuevo handshake) del pool
 
 PARÁMETROS DE ENTRADA:
 - request_data: Diccionario con payload de la solicitud (messages, model, etc.)
@@ -41,4 +42,161 @@ INTERACCIONES CON MAIN:
 - No interactúa directamente con main.py
 - Se utiliza indirectamente cuando el proxy procesa solicitudes
 - Maneja toda la comunicación externa con APIs de GitHub
-"""
\ No newline at end of file
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from src.models.config_model import (
+    REQUEST_TIMEOUT,
+    UPSTREAM_POOL_HOSTS,
+    UPSTREAM_POOL_MAXSIZE
+)
+
+
+class _CheckoutCountingMixin:
+    """
+    Mixin para pools de urllib3 que notifica cada conexión entregada.
+
+    Una conexión con socket abierto proviene del pool (acierto); una sin
+    socket requiere un nuevo handshake TCP+TLS (fallo).
+    """
+
+    checkout_listener: Optional[Callable[[bool], None]] = None
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)  # type: ignore[misc]
+        listener = self.checkout_listener
+        if listener is not None:
+            listener(getattr(conn, "sock", None) is not None)
+        return conn
+
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    """Adaptador de requests cuyos pools reportan aciertos y fallos"""
+
+    def __init__(self, checkout_listener: Callable[[bool], None], **kwargs: Any):
+        self._checkout_listener = checkout_listener
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        listener = staticmethod(self._checkout_listener)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "CountingHTTPConnectionPool",
+                (_CheckoutCountingMixin, HTTPConnectionPool),
+                {"checkout_listener": listener}
+            ),
+            "https": type(
+                "CountingHTTPSConnectionPool",
+                (_CheckoutCountingMixin, HTTPSConnectionPool),
+                {"checkout_listener": listener}
+            ),
+        }
+
+
+class HttpService:
+    """
+    Cliente HTTP compartido y thread-safe hacia la API de GitHub Copilot.
+
+    Mantiene un pool acotado de conexiones keep-alive por host para evitar
+    un handshake TCP+TLS en cada solicitud reenviada.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = UPSTREAM_POOL_MAXSIZE,
+        pool_connections: int = UPSTREAM_POOL_HOSTS,
+        on_checkout: Optional[Callable[[bool], None]] = None
+    ):
+        """
+        Inicializa la sesión con su pool de conexiones.
+
+        Args:
+            pool_maxsize: Conexiones keep-alive retenidas por host
+            pool_connections: Número de hosts con pool propio
+            on_checkout: Callback opcional invocado con True si la conexión
+                         fue reutilizada y False si se abrió una nueva
+        """
+        self._pool_maxsize = pool_maxsize
+        self._on_checkout = on_checkout
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self._lock = threading.Lock()
+
+        self._session = requests.Session()
+        # Sin estado de cookies compartido entre hilos
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        # pool_block=False: si todos los hilos tienen una conexión ocupada se
+        # abre una extra que se descarta al terminar, sin bloquear al cliente
+        adapter = _PooledHTTPAdapter(
+            checkout_listener=self._record_checkout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _record_checkout(self, reused: bool) -> None:
+        """Registra una conexión entregada por el pool"""
+        with self._lock:
+            if reused:
+                self._pool_hits += 1
+            else:
+                self._pool_misses += 1
+
+        if self._on_checkout is not None:
+            self._on_checkout(reused)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Envía una solicitud POST reutilizando el pool de conexiones.
+
+        Args:
+            url: URL de destino
+            **kwargs: Argumentos aceptados por requests (headers, json, data...)
+
+        Returns:
+            Respuesta HTTP de requests
+        """
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        return self._session.post(url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Envía una solicitud GET reutilizando el pool de conexiones.
+
+        Args:
+            url: URL de destino
+            **kwargs: Argumentos aceptados por requests (headers, params...)
+
+        Returns:
+            Respuesta HTTP de requests
+        """
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        return self._session.get(url, **kwargs)
+
+    def get_pool_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores del pool de conexiones.
+
+        Returns:
+            Diccionario con aciertos, fallos y tamaño máximo por host
+        """
+        with self._lock:
+            return {
+                'pool_hits': self._pool_hits,
+                'pool_misses': self._pool_misses,
+                'pool_maxsize': self._pool_maxsize
+            }
+
+    def close(self) -> None:
+        """Cierra todas las conexiones del pool"""
+        self._session.close()
@@ -0,0 +1,187 @@
+"""
+Servicio JSON - CoProx
+
+PROPÓSITO:
+Este servicio centraliza la codificación y decodificación JSON del proxy. Permite usar
+una librería rápida (orjson) cuando está instalada sin que el resto del código dependa
+de ella.
+
+FUNCIONAMIENTO:
+- JsonCodec: interfaz común con loads (bytes/str -> objeto) y dumps (objeto -> bytes)
+- OrjsonCodec: implementación sobre orjson (dependencia opcional)
+- StdlibCodec: implementación sobre el módulo json estándar
+- get_codec: selecciona el codec según JSON_CODEC ("auto" prefiere orjson)
+- CodecJSONProvider: proveedor JSON de Flask que serializa con el codec elegido
+
+PARÁMETROS DE ENTRADA:
+- data: Bytes o string con el JSON a decodificar
+- obj: Objeto Python a serializar
+- name: Nombre del codec ("auto", "orjson" o "json")
+
+SALIDA ESPERADA:
+- loads: Objeto Python decodificado
+- dumps: Bytes UTF-8 compactos (sin espacios entre separadores)
+
+PROCESAMIENTO DE DATOS:
+- Los errores de decodificación son ValueError y los de codificación TypeError
+  con ambos codecs, por lo que los manejadores existentes no cambian
+- La salida no escapa caracteres no ASCII
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py (cuerpo de solicitudes y respuestas, app Flask)
+- Utiliza: config_model.py (JSON_CODEC)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- El codec se elige al importar el módulo
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+from src.models.config_model import JSON_CODEC, JSON_CODECS
+
+
+class JsonCodec(ABC):
+    """
+    Interfaz común de los codecs JSON (un codec incompleto no se puede instanciar).
+    """
+
+    name = ""
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodifica un documento JSON.
+
+        Args:
+            data: Documento JSON
+
+        Returns:
+            Objeto Python decodificado
+
+        Raises:
+            ValueError: Si el documento no es JSON válido
+        """
+
+    @abstractmethod
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """
+        Serializa un objeto a JSON compacto.
+
+        Args:
+            obj: Objeto a serializar
+            default: Función para tipos no soportados de forma nativa
+
+        Returns:
+            Bytes UTF-8 sin espacios entre separadores
+
+        Raises:
+            TypeError: Si el objeto no es serializable
+        """
+
+
+class StdlibCodec(JsonCodec):
+    """
+    Codec sobre el módulo json estándar.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodifica con json.loads"""
+        return json.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """Serializa con json.dumps en formato compacto"""
+        return json.dumps(
+            obj,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=default
+        ).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec sobre orjson.
+
+    orjson.JSONDecodeError hereda de ValueError y orjson.JSONEncodeError de
+    TypeError, igual que los errores del módulo estándar.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        """
+        Raises:
+            RuntimeError: Si orjson no está instalado
+        """
+        if orjson is None:
+            raise RuntimeError("El codec orjson requiere el paquete orjson: pip install orjson")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodifica con orjson.loads"""
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """Serializa con orjson.dumps (admite claves no string como json)"""
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def get_codec(name: str = JSON_CODEC) -> JsonCodec:
+    """
+    Obtiene el codec JSON solicitado.
+
+    Args:
+        name: "auto" (orjson si está instalado), "orjson" o "json"
+
+    Returns:
+        Instancia del codec
+
+    Raises:
+        ValueError: Si el nombre no es un codec soportado
+        RuntimeError: Si se pide orjson y no está instalado
+    """
+    if name not in JSON_CODECS:
+        raise ValueError(f"Codec JSON no soportado: {name}")
+
+    if name == "orjson" or (name == "auto" and orjson is not None):
+        return OrjsonCodec()
+    return StdlibCodec()
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de Flask que usa un JsonCodec.
+
+    jsonify y request.get_json pasan por el codec; los tipos que Flask
+    serializa de forma especial (fechas, dataclasses, Decimal...) se
+    delegan en DefaultJSONProvider.default.
+    """
+
+    codec: JsonCodec = get_codec()
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serializa a string con el codec"""
+        return self.codec.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Decodifica con el codec"""
+        return self.codec.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        """Crea una respuesta JSON con el cuerpo serializado directamente a bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.codec.dumps(obj, default=self.default),
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,239 @@
+"""
+Servicio de Refresco de Cuotas - CoProx
+
+PROPÓSITO:
+Este servicio vuelve a verificar periódicamente la cuota de todas las cuentas
+contra copilot_internal/v2/token, en paralelo y en segundo plano, para que
+AuthModel no dependa de verificaciones manuales cuenta a cuenta.
+
+FUNCIONAMIENTO:
+- refresh_all: verifica todas las cuentas con un pool de hilos acotado y un
+  límite de verificaciones simultáneas por host, y aplica los resultados a
+  AuthModel en una sola actualización por lotes
+- start/stop: hilo que ejecuta refresh_all cada QUOTA_REFRESH_INTERVAL
+  segundos con una variación aleatoria de ±QUOTA_REFRESH_JITTER; puede
+  verificar primero, al arrancar, las cuentas indicadas
+- Las cuentas cuya verificación falla conservan su cuota actual
+
+PARÁMETROS DE ENTRADA:
+- auth_model: Modelo de cuentas a actualizar
+- verify: Función que recibe un token y devuelve la respuesta JSON de cuota
+  (AuthController.verify_token_quota)
+- interval, jitter, max_workers, per_host_limit: Ver config_model.py
+
+SALIDA ESPERADA:
+- refresh_all: Diccionario con checked, updated, failed y duration
+- get_statistics: Resultado del último refresco y número de refrescos
+
+PROCESAMIENTO DE DATOS:
+- La cuota de cada cuenta es limited_user_quotas.chat de la respuesta
+- Todas las verificaciones van al host de COPILOT_TOKEN_URL, por lo que el
+  límite por host acota la concurrencia real aunque el pool sea mayor
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: auth_controller.py (start_quota_refresh, refresh_all_quotas),
+  arrancado por proxy_controller.py en el proceso servidor
+- Actualiza: auth_model.py (update_account_quotas)
+- Utiliza: config_model.py (intervalo, jitter y límites)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- El hilo de refresco se arranca desde AuthController al iniciar el servidor
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.models.auth_model import AuthModel
+from src.models.config_model import (
+    COPILOT_TOKEN_URL,
+    QUOTA_REFRESH_INTERVAL,
+    QUOTA_REFRESH_JITTER,
+    QUOTA_REFRESH_PER_HOST,
+    QUOTA_REFRESH_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaRefreshService:
+    """
+    Refresco periódico y paralelo de la cuota de todas las cuentas.
+    """
+
+    def __init__(
+        self,
+        auth_model: AuthModel,
+        verify: Callable[[str], Dict[str, Any]],
+        interval: float = QUOTA_REFRESH_INTERVAL,
+        jitter: float = QUOTA_REFRESH_JITTER,
+        max_workers: int = QUOTA_REFRESH_WORKERS,
+        per_host_limit: int = QUOTA_REFRESH_PER_HOST
+    ):
+        """
+        Inicializa el servicio sin hilo de refresco.
+
+        Args:
+            auth_model: Modelo de cuentas a actualizar
+            verify: Verificación de cuota de un token
+            interval: Segundos entre refrescos completos
+            jitter: Variación aleatoria de la espera (fracción de interval)
+            max_workers: Hilos del pool de verificación
+            per_host_limit: Verificaciones simultáneas por host
+
+        Raises:
+            ValueError: Si max_workers o per_host_limit no son positivos
+        """
+        if max_workers < 1 or per_host_limit < 1:
+            raise ValueError("max_workers y per_host_limit deben ser enteros positivos")
+
+        self._auth_model = auth_model
+        self._verify = verify
+        self._interval = interval
+        self._jitter = jitter
+        self._max_workers = max_workers
+        self._host = urlparse(COPILOT_TOKEN_URL).netloc
+        self._host_slots = {self._host: threading.BoundedSemaphore(per_host_limit)}
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._refreshes = 0
+        self._last_result: Optional[Dict[str, Any]] = None
+
+    def refresh_all(self, tokens: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Verifica la cuota de las cuentas en paralelo y la aplica por lotes.
+
+        Args:
+            tokens: Tokens a verificar (por defecto todas las cuentas)
+
+        Returns:
+            Diccionario con checked, updated, failed y duration (segundos)
+        """
+        if tokens is None:
+            tokens = list(self._auth_model.get_all_accounts())
+        else:
+            tokens = list(tokens)
+
+        started = time.monotonic()
+        quotas: Dict[str, Tuple[int, Optional[int]]] = {}
+        failed = 0
+
+        if tokens:
+            workers = min(self._max_workers, len(tokens))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quota-refresh") as pool:
+                for token, quota in zip(tokens, pool.map(self._verify_quota, tokens)):
+                    if quota is None:
+                        failed += 1
+                    else:
+                        quotas[token] = (quota, quota)
+
+        updated = self._auth_model.update_account_quotas(quotas)
+        result = {
+            'checked': len(tokens),
+            'updated': updated,
+            'failed': failed,
+            'duration': time.monotonic() - started
+        }
+
+        with self._lock:
+            self._refreshes += 1
+            self._last_result = result
+        logger.info(
+            "Cuotas refrescadas: %d/%d en %.2fs (%d fallidas)",
+            updated, len(tokens), result['duration'], failed
+        )
+        return result
+
+    def start(self, first: Optional[Iterable[str]] = None) -> None:
+        """
+        Arranca el hilo de refresco periódico.
+
+        Args:
+            first: Tokens que el hilo verifica nada más arrancar (p. ej. los
+                   de verificación caducada); None para esperar al intervalo
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(None if first is None else list(first),),
+                name="quota-refresher",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo de refresco (espera al refresco en curso)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=30)
+
+    def is_running(self) -> bool:
+        """Indica si el hilo de refresco está activo"""
+        return self._thread is not None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene el estado del refresco.
+
+        Returns:
+            Diccionario con refreshes, running y last_result
+        """
+        with self._lock:
+            return {
+                'refreshes': self._refreshes,
+                'running': self._thread is not None,
+                'last_result': self._last_result
+            }
+
+    def _verify_quota(self, token: str) -> Optional[int]:
+        """
+        Verifica la cuota de chat de un token respetando el límite por host.
+
+        Args:
+            token: Token de la cuenta
+
+        Returns:
+            Cuota de chat, o None si la verificación falló
+        """
+        with self._host_slots[self._host]:
+            try:
+                quota_info = self._verify(token)
+            except Exception as e:  # pylint: disable=broad-except
+                # Un fallo de una cuenta no debe abortar el refresco del resto
+                logger.warning("Error verificando cuota: %s", e)
+                return None
+        return quota_info.get("limited_user_quotas", {}).get("chat", 0)
+
+    def _next_delay(self) -> float:
+        """Espera hasta el siguiente refresco, con variación aleatoria"""
+        return self._interval * random.uniform(1.0 - self._jitter, 1.0 + self._jitter)
+
+    def _run(self, first: Optional[List[str]]) -> None:
+        """
+        Bucle del hilo de refresco.
+
+        Args:
+            first: Tokens a verificar antes de la primera espera
+        """
+        if first:
+            try:
+                self.refresh_all(first)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Error en el refresco de cuotas: %s", e)
+        while not self._stop.wait(self._next_delay()):
+            try:
+                self.refresh_all()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Error en el refresco de cuotas: %s", e)
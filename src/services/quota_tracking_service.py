@@ -0,0 +1,275 @@
+"""
+Servicio de Seguimiento de Cuota - CoProx
+
+PROPÓSITO:
+Este servicio mantiene la cuota de cada cuenta al día a partir del tráfico real:
+observa cada respuesta de la API y actualiza AuthModel sin verificaciones extra
+contra copilot_internal/user.
+
+FUNCIONAMIENTO:
+- observe: encola (token, código, headers) sin parsear nada; nunca bloquea la
+  respuesta (si la cola está llena la observación se descarta)
+- Un hilo en segundo plano procesa la cola y actualiza AuthModel
+- El hilo termina tras QUOTA_TRACKING_IDLE_TIMEOUT segundos sin observaciones
+  y se vuelve a crear con la siguiente; tras un fork se recrean cola e hilo
+- Las respuestas de error (>= 400) se ignoran: su tratamiento es el failover
+
+PARÁMETROS DE ENTRADA:
+- auth_model: Modelo de cuentas a actualizar
+- token: Token OAuth de la cuenta que atendió la solicitud
+- status_code: Código HTTP de la respuesta
+- headers: Headers de la respuesta (requests o httpx)
+
+SALIDA ESPERADA:
+- Cuotas de AuthModel actualizadas; las cuentas que llegan a 0 quedan agotadas
+- get_statistics: observaciones procesadas, aplicadas y descartadas
+
+PROCESAMIENTO DE DATOS:
+- QUOTA_SNAPSHOT_HEADER (ent=<total>&rem=<porcentaje>) o, si falta,
+  QUOTA_REMAINING_HEADER/QUOTA_LIMIT_HEADER fijan la cuota absoluta
+- Sin headers de cuota la respuesta no cambia la cuota, salvo con
+  QUOTA_TRACKING_ESTIMATE, que descuenta una unidad estimada
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py y async_proxy_controller.py (cada respuesta)
+- Actualiza: auth_model.py (update_account_quota, consume_account_quota)
+- Utiliza: config_model.py (headers, tamaño de cola, estimación)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Cada proceso servidor tiene su propia cola e hilo
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from src.models.auth_model import AuthModel
+from src.models.config_model import (
+    QUOTA_LIMIT_HEADER,
+    QUOTA_REMAINING_HEADER,
+    QUOTA_SNAPSHOT_HEADER,
+    QUOTA_TRACKING_ESTIMATE,
+    QUOTA_TRACKING_IDLE_TIMEOUT,
+    QUOTA_TRACKING_QUEUE_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    """Convierte un valor de header a entero (None si no es válido)"""
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+def parse_quota_headers(headers: Mapping[str, str]) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Extrae la cuota de una cuenta de los headers de una respuesta.
+
+    Args:
+        headers: Headers de la respuesta (búsqueda sin distinguir mayúsculas)
+
+    Returns:
+        Tupla (quota_remaining, quota_total) con quota_total None si la
+        respuesta no lo indica, o None si no hay headers de cuota válidos
+    """
+    snapshot = headers.get(QUOTA_SNAPSHOT_HEADER)
+    if snapshot:
+        fields = dict(
+            part.split("=", 1) for part in snapshot.split("&") if "=" in part
+        )
+        try:
+            total = int(float(fields["ent"]))
+            percent = float(fields["rem"])
+        except (KeyError, ValueError):
+            total = -1
+            percent = 0.0
+        # ent < 0 indica cuota ilimitada: no hay nada que seguir
+        if total >= 0:
+            remaining = int(total * min(max(percent, 0.0), 100.0) / 100.0)
+            return remaining, total
+
+    remaining = _parse_int(headers.get(QUOTA_REMAINING_HEADER))
+    if remaining is None:
+        return None
+    return max(remaining, 0), _parse_int(headers.get(QUOTA_LIMIT_HEADER))
+
+
+class QuotaTrackingService:
+    """
+    Cola de observaciones de cuota procesada en segundo plano.
+    """
+
+    def __init__(
+        self,
+        auth_model: AuthModel,
+        queue_size: int = QUOTA_TRACKING_QUEUE_SIZE,
+        idle_timeout: float = QUOTA_TRACKING_IDLE_TIMEOUT,
+        estimate: bool = QUOTA_TRACKING_ESTIMATE
+    ):
+        """
+        Inicializa el servicio sin hilo (se crea con la primera observación).
+
+        Args:
+            auth_model: Modelo de cuentas a actualizar
+            queue_size: Observaciones pendientes como máximo
+            idle_timeout: Segundos de inactividad tras los que termina el hilo
+            estimate: Descontar una unidad por respuesta sin headers de cuota
+        """
+        self._auth_model = auth_model
+        self._queue_size = queue_size
+        self._idle_timeout = idle_timeout
+        self._estimate = estimate
+        self._reset_process_state()
+
+        self._observed = 0
+        self._applied = 0
+        self._consumed = 0
+        self._dropped = 0
+
+    def _reset_process_state(self) -> None:
+        """Crea cola, lock y estado del hilo para el proceso actual"""
+        self._pid = os.getpid()
+        self._queue: "queue.Queue[Tuple[str, int, Mapping[str, str]]]" = queue.Queue(self._queue_size)
+        self._lock = threading.Lock()
+        self._running = False
+
+    def observe(self, token: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Encola una respuesta de la API para actualizar la cuota de su cuenta.
+
+        Solo hace un put_nowait: el parseo y la escritura en AuthModel se
+        hacen en el hilo de seguimiento.
+
+        Args:
+            token: Token OAuth de la cuenta que atendió la solicitud
+            status_code: Código HTTP de la respuesta
+            headers: Headers de la respuesta
+        """
+        if status_code >= 400:
+            return
+
+        if self._pid != os.getpid():
+            # Proceso hijo tras un fork: la cola y el hilo eran del padre
+            self._reset_process_state()
+
+        try:
+            self._queue.put_nowait((token, status_code, headers))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return
+
+        # Comprobar tras encolar: si el hilo terminó justo antes, se recrea
+        if not self._running:
+            self._start_worker()
+
+    def apply(self, token: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Actualiza la cuota de una cuenta con una respuesta de la API.
+
+        Args:
+            token: Token OAuth de la cuenta
+            status_code: Código HTTP de la respuesta
+            headers: Headers de la respuesta
+        """
+        if status_code >= 400:
+            return
+
+        quota = parse_quota_headers(headers)
+        if quota is None:
+            # Sin información real de la API solo se descuenta si se pidió
+            # estimar
+            if not self._estimate:
+                return
+            self._auth_model.consume_account_quota(token)
+            with self._lock:
+                self._consumed += 1
+            return
+
+        quota_remaining, quota_total = quota
+        try:
+            self._auth_model.update_account_quota(token, quota_remaining, quota_total)
+        except KeyError:
+            # La cuenta se eliminó mientras tanto
+            return
+        with self._lock:
+            self._applied += 1
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """
+        Espera a que se procesen todas las observaciones encoladas.
+
+        Args:
+            timeout: Segundos máximos de espera
+
+        Returns:
+            True si la cola quedó vacía, False si se agotó el tiempo
+        """
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Obtiene los contadores del seguimiento en este proceso.
+
+        Returns:
+            Diccionario con observed (procesadas), applied (cuota de headers),
+            consumed (descuentos), dropped (cola llena) y pending
+        """
+        with self._lock:
+            return {
+                'observed': self._observed,
+                'applied': self._applied,
+                'consumed': self._consumed,
+                'dropped': self._dropped,
+                'pending': self._queue.qsize()
+            }
+
+    def _start_worker(self) -> None:
+        """Arranca el hilo de seguimiento si no está activo"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        threading.Thread(
+            target=self._run,
+            name="quota-tracker",
+            daemon=True
+        ).start()
+
+    def _run(self) -> None:
+        """Bucle del hilo: procesa observaciones hasta quedar inactivo"""
+        while True:
+            try:
+                token, status_code, headers = self._queue.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._running = False
+                        return
+                continue
+
+            try:
+                with self._lock:
+                    self._observed += 1
+                self.apply(token, status_code, headers)
+            except Exception as e:  # pylint: disable=broad-except
+                # Un error de una observación no debe detener el seguimiento
+                logger.warning("Error actualizando cuota observada: %s", e)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,387 @@
+"""
+Servicio de Tokens de Sesión de Copilot - CoProx
+
+PROPÓSITO:
+Este servicio intercambia el token OAuth de cada cuenta por el token de sesión de
+Copilot (copilot_internal/v2/token) y lo mantiene en caché hasta poco antes de que
+caduque, para que las solicitudes a la API usen la credencial de corta duración sin
+pagar el intercambio en cada solicitud.
+
+FUNCIONAMIENTO:
+- get: lectura de diccionario; nunca hace llamadas de red
+- Un hilo en segundo plano intercambia los tokens pendientes y refresca cada
+  token de sesión SESSION_TOKEN_REFRESH_MARGIN segundos antes de su caducidad
+- Si una cuenta aún no tiene token de sesión, get devuelve None y el llamador
+  usa el token OAuth mientras el intercambio se hace en segundo plano
+- renew: tras un 401 con un token de sesión, obtiene uno nuevo (una sola vez
+  por solicitud, lo decide el llamador)
+- Los intercambios fallidos se reintentan tras SESSION_TOKEN_RETRY_DELAY, que se
+  duplica con cada fallo consecutivo hasta SESSION_TOKEN_RETRY_MAX_DELAY
+- invalidate descarta el token y las tareas de una cuenta retirada; ProxyController
+  lo registra como listener de AuthModel (cuentas eliminadas o agotadas)
+
+PARÁMETROS DE ENTRADA:
+- exchange: Función que recibe el token OAuth y devuelve la respuesta JSON de
+  copilot_internal/v2/token
+- oauth_token: Token OAuth de la cuenta
+- refresh_margin: Segundos de antelación con los que se refresca
+
+SALIDA ESPERADA:
+- get: Token de sesión vigente o None
+- credential: Token a enviar a la API (sesión si existe, si no OAuth)
+- account_for: Token OAuth al que pertenece una credencial
+
+PROCESAMIENTO DE DATOS:
+- La caducidad se toma de expires_at (epoch) o, si falta, de refresh_in
+- Las tareas de refresco se guardan en un heap por fecha, con una única tarea
+  vigente por cuenta
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: proxy_controller.py y async_proxy_controller.py (credencial de
+  cada solicitud y reintento tras 401)
+- Avisado por: auth_model.py (cuentas eliminadas o agotadas)
+- Utiliza: config_model.py (márgenes y reintentos)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- Cada proceso servidor arranca su propio hilo de refresco
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.models.config_model import (
+    SESSION_TOKEN_DEFAULT_TTL,
+    SESSION_TOKEN_REFRESH_MARGIN,
+    SESSION_TOKEN_RETRY_DELAY,
+    SESSION_TOKEN_RETRY_MAX_DELAY
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SessionToken(NamedTuple):
+    """Token de sesión de Copilot y su caducidad (epoch)"""
+    token: str
+    expires_at: float
+
+
+def parse_session_token(data: Dict[str, Any], now: float) -> SessionToken:
+    """
+    Extrae el token de sesión de la respuesta de copilot_internal/v2/token.
+
+    Args:
+        data: Respuesta JSON del intercambio
+        now: Momento actual (epoch)
+
+    Returns:
+        SessionToken con su caducidad
+
+    Raises:
+        ValueError: Si la respuesta no contiene un token
+    """
+    token = data.get("token")
+    if not token or not isinstance(token, str):
+        raise ValueError("Invalid response: missing 'token' field")
+
+    expires_at = data.get("expires_at")
+    if not isinstance(expires_at, (int, float)) or isinstance(expires_at, bool):
+        expires_at = now + float(data.get("refresh_in") or SESSION_TOKEN_DEFAULT_TTL)
+    return SessionToken(token, float(expires_at))
+
+
+class SessionTokenService:
+    """
+    Caché thread-safe de tokens de sesión con refresco anticipado.
+    """
+
+    def __init__(
+        self,
+        exchange: Callable[[str], Dict[str, Any]],
+        refresh_margin: float = SESSION_TOKEN_REFRESH_MARGIN,
+        retry_delay: float = SESSION_TOKEN_RETRY_DELAY,
+        max_retry_delay: float = SESSION_TOKEN_RETRY_MAX_DELAY,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Inicializa el servicio sin tokens ni hilo de refresco.
+
+        Args:
+            exchange: Intercambio OAuth -> respuesta de copilot_internal/v2/token
+            refresh_margin: Segundos antes de la caducidad para refrescar
+            retry_delay: Segundos de espera tras un intercambio fallido
+            max_retry_delay: Espera máxima tras fallos consecutivos
+            clock: Reloj epoch (inyectable para tests)
+        """
+        self._exchange = exchange
+        self._refresh_margin = refresh_margin
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._clock = clock
+
+        # Lecturas sin lock: las entradas se sustituyen, nunca se modifican
+        self._sessions: Dict[str, SessionToken] = {}
+        self._accounts: Dict[str, str] = {}
+        self._previous: Dict[str, str] = {}
+
+        # Fallos consecutivos por cuenta; mientras falla solo se reintenta
+        # según su espera, no en cada get
+        self._failed: Dict[str, int] = {}
+        self._due: Dict[str, float] = {}
+        # Invalidaciones por cuenta: un intercambio en curso al invalidar la
+        # cuenta descarta su resultado
+        self._generations: Dict[str, int] = {}
+        self._schedule: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self._exchanges = 0
+        self._failures = 0
+
+    def start(self, oauth_tokens: Iterable[str] = ()) -> None:
+        """
+        Arranca el hilo de refresco y programa el intercambio de las cuentas.
+
+        Args:
+            oauth_tokens: Tokens OAuth a intercambiar de inmediato
+        """
+        with self._condition:
+            self._stopped = False
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="session-token-refresher",
+                    daemon=True
+                )
+                self._thread.start()
+        for oauth_token in oauth_tokens:
+            self._schedule_refresh(oauth_token, 0.0)
+
+    def stop(self) -> None:
+        """Detiene el hilo de refresco (los tokens en caché se conservan)"""
+        with self._condition:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._condition.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def is_running(self) -> bool:
+        """Indica si el hilo de refresco está activo"""
+        return self._thread is not None
+
+    def get(self, oauth_token: str) -> Optional[str]:
+        """
+        Obtiene el token de sesión vigente de una cuenta.
+
+        Nunca hace llamadas de red: si no hay token vigente y el hilo de
+        refresco está activo, programa el intercambio (salvo que la cuenta
+        esté esperando para reintentar) y retorna None.
+
+        Args:
+            oauth_token: Token OAuth de la cuenta
+
+        Returns:
+            Token de sesión o None
+        """
+        session = self._sessions.get(oauth_token)
+        if session is not None and session.expires_at > self._clock():
+            return session.token
+        if self._thread is not None and oauth_token not in self._failed:
+            self._schedule_refresh(oauth_token, 0.0)
+        return None
+
+    def credential(self, oauth_token: str) -> str:
+        """
+        Obtiene la credencial a enviar a la API para una cuenta.
+
+        Args:
+            oauth_token: Token OAuth de la cuenta
+
+        Returns:
+            Token de sesión vigente o, si no hay, el propio token OAuth
+        """
+        return self.get(oauth_token) or oauth_token
+
+    def account_for(self, credential: str) -> str:
+        """
+        Obtiene el token OAuth al que pertenece una credencial.
+
+        Args:
+            credential: Token de sesión o token OAuth
+
+        Returns:
+            Token OAuth de la cuenta
+        """
+        return self._accounts.get(credential, credential)
+
+    def renew(self, oauth_token: str, rejected: str) -> Optional[str]:
+        """
+        Obtiene un token de sesión nuevo tras un 401 de la API.
+
+        Si otro hilo ya lo renovó, se retorna el nuevo sin llamadas de red;
+        si no, se hace el intercambio de forma síncrona.
+
+        Args:
+            oauth_token: Token OAuth de la cuenta
+            rejected: Token de sesión rechazado por la API
+
+        Returns:
+            Token de sesión nuevo, o None si la credencial rechazada no era
+            un token de sesión o el intercambio falló
+        """
+        if rejected == oauth_token:
+            return None
+
+        current = self.get(oauth_token)
+        if current is not None and current != rejected:
+            return current
+
+        self._sessions.pop(oauth_token, None)
+        return self.refresh(oauth_token)
+
+    def refresh(self, oauth_token: str) -> Optional[str]:
+        """
+        Intercambia el token OAuth por un token de sesión nuevo.
+
+        Args:
+            oauth_token: Token OAuth de la cuenta
+
+        Returns:
+            Token de sesión nuevo, o None si el intercambio falló o la cuenta
+            se invalidó mientras se hacía
+        """
+        with self._condition:
+            generation = self._generations.get(oauth_token, 0)
+        try:
+            session = parse_session_token(self._exchange(oauth_token), self._clock())
+        except Exception as e:  # pylint: disable=broad-except
+            # Cualquier fallo del intercambio se reintenta más tarde, cada
+            # vez con más espera
+            with self._condition:
+                self._failures += 1
+                if self._generations.get(oauth_token, 0) != generation:
+                    return None
+                failed = self._failed.get(oauth_token, 0) + 1
+                self._failed[oauth_token] = failed
+                delay = min(self._retry_delay * 2 ** (failed - 1), self._max_retry_delay)
+                logger.warning("Error intercambiando token de sesión (reintento en %.0fs): %s", delay, e)
+                self._schedule_refresh(oauth_token, delay, replace=True)
+            return None
+
+        with self._condition:
+            self._exchanges += 1
+            # Cuenta invalidada durante el intercambio: no se resucita
+            if self._generations.get(oauth_token, 0) != generation:
+                return None
+            self._failed.pop(oauth_token, None)
+            previous = self._sessions.get(oauth_token)
+            self._accounts[session.token] = oauth_token
+            self._sessions[oauth_token] = session
+            # El token anterior puede seguir en solicitudes en curso: se
+            # conserva su correspondencia hasta el siguiente refresco
+            stale = self._previous.pop(oauth_token, None)
+            if stale is not None and stale != session.token:
+                self._accounts.pop(stale, None)
+            if previous is not None and previous.token != session.token:
+                self._previous[oauth_token] = previous.token
+
+            delay = session.expires_at - self._refresh_margin - self._clock()
+            self._schedule_refresh(oauth_token, max(delay, 0.0), replace=True)
+        return session.token
+
+    def invalidate(self, oauth_token: str) -> None:
+        """
+        Descarta el token de sesión de una cuenta y cancela sus intercambios
+        pendientes (p. ej. cuenta eliminada o agotada).
+
+        Args:
+            oauth_token: Token OAuth de la cuenta
+        """
+        with self._condition:
+            self._generations[oauth_token] = self._generations.get(oauth_token, 0) + 1
+            session = self._sessions.pop(oauth_token, None)
+            if session is not None:
+                self._accounts.pop(session.token, None)
+            stale = self._previous.pop(oauth_token, None)
+            if stale is not None:
+                self._accounts.pop(stale, None)
+            self._due.pop(oauth_token, None)
+            self._failed.pop(oauth_token, None)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Obtiene el estado de la caché de este proceso.
+
+        Returns:
+            Diccionario con sessions, pending, exchanges y failures
+        """
+        with self._condition:
+            return {
+                'sessions': len(self._sessions),
+                'pending': len(self._due),
+                'exchanges': self._exchanges,
+                'failures': self._failures
+            }
+
+    def _schedule_refresh(self, oauth_token: str, delay: float, replace: bool = False) -> None:
+        """
+        Programa el intercambio de una cuenta (solo si el hilo está activo).
+
+        Args:
+            oauth_token: Token OAuth de la cuenta
+            delay: Segundos hasta el intercambio
+            replace: Sustituir la tarea vigente aunque sea anterior
+        """
+        with self._condition:
+            if self._thread is None:
+                return
+            due = self._clock() + delay
+            current = self._due.get(oauth_token)
+            if current is not None and current <= due and not replace:
+                return
+            self._due[oauth_token] = due
+            heapq.heappush(self._schedule, (due, next(self._sequence), oauth_token))
+            self._condition.notify()
+
+    def _next_due(self) -> Optional[str]:
+        """
+        Espera a la siguiente tarea vencida.
+
+        Returns:
+            Token OAuth a refrescar o None si el servicio se detuvo
+        """
+        with self._condition:
+            while not self._stopped:
+                # Descartar tareas sustituidas o canceladas
+                while self._schedule and self._due.get(self._schedule[0][2]) != self._schedule[0][0]:
+                    heapq.heappop(self._schedule)
+
+                if not self._schedule:
+                    self._condition.wait()
+                    continue
+
+                due, _, oauth_token = self._schedule[0]
+                wait = due - self._clock()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+
+                heapq.heappop(self._schedule)
+                del self._due[oauth_token]
+                return oauth_token
+            return None
+
+    def _run(self) -> None:
+        """Bucle del hilo de refresco"""
+        while True:
+            oauth_token = self._next_due()
+            if oauth_token is None:
+                return
+            self.refresh(oauth_token)
@@ -0,0 +1,587 @@
+"""
+Servicio de Vigilancia de Directorios de Tokens - CoProx
+
+PROPÓSITO:
+Este servicio mantiene AuthModel sincronizado con los archivos .copilot_token
+del disco sin reescanear los directorios: un archivo nuevo se carga como cuenta
+en milisegundos y uno eliminado retira su cuenta.
+
+FUNCIONAMIENTO:
+- Al arrancar hace un único escaneo completo de TOKEN_DIRECTORY y
+  TOKENS_EXHAUSTED_DIR
+- Después recibe eventos de inotify (Linux, vía ctypes, sin dependencias) o,
+  si no está disponible, de un polling que compara tamaño y fecha de
+  modificación de cada archivo
+- Los eventos se agrupan: el lote se aplica tras TOKEN_WATCH_DEBOUNCE segundos
+  sin eventos nuevos, y como mucho 10 veces ese tiempo después del primero
+- Si inotify pierde eventos (cola desbordada) se reescanea el directorio
+
+PARÁMETROS DE ENTRADA:
+- auth_model: Modelo de cuentas a actualizar
+- token_dir: Directorio de tokens activos
+- exhausted_dir: Directorio de tokens agotados
+- on_added: Función opcional que recibe los tokens cargados en cada lote
+  (p. ej. para verificar su cuota)
+- backend: "auto", "inotify" o "polling"
+
+SALIDA ESPERADA:
+- Cuentas agregadas (pendientes de verificar: entran en la rotación hasta que
+  on_added conozca su cuota) o eliminadas en AuthModel; los tokens que
+  aparecen en exhausted_dir se marcan agotados
+- get_statistics: backend en uso y contadores de lotes y cambios
+
+PROCESAMIENTO DE DATOS:
+- Solo se tienen en cuenta archivos terminados en TOKEN_FILE_EXTENSION
+- Con inotify se usan IN_CLOSE_WRITE/IN_MOVED_TO (archivo completo) y
+  IN_DELETE/IN_MOVED_FROM, así un archivo a medio escribir no se lee
+- Se recuerda qué token cargó cada archivo para saber qué cuenta retirar
+- on_added se ejecuta en un hilo propio, fuera del lock: una verificación
+  lenta no retrasa la aplicación de los siguientes eventos
+
+INTERACCIONES CON OTROS MÓDULOS:
+- Usado por: auth_controller.py (start_token_watch), arrancado por
+  proxy_controller.py en el proceso servidor
+- Actualiza: auth_model.py (add_account, remove_account, mark_account_as_exhausted)
+- Utiliza: config_model.py (directorios, backend y tiempos)
+
+INTERACCIONES CON MAIN:
+- No interactúa directamente con main.py
+- El hilo de vigilancia se arranca desde AuthController al iniciar el servidor
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from src.models.auth_model import AuthModel
+from src.models.config_model import (
+    TOKEN_DIRECTORY,
+    TOKEN_FILE_EXTENSION,
+    TOKEN_WATCH_BACKEND,
+    TOKEN_WATCH_BACKENDS,
+    TOKEN_WATCH_DEBOUNCE,
+    TOKEN_WATCH_POLL_INTERVAL,
+    TOKENS_EXHAUSTED_DIR
+)
+
+logger = logging.getLogger(__name__)
+
+# Máscaras de inotify (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_DELETE | _IN_MOVED_FROM
+    | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class WatchEvent(NamedTuple):
+    """Cambio en un directorio vigilado (name None: reescanear el directorio)"""
+    directory: str
+    name: Optional[str]
+    added: bool
+
+
+def _list_token_files(directory: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Lista los archivos de token de un directorio con su firma.
+
+    Args:
+        directory: Directorio a listar
+
+    Returns:
+        Diccionario nombre -> (mtime_ns, tamaño); vacío si no existe
+    """
+    files = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(TOKEN_FILE_EXTENSION):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return {}
+    return files
+
+
+class _PollingWatcher:
+    """Detecta cambios comparando listados periódicos de cada directorio"""
+
+    name = "polling"
+
+    def __init__(self, directories: List[str], interval: float):
+        self._directories = directories
+        self._interval = interval
+        self._wakeup = threading.Event()
+        self._state = {directory: _list_token_files(directory) for directory in directories}
+
+    def read(self, timeout: Optional[float]) -> List[WatchEvent]:
+        """Espera timeout (None: un intervalo) y retorna los cambios"""
+        self._wakeup.wait(self._interval if timeout is None else timeout)
+        self._wakeup.clear()
+
+        events = []
+        for directory in self._directories:
+            previous = self._state[directory]
+            current = _list_token_files(directory)
+            for name, signature in current.items():
+                if previous.get(name) != signature:
+                    events.append(WatchEvent(directory, name, True))
+            for name in previous.keys() - current.keys():
+                events.append(WatchEvent(directory, name, False))
+            self._state[directory] = current
+        return events
+
+    def wake(self) -> None:
+        """Interrumpe la espera en curso"""
+        self._wakeup.set()
+
+    def close(self) -> None:
+        """Libera recursos (nada que liberar)"""
+
+
+class _InotifyWatcher:
+    """Recibe los cambios de cada directorio del kernel mediante inotify"""
+
+    name = "inotify"
+
+    def __init__(self, directories: List[str], interval: float):
+        """
+        Raises:
+            OSError: Si inotify no está disponible en esta plataforma
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify solo está disponible en Linux")
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "libc sin inotify")
+        self._libc = libc
+
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+        self._interval = interval
+        self._wake_read, self._wake_write = os.pipe()
+        self._watches: Dict[int, str] = {}
+        self._missing: Set[str] = set(directories)
+        self._add_missing_watches()
+
+    def _add_missing_watches(self) -> List[WatchEvent]:
+        """
+        Intenta vigilar los directorios que aún no existían.
+
+        Returns:
+            Eventos de reescaneo para los directorios que se empezaron a vigilar
+        """
+        events = []
+        for directory in list(self._missing):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                continue
+            self._watches[wd] = directory
+            self._missing.discard(directory)
+            events.append(WatchEvent(directory, None, True))
+        return events
+
+    def read(self, timeout: Optional[float]) -> List[WatchEvent]:
+        """Espera eventos hasta timeout (None: sin límite) y los retorna"""
+        if self._missing:
+            timeout = self._interval if timeout is None else min(timeout, self._interval)
+
+        readable, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+        if self._wake_read in readable:
+            os.read(self._wake_read, 4096)
+
+        events = self._add_missing_watches() if self._missing else []
+        if self._fd in readable:
+            events.extend(self._read_events())
+        return events
+
+    def _read_events(self) -> List[WatchEvent]:
+        """Lee y decodifica los eventos pendientes del descriptor"""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                raw_name = buffer[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length]
+                offset += _EVENT_HEADER.size + length
+                events.extend(self._decode(wd, mask, os.fsdecode(raw_name.rstrip(b"\0"))))
+
+    def _decode(self, wd: int, mask: int, name: str) -> List[WatchEvent]:
+        """Traduce un evento de inotify a WatchEvent"""
+        if mask & _IN_Q_OVERFLOW:
+            # Se perdieron eventos: reescanear todo lo vigilado
+            return [WatchEvent(directory, None, True) for directory in self._watches.values()]
+
+        directory = self._watches.get(wd)
+        if directory is None:
+            return []
+
+        if mask & (_IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+            # El directorio desapareció: se vuelve a vigilar cuando exista
+            if mask & _IN_IGNORED:
+                del self._watches[wd]
+                self._missing.add(directory)
+            return [WatchEvent(directory, None, True)]
+
+        if not name.endswith(TOKEN_FILE_EXTENSION):
+            return []
+        if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+            return [WatchEvent(directory, name, True)]
+        if mask & (_IN_DELETE | _IN_MOVED_FROM):
+            return [WatchEvent(directory, name, False)]
+        return []
+
+    def wake(self) -> None:
+        """Interrumpe la espera en curso"""
+        os.write(self._wake_write, b"\0")
+
+    def close(self) -> None:
+        """Cierra el descriptor de inotify y la tubería de aviso"""
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class TokenWatchService:
+    """
+    Sincroniza AuthModel con los archivos de tokens según cambian en disco.
+    """
+
+    def __init__(
+        self,
+        auth_model: AuthModel,
+        token_dir: str = TOKEN_DIRECTORY,
+        exhausted_dir: str = TOKENS_EXHAUSTED_DIR,
+        on_added: Optional[Callable[[List[str]], object]] = None,
+        backend: str = TOKEN_WATCH_BACKEND,
+        debounce: float = TOKEN_WATCH_DEBOUNCE,
+        poll_interval: float = TOKEN_WATCH_POLL_INTERVAL
+    ):
+        """
+        Inicializa el servicio sin hilo de vigilancia.
+
+        Args:
+            auth_model: Modelo de cuentas a actualizar
+            token_dir: Directorio de tokens activos
+            exhausted_dir: Directorio de tokens agotados
+            on_added: Recibe los tokens nuevos de cada lote
+            backend: "auto", "inotify" o "polling"
+            debounce: Segundos sin eventos tras los que se aplica el lote
+            poll_interval: Segundos entre revisiones del polling
+
+        Raises:
+            ValueError: Si el backend no está soportado
+        """
+        if backend not in TOKEN_WATCH_BACKENDS:
+            raise ValueError(f"Backend de vigilancia no soportado: {backend}")
+
+        self._auth_model = auth_model
+        self._token_dir = os.path.abspath(token_dir)
+        self._exhausted_dir = os.path.abspath(exhausted_dir)
+        self._on_added = on_added
+        self._backend_name = backend
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+
+        # Token cargado desde cada archivo, por directorio
+        self._files: Dict[str, Dict[str, str]] = {
+            self._token_dir: {},
+            self._exhausted_dir: {}
+        }
+
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._watcher = None
+        # Hilo que llama a on_added (las verificaciones pueden ser lentas)
+        self._added_pool: Optional[ThreadPoolExecutor] = None
+        self._batches = 0
+        self._loaded = 0
+        self._removed = 0
+
+    def start(self) -> None:
+        """
+        Carga los tokens actuales y arranca la vigilancia en segundo plano.
+
+        Raises:
+            OSError: Si se pidió inotify y no está disponible
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            directories = [self._token_dir, self._exhausted_dir]
+            # El vigilante se crea antes del escaneo inicial para no perder
+            # archivos creados entre ambos
+            self._watcher = self._create_watcher(directories)
+            if self._on_added is not None:
+                self._added_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="token-watch-added")
+            added_tokens = self._apply([WatchEvent(directory, None, True) for directory in directories])
+
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="token-watcher",
+                daemon=True
+            )
+            self._thread.start()
+        self._notify_added(added_tokens)
+
+    def stop(self) -> None:
+        """Detiene la vigilancia (las cuentas cargadas se conservan)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            watcher = self._watcher
+            added_pool, self._added_pool = self._added_pool, None
+        self._stopped.set()
+        if watcher is not None:
+            watcher.wake()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if watcher is not None:
+            watcher.close()
+        if added_pool is not None:
+            added_pool.shutdown(wait=False, cancel_futures=True)
+
+    def is_running(self) -> bool:
+        """Indica si el hilo de vigilancia está activo"""
+        return self._thread is not None
+
+    def get_statistics(self) -> Dict[str, object]:
+        """
+        Obtiene el estado de la vigilancia.
+
+        Returns:
+            Diccionario con backend, files, batches, loaded y removed
+        """
+        with self._lock:
+            return {
+                'backend': self._watcher.name if self._watcher is not None else None,
+                'files': sum(len(files) for files in self._files.values()),
+                'batches': self._batches,
+                'loaded': self._loaded,
+                'removed': self._removed
+            }
+
+    def _create_watcher(self, directories: List[str]):
+        """Crea el vigilante del backend configurado"""
+        if self._backend_name in ("auto", "inotify"):
+            try:
+                return _InotifyWatcher(directories, self._poll_interval)
+            except OSError as e:
+                if self._backend_name == "inotify":
+                    raise
+                logger.info("inotify no disponible (%s), usando polling", e)
+        return _PollingWatcher(directories, self._poll_interval)
+
+    def _run(self) -> None:
+        """Bucle del hilo: agrupa eventos y aplica cada lote"""
+        watcher = self._watcher
+        while not self._stopped.is_set():
+            try:
+                events = watcher.read(None)
+                if not events or self._stopped.is_set():
+                    continue
+
+                # Esperar a que cesen los eventos (como mucho 10 x debounce)
+                deadline = time.monotonic() + self._debounce * 10
+                while time.monotonic() < deadline:
+                    more = watcher.read(self._debounce)
+                    if not more:
+                        break
+                    events.extend(more)
+
+                with self._lock:
+                    added_tokens = self._apply(events)
+                self._notify_added(added_tokens)
+            except Exception as e:  # pylint: disable=broad-except
+                # Un error en un lote no debe detener la vigilancia
+                logger.error("Error aplicando cambios de tokens: %s", e)
+                self._stopped.wait(self._poll_interval)
+
+    def _apply(self, events: List[WatchEvent]) -> List[str]:
+        """
+        Aplica un lote de eventos a AuthModel (llamar con el lock tomado).
+
+        Args:
+            events: Eventos en orden de llegada
+
+        Returns:
+            Tokens de las cuentas agregadas, para pasarlos a on_added tras
+            soltar el lock
+        """
+        changes: Dict[str, Dict[str, bool]] = {directory: {} for directory in self._files}
+        for event in events:
+            directory_changes = changes.get(event.directory)
+            if directory_changes is None:
+                continue
+            if event.name is not None:
+                directory_changes[event.name] = event.added
+                continue
+
+            # Reescaneo: comparar lo cargado con lo que hay en disco
+            present = _list_token_files(event.directory)
+            for name in self._files[event.directory]:
+                directory_changes.setdefault(name, False)
+            for name in present:
+                directory_changes[name] = True
+            for name in self._files[event.directory].keys() - present.keys():
+                directory_changes[name] = False
+
+        # Los archivos de exhausted_dir se registran antes de procesar
+        # token_dir: un token movido de uno a otro no debe retirar su cuenta
+        exhausted_files = self._files[self._exhausted_dir]
+        exhausted_tokens: List[str] = []
+        for name, added in changes[self._exhausted_dir].items():
+            if not added:
+                exhausted_files.pop(name, None)
+                continue
+            token = _read_token(os.path.join(self._exhausted_dir, name))
+            if token is None:
+                exhausted_files.pop(name, None)
+                continue
+            exhausted_files[name] = token
+            exhausted_tokens.append(token)
+
+        added_tokens: List[str] = []
+        for name, added in changes[self._token_dir].items():
+            if added:
+                token = self._load_active_file(name)
+                if token is not None:
+                    added_tokens.append(token)
+            else:
+                self._unload_active_file(name)
+
+        for token in exhausted_tokens:
+            if self._auth_model.has_account(token):
+                try:
+                    self._auth_model.mark_account_as_exhausted(token)
+                except KeyError:
+                    pass
+
+        self._batches += 1
+        return added_tokens
+
+    def _notify_added(self, added_tokens: List[str]) -> None:
+        """Encarga a su hilo pasar los tokens nuevos a on_added"""
+        pool = self._added_pool
+        if not added_tokens or pool is None:
+            return
+        try:
+            pool.submit(self._run_on_added, added_tokens)
+        except RuntimeError:
+            # El servicio se detuvo mientras se aplicaba el lote
+            pass
+
+    def _run_on_added(self, added_tokens: List[str]) -> None:
+        """Llama a on_added con los tokens de un lote"""
+        try:
+            self._on_added(added_tokens)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Error procesando tokens nuevos: %s", e)
+
+    def _load_active_file(self, name: str) -> Optional[str]:
+        """
+        Carga el token de un archivo nuevo o modificado de token_dir.
+
+        Args:
+            name: Nombre del archivo
+
+        Returns:
+            Token si se agregó una cuenta nueva, None en otro caso
+        """
+        token = _read_token(os.path.join(self._token_dir, name))
+        if token is None:
+            # Ya no existe o no se puede leer: equivale a una eliminación
+            self._unload_active_file(name)
+            return None
+
+        files = self._files[self._token_dir]
+        previous = files.get(name)
+        files[name] = token
+        if previous is not None and previous != token:
+            self._remove_if_unreferenced(previous)
+
+        if self._auth_model.has_account(token):
+            return None
+
+        try:
+            # Entra en la rotación ya; on_added verificará su cuota
+            self._auth_model.add_account(token, pending=True)
+        except ValueError as e:
+            logger.warning("Token inválido en %s: %s", name, e)
+            del files[name]
+            return None
+        self._loaded += 1
+        return token
+
+    def _unload_active_file(self, name: str) -> None:
+        """Retira la cuenta de un archivo eliminado de token_dir"""
+        token = self._files[self._token_dir].pop(name, None)
+        if token is not None:
+            self._remove_if_unreferenced(token)
+
+    def _remove_if_unreferenced(self, token: str) -> None:
+        """
+        Elimina la cuenta si ningún otro archivo contiene el token; si su
+        archivo está en exhausted_dir la cuenta se conserva agotada.
+        """
+        if token in self._files[self._token_dir].values():
+            return
+        if token in self._files[self._exhausted_dir].values():
+            return
+        if self._auth_model.remove_account(token):
+            self._removed += 1
+
+
+def _read_token(path: str) -> Optional[str]:
+    """
+    Lee el token de un archivo.
+
+    Args:
+        path: Ruta del archivo
+
+    Returns:
+        Token sin espacios, o None si no existe, no se puede leer o está vacío
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            token = f.read().strip()
+    except (OSError, ValueError):
+        return None
+    return token or None
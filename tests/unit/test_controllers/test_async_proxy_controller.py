@@ -0,0 +1,324 @@
+"""
+Tests Unitarios para AsyncProxyController - CoProx
+
+Valida que el motor ASGI expone los mismos endpoints que la aplicación
+Flask y reutiliza la lógica de ProxyController. La API se simula con un
+cliente asíncrono falso, por lo que no se requieren httpx ni uvicorn.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import Mock
+
+import pytest
+
+from src.controllers.async_proxy_controller import AsyncProxyController
+from src.controllers.proxy_controller import ProxyController
+
+
+TOKEN = "token_1234567890123456789012345678901234"
+
+
+class _FakeUpstreamResponse:
+    """Respuesta simulada con la interfaz usada de httpx.Response"""
+
+    def __init__(self, status_code=200, payload=None, lines=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self._lines = lines or []
+        self.content = json.dumps(self._payload).encode()
+        self.text = self.content.decode()
+        self.headers = {'content-type': 'application/json'}
+
+    def json(self):
+        return self._payload
+
+    async def aread(self):
+        return self.content
+
+    async def aiter_lines(self):
+        for line in self._lines:
+            yield line
+
+
+class _FakeAsyncHttpService:
+    """Cliente asíncrono falso que registra las llamadas"""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    async def post(self, url, headers, content):
+        self.calls.append(('post', url, headers, content))
+        if isinstance(self.response, list):
+            return self.response.pop(0)
+        return self.response
+
+    async def get(self, url, headers):
+        self.calls.append(('get', url, headers, None))
+        return self.response
+
+    @asynccontextmanager
+    async def stream(self, url, headers, content):
+        self.calls.append(('stream', url, headers, content))
+        yield self.response
+
+    async def aclose(self):
+        pass
+
+
+def _call_app(app, method, path, body=b"", headers=()):
+    """Ejecuta una solicitud ASGI y devuelve (status, headers, body)"""
+    messages = []
+    request_messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return request_messages.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    asyncio.run(app(scope, receive, send))
+
+    start = messages[0]
+    payload = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], dict(start["headers"]), payload
+
+
+@pytest.fixture
+def proxy_controller():
+    """ProxyController con una cuenta disponible"""
+    controller = ProxyController(http_service=Mock())
+    controller.get_auth_model().add_account(TOKEN, quota_remaining=100)
+    return controller
+
+
+class TestAsyncProxyControllerRoutes:
+    """Tests para las rutas expuestas por el motor ASGI"""
+
+    def test_unknown_path_returns_404(self, proxy_controller):
+        """Test: Rutas desconocidas retornan 404"""
+        app = AsyncProxyController(proxy_controller, _FakeAsyncHttpService(_FakeUpstreamResponse()))
+
+        status, _, _ = _call_app(app, "GET", "/unknown")
+
+        assert status == 404
+
+    def test_chat_completions_accepts_post_only(self, proxy_controller):
+        """Test: /v1/chat/completions solo acepta POST"""
+        app = AsyncProxyController(proxy_controller, _FakeAsyncHttpService(_FakeUpstreamResponse()))
+
+        status, _, _ = _call_app(app, "GET", "/v1/chat/completions")
+
+        assert status == 405
+
+    def test_invalid_request_reuses_validation(self, proxy_controller):
+        """Test: Solicitudes inválidas usan validate_chat_request"""
+        app = AsyncProxyController(proxy_controller, _FakeAsyncHttpService(_FakeUpstreamResponse()))
+
+        status, _, body = _call_app(app, "POST", "/chat/completions", b'{"model": "gpt-4o"}')
+
+        assert status == 400
+        assert "messages" in json.loads(body)['error']['message']
+
+    def test_no_tokens_returns_503(self):
+        """Test: Sin tokens disponibles retorna 503"""
+        controller = ProxyController(http_service=Mock())
+        app = AsyncProxyController(controller, _FakeAsyncHttpService(_FakeUpstreamResponse()))
+        body = json.dumps({"model": "gpt-4o", "messages": [{"role": "user", "content": "Hi"}]})
+
+        status, _, _ = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+        assert status == 503
+
+    def test_lifespan_shutdown_closes_server_process(self, proxy_controller):
+        """Test: lifespan.shutdown ejecuta el cierre del proceso (uvicorn toma las señales)"""
+        proxy_controller.shutdown_server_process = Mock()
+        app = AsyncProxyController(proxy_controller, _FakeAsyncHttpService(_FakeUpstreamResponse()))
+        events = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return events.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(app({"type": "lifespan"}, receive, send))
+
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        proxy_controller.shutdown_server_process.assert_called_once_with()
+
+
+class TestAsyncProxyControllerForwarding:
+    """Tests para el reenvío asíncrono a la API de Copilot"""
+
+    def test_chat_completion_rewrites_model_and_counts(self, proxy_controller):
+        """Test: La respuesta se reescribe y se contabiliza en ProxyModel"""
+        upstream = _FakeUpstreamResponse(payload={"model": "gpt-4o-2024-11-20", "choices": []})
+        http_service = _FakeAsyncHttpService(upstream)
+        app = AsyncProxyController(proxy_controller, http_service)
+        body = json.dumps({"model": "gpt-4o", "messages": [{"role": "user", "content": "Hi"}]})
+
+        status, _, payload = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+        assert status == 200
+        assert json.loads(payload)['model'] == "gpt-4o"
+        _, url, headers, _ = http_service.calls[0]
+        assert url.endswith('/chat/completions')
+        assert headers['authorization'] == f"Bearer {TOKEN}"
+        assert proxy_controller.get_proxy_model().get_total_requests() == 1
+
+    def test_passthrough_relays_body_unchanged(self, proxy_controller):
+        """Test: Sin reescritura el cuerpo de la API se reenvía byte a byte"""
+        upstream = _FakeUpstreamResponse(status_code=429, payload={"error": {"message": "quota"}})
+        upstream.json = Mock(side_effect=AssertionError("no debe parsearse"))
+        app = AsyncProxyController(proxy_controller, _FakeAsyncHttpService(upstream))
+        body = json.dumps({"model": "o1", "messages": [{"role": "user", "content": "Hi"}]})
+
+        status, _, payload = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+        assert status == 429
+        assert payload == upstream.content
+
+    def test_streaming_forwards_sse_lines(self, proxy_controller):
+        """Test: El SSE se reenvía línea a línea con el modelo reescrito"""
+        upstream = _FakeUpstreamResponse(lines=[
+            'data: {"model":"gpt-4o-2024-11-20","choices":[]}',
+            '',
+            'data: [DONE]',
+            '',
+        ])
+        http_service = _FakeAsyncHttpService(upstream)
+        app = AsyncProxyController(proxy_controller, http_service)
+        body = json.dumps({
+            "model": "gpt-4o",
+            "messages": [{"role": "user", "content": "Hi"}],
+            "stream": True
+        })
+
+        status, headers, payload = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+        assert status == 200
+        assert headers[b"content-type"] == b"text/event-stream"
+        assert http_service.calls[0][0] == 'stream'
+        events = [line for line in payload.split(b"\n") if line.startswith(b"data:")]
+        assert json.loads(events[0][5:])['model'] == "gpt-4o"
+        assert events[1] == b"data: [DONE]"
+
+    def test_list_models(self, proxy_controller):
+        """Test: /models reenvía el cuerpo y el código de la API"""
+        upstream = _FakeUpstreamResponse(payload={"data": [{"id": "gpt-4o"}]})
+        app = AsyncProxyController(proxy_controller, _FakeAsyncHttpService(upstream))
+
+        status, _, payload = _call_app(app, "GET", "/models")
+
+        assert status == 200
+        assert json.loads(payload)['data'][0]['id'] == "gpt-4o"
+
+    def test_list_models_served_from_cache_with_etag(self, proxy_controller):
+        """Test: /models se cachea y responde 304 al ETag del cliente"""
+        upstream = _FakeUpstreamResponse(payload={"data": [{"id": "gpt-4o"}]})
+        http_service = _FakeAsyncHttpService(upstream)
+        app = AsyncProxyController(proxy_controller, http_service)
+
+        _, headers, _ = _call_app(app, "GET", "/models")
+        status, _, payload = _call_app(app, "GET", "/models", headers=[(b"if-none-match", headers[b"etag"])])
+
+        assert status == 304
+        assert payload == b""
+        assert len(http_service.calls) == 1
+
+    def test_chat_completion_fails_over_to_next_account(self, proxy_controller):
+        """Test: Un 429 de la API se reintenta con la siguiente cuenta"""
+        other = "token_9876543210987654321098765432109876"
+        proxy_controller.get_auth_model().add_account(other, quota_remaining=100)
+        http_service = _FakeAsyncHttpService([
+            _FakeUpstreamResponse(status_code=429, payload={"error": {"message": "quota"}}),
+            _FakeUpstreamResponse(payload={"model": "o1", "choices": []}),
+        ])
+        app = AsyncProxyController(proxy_controller, http_service)
+        body = json.dumps({"model": "o1", "messages": [{"role": "user", "content": "Hi"}]})
+
+        status, _, payload = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+        assert status == 200
+        assert json.loads(payload)['choices'] == []
+        assert [call[2]['authorization'] for call in http_service.calls] == [
+            f"Bearer {TOKEN}", f"Bearer {other}"
+        ]
+        assert proxy_controller.get_auth_model().get_all_accounts()[TOKEN]['failover_count'] == 1
+
+    def test_chat_completion_holds_account_and_follows_failover(self, proxy_controller):
+        """Test: La reserva de cuenta sigue al failover y se libera al responder"""
+        other = "token_9876543210987654321098765432109876"
+        auth_model = proxy_controller.get_auth_model()
+        auth_model.add_account(other, quota_remaining=100)
+        seen = []
+        responses = [
+            _FakeUpstreamResponse(status_code=403, payload={"error": {"message": "quota"}}),
+            _FakeUpstreamResponse(payload={"model": "o1", "choices": []}),
+        ]
+
+        class _RecordingHttpService(_FakeAsyncHttpService):
+            async def post(self, url, headers, content):
+                seen.append(auth_model.get_statistics()['in_flight'])
+                return await super().post(url, headers, content)
+
+        app = AsyncProxyController(proxy_controller, _RecordingHttpService(responses))
+        body = json.dumps({"model": "o1", "messages": [{"role": "user", "content": "Hi"}]})
+
+        status, _, _ = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+        assert status == 200
+        assert seen == [{TOKEN: 1}, {other: 1}]
+        assert auth_model.get_statistics()['in_flight'] == {}
+
+    def test_full_upstream_limit_returns_429(self, proxy_controller):
+        """Test: Con el límite hacia la API ocupado se responde 429 con Retry-After"""
+        limit = proxy_controller.get_upstream_limit()
+        while limit.try_acquire():
+            pass
+        http_service = _FakeAsyncHttpService(_FakeUpstreamResponse(payload={"choices": []}))
+        app = AsyncProxyController(proxy_controller, http_service)
+
+        for stream in (False, True):
+            body = json.dumps({"model": "o1", "stream": stream, "messages": [{"role": "user", "content": "Hi"}]})
+            status, headers, _ = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+            assert status == 429
+            assert b"retry-after" in headers
+        assert http_service.calls == []
+        assert proxy_controller.get_metrics()['upstream_rejections'] == 2
+
+
+    def test_chat_completion_renews_session_token_on_401(self):
+        """Test: Un 401 con token de sesión se reintenta con uno renovado"""
+        from src.services.session_token_service import SessionTokenService
+
+        issued = []
+
+        def exchange(oauth_token):
+            issued.append(oauth_token)
+            return {"token": f"tid=session-{len(issued)}", "expires_at": 4102444800}
+
+        service = SessionTokenService(exchange)
+        controller = ProxyController(http_service=Mock(), session_tokens=service)
+        controller.get_auth_model().add_account(TOKEN, quota_remaining=100)
+        service.refresh(TOKEN)
+        http_service = _FakeAsyncHttpService([
+            _FakeUpstreamResponse(status_code=401, payload={"error": {"message": "expired"}}),
+            _FakeUpstreamResponse(payload={"model": "o1", "choices": []}),
+        ])
+        app = AsyncProxyController(controller, http_service)
+        body = json.dumps({"model": "o1", "messages": [{"role": "user", "content": "Hi"}]})
+
+        status, _, _ = _call_app(app, "POST", "/v1/chat/completions", body.encode())
+
+        assert status == 200
+        assert [call[2]['authorization'] for call in http_service.calls] == [
+            "Bearer tid=session-1", "Bearer tid=session-2"
+        ]
+        assert controller.get_auth_model().get_all_accounts()[TOKEN]['failover_count'] == 0
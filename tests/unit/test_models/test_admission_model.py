@@ -0,0 +1,123 @@
+"""
+Tests unitarios para AccountAdmission
+
+Valida la elección de la cuenta menos cargada, el límite de solicitudes en
+curso, las colas FIFO por cuenta y el aviso a las esperas.
+"""
+
+import pytest
+
+from src.models.admission_model import AccountAdmission, AccountWaiter
+
+
+def _waiter(notified):
+    """Espera que anota cada aviso"""
+    waiter = AccountWaiter(lambda: notified.append(waiter))
+    return waiter
+
+
+class TestAccountAdmission:
+    """Tests para el índice de ocupación por cuenta"""
+
+    def test_rejects_invalid_configuration(self):
+        """Verifica que los límites se validan"""
+        with pytest.raises(ValueError):
+            AccountAdmission(max_in_flight=0)
+        with pytest.raises(ValueError):
+            AccountAdmission(queue_size=-1)
+
+    def test_select_spreads_load_to_least_loaded(self):
+        """Verifica que cada solicitud va a la cuenta con menos solicitudes en curso"""
+        admission = AccountAdmission(max_in_flight=2, queue_size=0)
+        for token in ("a", "b", "c"):
+            admission.set_eligible(token)
+
+        chosen = []
+        for _ in range(6):
+            token = admission.select("a")
+            admission.acquire(token)
+            chosen.append(token)
+
+        assert chosen[:3] == ["a", "b", "c"]
+        assert sorted(chosen) == ["a", "a", "b", "b", "c", "c"]
+        assert admission.select("a") is None
+
+        admission.release("b")
+        assert admission.select("a") == "b"
+
+    def test_preferred_account_is_used_when_idle(self):
+        """Verifica que la cuenta propuesta por la política se respeta si está libre"""
+        admission = AccountAdmission(max_in_flight=2)
+        admission.set_eligible("a")
+        admission.set_eligible("b")
+
+        assert admission.select("b") == "b"
+
+    def test_waiters_queue_on_shortest_queue_and_get_slots_in_order(self):
+        """Verifica que las esperas se reparten y reciben el hueco por orden de llegada"""
+        admission = AccountAdmission(max_in_flight=1, queue_size=2)
+        admission.set_eligible("a")
+        admission.set_eligible("b")
+        admission.acquire("a")
+        admission.acquire("b")
+        notified = []
+        waiters = [_waiter(notified) for _ in range(4)]
+
+        assert [admission.enqueue(waiter) for waiter in waiters] == ["a", "b", "a", "b"]
+        assert admission.enqueue(_waiter(notified)) is None
+
+        admission.release("a")
+        admission.release("a")
+
+        assert notified == [waiters[0], waiters[2]]
+        assert waiters[0].granted == "a" and waiters[0].queued_on is None
+        assert admission.statistics() == ({"a": 1, "b": 1}, {"b": 2})
+
+    def test_ineligible_account_releases_its_waiters(self):
+        """Verifica que las esperas de una cuenta retirada se avisan sin hueco"""
+        admission = AccountAdmission(max_in_flight=1, queue_size=1)
+        admission.set_eligible("a")
+        admission.acquire("a")
+        notified = []
+        waiter = _waiter(notified)
+        admission.enqueue(waiter)
+
+        admission.set_ineligible("a")
+
+        assert notified == [waiter]
+        assert waiter.granted is None and waiter.queued_on is None
+        assert admission.select() is None
+
+        # La solicitud en curso sigue contando al volver a estar disponible
+        admission.set_eligible("a")
+        assert admission.select() is None
+        admission.release("a")
+        assert admission.select() == "a"
+        assert not admission
+
+    def test_cancel_removes_waiter(self):
+        """Verifica que una espera cancelada deja de ocupar la cola"""
+        admission = AccountAdmission(max_in_flight=1, queue_size=1)
+        admission.set_eligible("a")
+        admission.acquire("a")
+        waiter = _waiter([])
+        admission.enqueue(waiter)
+
+        assert admission.cancel(waiter) is True
+        assert admission.cancel(waiter) is False
+        assert admission.statistics() == ({"a": 1}, {})
+        assert admission.enqueue(_waiter([])) == "a"
+
+    def test_try_acquire_respects_limit_and_waiters(self):
+        """Verifica que reservar una cuenta concreta no supera su límite ni adelanta esperas"""
+        admission = AccountAdmission(max_in_flight=1, queue_size=1)
+        admission.set_eligible("a")
+
+        assert admission.try_acquire("a") is True
+        assert admission.try_acquire("a") is False
+        assert admission.try_acquire("b") is False
+
+        admission.enqueue(_waiter([]))
+        admission.release("a")
+        assert admission.try_acquire("a") is False
+        assert admission.statistics() == ({"a": 1}, {})
@@ -0,0 +1,97 @@
+"""
+Tests unitarios para AdaptiveConcurrencyLimit
+
+Valida la admisión hasta el límite, el crecimiento con latencia estable, la
+reducción ante errores o subidas de latencia y sus cotas.
+"""
+
+import pytest
+
+from src.models.concurrency_limit_model import AdaptiveConcurrencyLimit
+
+
+def _fill(limit):
+    """Ocupa todos los huecos del límite"""
+    while limit.try_acquire():
+        pass
+
+
+class TestAdaptiveConcurrencyLimit:
+    """Tests para el límite AIMD guiado por latencia"""
+
+    def test_rejects_invalid_configuration(self):
+        """Verifica que los parámetros se validan"""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimit(8, initial=1, min_limit=2)
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimit(4, initial=8)
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimit(8, backoff=1.0)
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimit(8, tolerance=1.0)
+
+    def test_initial_defaults_to_max_limit(self):
+        """Verifica que sin límite inicial se parte del máximo"""
+        assert AdaptiveConcurrencyLimit(4).limit == 4
+
+    def test_try_acquire_rejects_at_limit(self):
+        """Verifica que se admite hasta el límite y se cuentan los rechazos"""
+        limit = AdaptiveConcurrencyLimit(initial=2, min_limit=1, max_limit=4)
+
+        assert limit.try_acquire() and limit.try_acquire()
+        assert limit.try_acquire() is False
+
+        limit.release()
+        assert limit.try_acquire() is True
+        stats = limit.get_statistics()
+        assert stats['in_flight'] == 2
+        assert stats['rejected'] == 1
+
+    def test_grows_while_busy_and_latency_is_stable(self):
+        """Verifica que el límite crece ~1 por ventana con la API ocupada"""
+        limit = AdaptiveConcurrencyLimit(initial=4, min_limit=1, max_limit=6)
+        _fill(limit)
+
+        for _ in range(40):
+            limit.record(0.1, ok=True)
+
+        assert limit.limit == 6
+
+    def test_does_not_grow_when_idle(self):
+        """Verifica que sin uso el límite no crece"""
+        limit = AdaptiveConcurrencyLimit(initial=4, min_limit=1, max_limit=64)
+
+        for _ in range(40):
+            limit.record(0.1, ok=True)
+
+        assert limit.limit == 4
+
+    def test_error_decreases_once_per_window(self):
+        """Verifica la reducción multiplicativa y la espera de una ventana"""
+        limit = AdaptiveConcurrencyLimit(initial=20, min_limit=2, max_limit=64, backoff=0.5)
+
+        limit.record(0.1, ok=False)
+        limit.record(0.1, ok=False)
+        assert limit.limit == 10
+
+        for _ in range(10):
+            limit.record(0.1, ok=False)
+        assert limit.limit == 5
+
+        for _ in range(50):
+            limit.record(0.1, ok=False)
+        assert limit.limit == 2
+
+    def test_latency_spike_decreases_limit(self):
+        """Verifica que una subida sostenida de latencia reduce el límite"""
+        limit = AdaptiveConcurrencyLimit(initial=16, min_limit=1, max_limit=64, tolerance=2.0)
+        for _ in range(20):
+            limit.record(0.1, ok=True)
+        assert limit.limit == 16
+
+        for _ in range(10):
+            limit.record(1.0, ok=True)
+
+        stats = limit.get_statistics()
+        assert stats['limit'] < 16
+        assert stats['latency_recent'] > 2 * stats['latency_baseline']
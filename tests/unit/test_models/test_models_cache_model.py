@@ -0,0 +1,94 @@
+"""
+Tests unitarios para ModelsCacheModel
+
+Valida la frescura por TTL, la ventana stale-while-revalidate, la
+invalidación y la evaluación de ETags.
+"""
+
+import pytest
+
+from src.models.models_cache_model import ModelsCacheModel
+
+
+class _FakeClock:
+    """Reloj manual para controlar el TTL"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Reloj manual"""
+    return _FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    """Caché con TTL de 10s y ventana stale de 20s"""
+    return ModelsCacheModel(ttl=10, stale_ttl=20, clock=clock)
+
+
+class TestModelsCacheLookup:
+    """Tests para lookup y store"""
+
+    def test_empty_cache_misses(self, cache):
+        """Verifica que sin entrada no hay acierto"""
+        assert cache.lookup() == (None, False)
+
+    def test_fresh_entry_is_served_without_refresh(self, cache, clock):
+        """Verifica que dentro del TTL no se pide refresco"""
+        stored = cache.store('{"data": []}')
+        clock.now += 5
+
+        assert cache.lookup() == (stored, False)
+
+    def test_stale_entry_requests_single_refresh(self, cache, clock):
+        """Verifica stale-while-revalidate con un único refresco a la vez"""
+        stored = cache.store('{"data": []}')
+        clock.now += 15
+
+        assert cache.lookup() == (stored, True)
+        assert cache.lookup() == (stored, False)
+
+        cache.finish_refresh()
+        assert cache.lookup() == (stored, True)
+
+    def test_entry_past_stale_window_misses(self, cache, clock):
+        """Verifica que tras la ventana stale la entrada no se sirve"""
+        cache.store('{"data": []}')
+        clock.now += 31
+
+        assert cache.lookup() == (None, False)
+
+    def test_invalidate_discards_entry(self, cache):
+        """Verifica que invalidate descarta la entrada"""
+        cache.store('{"data": []}')
+        cache.invalidate()
+
+        assert cache.lookup() == (None, False)
+
+    def test_etag_depends_on_body(self, cache):
+        """Verifica que el ETag cambia con el contenido"""
+        first = cache.store('{"data": []}')
+        second = cache.store('{"data": [1]}')
+
+        assert first.etag != second.etag
+        assert cache.store('{"data": []}').etag == first.etag
+
+
+class TestEtagMatches:
+    """Tests para la evaluación de If-None-Match"""
+
+    @pytest.mark.parametrize("header", ['"abc"', 'W/"abc"', '"x", "abc"', '*'])
+    def test_matching_headers(self, header):
+        """Verifica formatos de If-None-Match que coinciden"""
+        assert ModelsCacheModel.etag_matches(header, "abc") is True
+
+    @pytest.mark.parametrize("header", [None, "", '"abd"'])
+    def test_non_matching_headers(self, header):
+        """Verifica que otros ETags o la ausencia del header no coinciden"""
+        assert ModelsCacheModel.etag_matches(header, "abc") is False
@@ -235,3 +235,46 @@ class TestProxyModelThreadSafety:
         
         # 10 threads × 100 incrementos = 1000 total
         assert proxy_model.get_total_requests() == 1000
+
+
+class TestProxyModelConnectionPool:
+    """Tests para contadores del pool de conexiones"""
+
+    def test_record_connection_checkout(self):
+        """Verifica que se registran aciertos y fallos del pool"""
+        proxy_model = ProxyModel()
+        
+        proxy_model.record_connection_checkout(reused=False)
+        proxy_model.record_connection_checkout(reused=True)
+        proxy_model.record_connection_checkout(reused=True)
+        
+        stats = proxy_model.get_statistics()
+        assert stats['pool_hits'] == 2
+        assert stats['pool_misses'] == 1
+        
+        proxy_model.reset_statistics()
+        assert proxy_model.get_statistics()['pool_hits'] == 0
+
+
+class TestProxyModelSharedStatistics:
+    """Tests para contadores en memoria compartida"""
+
+    def test_use_shared_memory_keeps_existing_counters(self):
+        """Verifica que los contadores previos se conservan al migrar"""
+        proxy_model = ProxyModel()
+        proxy_model.increment_request_counter()
+        proxy_model.update_last_request_time()
+        last_request = proxy_model.get_last_request_time()
+        
+        proxy_model.use_shared_memory(slots=3)
+        try:
+            proxy_model.bind_stats_slot(2)
+            proxy_model.increment_request_counter()
+            
+            assert proxy_model.get_total_requests() == 2
+            assert proxy_model.get_last_request_time() == last_request
+        finally:
+            proxy_model.close()
+        
+        # Tras liberar el bloque los totales siguen disponibles
+        assert proxy_model.get_total_requests() == 2
@@ -0,0 +1,145 @@
+"""
+Tests unitarios para ResponseCacheModel
+
+Valida la elegibilidad de solicitudes, la clave canónica y los límites
+de la caché (entradas, bytes, TTL) con expulsión LRU.
+"""
+
+import pytest
+
+from src.models.response_cache_model import ResponseCacheModel
+
+
+class _FakeClock:
+    """Reloj manual para controlar el TTL"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _request(**extra):
+    """Solicitud determinista de ejemplo"""
+    data = {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": "Hi"}],
+        "temperature": 0
+    }
+    data.update(extra)
+    return data
+
+
+class TestResponseCacheEligibility:
+    """Tests para is_cacheable y make_key"""
+
+    def test_deterministic_request_is_cacheable(self):
+        """Verifica que temperature 0 sin streaming es elegible"""
+        cache = ResponseCacheModel()
+
+        assert cache.is_cacheable(_request()) is True
+        assert cache.is_cacheable(_request(temperature=0.0, n=1)) is True
+
+    @pytest.mark.parametrize("extra", [
+        {"temperature": 0.7},
+        {"temperature": None},
+        {"temperature": False},
+        {"stream": True},
+        {"n": 3},
+    ])
+    def test_non_deterministic_requests_are_not_cacheable(self, extra):
+        """Verifica que streaming, muestreo o varias opciones no son elegibles"""
+        cache = ResponseCacheModel()
+
+        assert cache.is_cacheable(_request(**extra)) is False
+
+    def test_missing_temperature_is_not_cacheable(self):
+        """Verifica que sin temperature (por defecto 1) no es elegible"""
+        data = _request()
+        del data["temperature"]
+
+        assert ResponseCacheModel().is_cacheable(data) is False
+
+    def test_key_ignores_field_order_and_user(self):
+        """Verifica que la clave es canónica"""
+        cache = ResponseCacheModel()
+        first = {"temperature": 0, "model": "gpt-4o", "messages": [{"content": "Hi", "role": "user"}]}
+
+        assert cache.make_key(first) == cache.make_key(_request(user="ci-bot"))
+
+    def test_key_depends_on_sampling_params(self):
+        """Verifica que los parámetros de muestreo cambian la clave"""
+        cache = ResponseCacheModel()
+
+        assert cache.make_key(_request()) != cache.make_key(_request(max_tokens=10))
+        assert cache.make_key(_request()) != cache.make_key(_request(model="o1"))
+
+
+class TestResponseCacheStorage:
+    """Tests para get/put y los límites de la caché"""
+
+    def test_hit_and_miss_counters(self):
+        """Verifica aciertos y fallos"""
+        cache = ResponseCacheModel()
+
+        assert cache.get("k") is None
+        cache.put("k", b"{}", "application/json")
+        cached = cache.get("k")
+
+        assert cached.body == b"{}"
+        assert cached.content_type == "application/json"
+        stats = cache.get_statistics()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["bytes"] == 2
+
+    def test_entry_limit_evicts_least_recently_used(self):
+        """Verifica la expulsión LRU por número de entradas"""
+        cache = ResponseCacheModel(max_entries=2)
+        cache.put("a", b"1", "application/json")
+        cache.put("b", b"2", "application/json")
+        cache.get("a")
+
+        evicted = cache.put("c", b"3", "application/json")
+
+        assert evicted == 1
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_statistics()["evictions"] == 1
+
+    def test_byte_limit_evicts_until_it_fits(self):
+        """Verifica la expulsión por tamaño total"""
+        cache = ResponseCacheModel(max_bytes=10)
+        cache.put("a", b"xxxx", "application/json")
+        cache.put("b", b"yyyy", "application/json")
+
+        evicted = cache.put("c", b"zzzzzzzz", "application/json")
+
+        assert evicted == 2
+        assert cache.get_statistics()["bytes"] == 8
+
+    def test_oversized_body_is_not_stored(self):
+        """Verifica que un cuerpo mayor que el límite no se guarda"""
+        cache = ResponseCacheModel(max_bytes=4)
+
+        assert cache.put("a", b"too large", "application/json") == 0
+        assert cache.get_statistics()["entries"] == 0
+
+    def test_entries_expire_after_ttl(self):
+        """Verifica que las entradas caducan tras el TTL"""
+        clock = _FakeClock()
+        cache = ResponseCacheModel(ttl=10, clock=clock)
+        cache.put("a", b"{}", "application/json")
+
+        clock.now += 9
+        assert cache.get("a") is not None
+        clock.now += 2
+        assert cache.get("a") is None
+        assert cache.get_statistics()["entries"] == 0
+
+    def test_invalid_limits_raise(self):
+        """Verifica que los límites deben ser positivos"""
+        with pytest.raises(ValueError):
+            ResponseCacheModel(max_entries=0)
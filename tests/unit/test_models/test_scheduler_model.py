@@ -0,0 +1,249 @@
+"""
+Tests unitarios para las políticas de selección de cuentas
+
+Valida el orden de selección de cada política, la retirada y recuperación de
+cuentas, la compactación de heaps y la fábrica create_scheduler.
+"""
+
+import pytest
+
+from src.models.scheduler_model import (
+    AccountScheduler,
+    FirstFitScheduler,
+    LeastRecentlyUsedScheduler,
+    QuotaWeightedScheduler,
+    RoundRobinScheduler,
+    create_scheduler
+)
+
+
+ALL_SCHEDULERS = (
+    FirstFitScheduler,
+    RoundRobinScheduler,
+    LeastRecentlyUsedScheduler,
+    QuotaWeightedScheduler
+)
+
+
+@pytest.mark.parametrize("scheduler_class", ALL_SCHEDULERS)
+class TestSchedulerCommon:
+    """Comportamiento compartido por todas las políticas"""
+
+    def test_empty_scheduler_selects_none(self, scheduler_class):
+        """Verifica que sin cuentas no se elige ninguna"""
+        assert scheduler_class().select() is None
+
+    def test_unavailable_accounts_are_never_selected(self, scheduler_class):
+        """Verifica que una cuenta retirada no vuelve a elegirse"""
+        scheduler = scheduler_class()
+        scheduler.set_available("a", 10)
+        scheduler.set_available("b", 10)
+        scheduler.set_unavailable("a")
+
+        assert {scheduler.select() for _ in range(5)} == {"b"}
+
+        scheduler.set_unavailable("b")
+        assert scheduler.select() is None
+
+    def test_restored_account_is_selectable_again(self, scheduler_class):
+        """Verifica que una cuenta recuperada vuelve a la selección"""
+        scheduler = scheduler_class()
+        scheduler.set_available("a", 10)
+        scheduler.set_unavailable("a")
+        scheduler.set_available("a", 10)
+
+        assert scheduler.select() == "a"
+
+    def test_set_unavailable_unknown_token_is_ignored(self, scheduler_class):
+        """Verifica que retirar una cuenta desconocida no falla"""
+        scheduler = scheduler_class()
+        scheduler.set_unavailable("missing")
+
+        assert scheduler.select() is None
+
+    def test_peek_does_not_advance_selection(self, scheduler_class):
+        """Verifica que peek anticipa select sin consumir el turno"""
+        scheduler = scheduler_class()
+        assert scheduler.peek() is None
+        scheduler.set_available("a", 10)
+        scheduler.set_available("b", 10)
+
+        for _ in range(3):
+            token = scheduler.peek()
+            assert scheduler.peek() == token
+            assert scheduler.select() == token
+
+
+class TestFirstFitScheduler:
+    """Tests para la política first_fit"""
+
+    def test_selects_first_available_in_insertion_order(self):
+        """Verifica que se elige siempre la primera cuenta disponible"""
+        scheduler = FirstFitScheduler()
+        for token in ("a", "b", "c"):
+            scheduler.set_available(token, 10)
+
+        assert scheduler.select() == "a"
+        assert scheduler.select() == "a"
+
+        scheduler.set_unavailable("a")
+        assert scheduler.select() == "b"
+
+    def test_restored_account_keeps_original_position(self):
+        """Verifica que una cuenta recuperada conserva su orden de alta"""
+        scheduler = FirstFitScheduler()
+        for token in ("a", "b"):
+            scheduler.set_available(token, 10)
+        scheduler.set_unavailable("a")
+        assert scheduler.select() == "b"
+
+        scheduler.set_available("a", 5)
+        assert scheduler.select() == "a"
+
+
+class TestRoundRobinScheduler:
+    """Tests para la política round_robin"""
+
+    def test_rotates_between_available_accounts(self):
+        """Verifica que las cuentas se eligen por turnos"""
+        scheduler = RoundRobinScheduler()
+        for token in ("a", "b", "c"):
+            scheduler.set_available(token, 10)
+
+        assert [scheduler.select() for _ in range(6)] == ["a", "b", "c", "a", "b", "c"]
+
+    def test_skips_accounts_exhausted_mid_rotation(self):
+        """Verifica que una cuenta agotada se salta en la rotación"""
+        scheduler = RoundRobinScheduler()
+        for token in ("a", "b", "c"):
+            scheduler.set_available(token, 10)
+        scheduler.select()
+        scheduler.set_unavailable("b")
+
+        assert [scheduler.select() for _ in range(3)] == ["c", "a", "c"]
+
+    def test_quota_updates_do_not_duplicate_account(self):
+        """Verifica que actualizar la cuota no añade turnos extra"""
+        scheduler = RoundRobinScheduler()
+        scheduler.set_available("a", 10)
+        scheduler.set_available("b", 10)
+        scheduler.set_available("a", 5)
+
+        assert [scheduler.select() for _ in range(4)] == ["a", "b", "a", "b"]
+
+
+class TestLeastRecentlyUsedScheduler:
+    """Tests para la política lru"""
+
+    def test_selects_least_recently_used_account(self):
+        """Verifica que se elige la cuenta usada hace más tiempo"""
+        scheduler = LeastRecentlyUsedScheduler()
+        for token in ("a", "b"):
+            scheduler.set_available(token, 10)
+
+        first = scheduler.select()
+        second = scheduler.select()
+
+        assert {first, second} == {"a", "b"}
+        assert scheduler.select() == first
+
+    def test_new_account_is_selected_first(self):
+        """Verifica que una cuenta nueva (nunca usada) se elige antes"""
+        scheduler = LeastRecentlyUsedScheduler()
+        scheduler.set_available("a", 10)
+        scheduler.select()
+        scheduler.set_available("b", 10)
+
+        assert scheduler.select() == "b"
+
+
+class TestQuotaWeightedScheduler:
+    """Tests para la política quota"""
+
+    def test_selects_account_with_highest_quota(self):
+        """Verifica que se elige la cuenta con más cuota restante"""
+        scheduler = QuotaWeightedScheduler()
+        scheduler.set_available("a", 10)
+        scheduler.set_available("b", 50)
+        scheduler.set_available("c", 30)
+
+        assert scheduler.select() == "b"
+
+    def test_quota_update_changes_selection(self):
+        """Verifica que una actualización de cuota reordena la selección"""
+        scheduler = QuotaWeightedScheduler()
+        scheduler.set_available("a", 10)
+        scheduler.set_available("b", 50)
+
+        scheduler.set_available("b", 5)
+
+        assert scheduler.select() == "a"
+
+    def test_ties_prefer_earlier_update(self):
+        """Verifica que a igual cuota se elige la registrada antes"""
+        scheduler = QuotaWeightedScheduler()
+        scheduler.set_available("a", 10)
+        scheduler.set_available("b", 10)
+
+        assert scheduler.select() == "a"
+
+    def test_heap_is_compacted_after_many_updates(self):
+        """Verifica que las entradas obsoletas no crecen sin límite"""
+        scheduler = QuotaWeightedScheduler()
+        scheduler.set_available("a", 0)
+        for quota in range(1, 1000):
+            scheduler.set_available("a", quota)
+
+        assert len(scheduler._heap) <= 64
+        assert scheduler.select() == "a"
+
+
+@pytest.mark.parametrize("scheduler_class", (FirstFitScheduler, QuotaWeightedScheduler))
+class TestHeapSchedulers:
+    """Invalidación perezosa de las políticas basadas en heap"""
+
+    def test_failover_churn_does_not_grow_heap(self, scheduler_class):
+        """Verifica que retirar y recuperar una cuenta no acumula entradas duplicadas"""
+        scheduler = scheduler_class()
+        tokens = [f"t{i}" for i in range(100)]
+        for token in tokens:
+            scheduler.set_available(token, 10)
+
+        for _ in range(10000):
+            scheduler.set_unavailable("t50")
+            scheduler.set_available("t50", 10)
+
+        assert len(scheduler._heap) <= 2 * len(tokens) + 1
+        assert scheduler.select() == "t0"
+
+
+class TestCreateScheduler:
+    """Tests para la fábrica de políticas"""
+
+    @pytest.mark.parametrize("name, scheduler_class", [
+        ("first_fit", FirstFitScheduler),
+        ("round_robin", RoundRobinScheduler),
+        ("lru", LeastRecentlyUsedScheduler),
+        ("quota", QuotaWeightedScheduler),
+    ])
+    def test_creates_named_scheduler(self, name, scheduler_class):
+        """Verifica que cada nombre crea su política"""
+        assert isinstance(create_scheduler(name), scheduler_class)
+
+    def test_default_is_first_fit(self):
+        """Verifica que la política por defecto conserva el orden histórico"""
+        assert isinstance(create_scheduler(), FirstFitScheduler)
+
+    def test_unknown_scheduler_raises_error(self):
+        """Verifica que un nombre desconocido genera error"""
+        with pytest.raises(ValueError):
+            create_scheduler("random")
+
+    def test_incomplete_policy_cannot_be_created(self):
+        """Verifica que una política sin todos los métodos falla al crearse"""
+        class SelectOnly(AccountScheduler):
+            def select(self):
+                return None
+
+        with pytest.raises(TypeError):
+            SelectOnly()
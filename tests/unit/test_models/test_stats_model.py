@@ -0,0 +1,163 @@
+"""
+Tests unitarios para los backends de estadísticas
+
+Valida la agregación de contadores locales y en memoria compartida,
+incluyendo escrituras desde un proceso hijo real.
+"""
+
+import multiprocessing
+import threading
+
+import pytest
+
+from src.models.stats_model import LocalStatsBackend, SharedMemoryStatsBackend
+
+
+FIELDS = ('requests', 'errors', 'last_seen')
+MAX_FIELDS = ('last_seen',)
+
+
+def _run_threads(backend, threads, count):
+    """Escribe contadores desde varios hilos y espera a que terminen"""
+    def write(index):
+        for _ in range(count):
+            backend.add('requests')
+        backend.set_max('last_seen', index)
+
+    workers = [threading.Thread(target=write, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def _child_writes(backend, slot, count):
+    """Escribe contadores desde un proceso hijo en su propio slot"""
+    backend.bind_slot(slot)
+    for _ in range(count):
+        backend.add('requests')
+    backend.set_max('last_seen', 1000 + slot)
+
+
+class TestLocalStatsBackend:
+    """Tests para el backend local"""
+
+    def test_add_and_snapshot(self):
+        """Verifica que suma contadores y conserva el máximo"""
+        backend = LocalStatsBackend(FIELDS, MAX_FIELDS)
+
+        backend.add('requests')
+        backend.add('requests', 2)
+        backend.set_max('last_seen', 50)
+        backend.set_max('last_seen', 10)
+
+        assert backend.snapshot() == {'requests': 3, 'errors': 0, 'last_seen': 50}
+
+    def test_reset(self):
+        """Verifica que reset pone los contadores a cero"""
+        backend = LocalStatsBackend(FIELDS, MAX_FIELDS)
+        backend.add('errors')
+
+        backend.reset()
+
+        assert backend.snapshot()['errors'] == 0
+
+    def test_merges_per_thread_cells(self):
+        """Verifica que las celdas de cada hilo se agregan sin perder incrementos"""
+        backend = LocalStatsBackend(FIELDS, MAX_FIELDS)
+        backend.add('requests')
+
+        _run_threads(backend, threads=8, count=1000)
+
+        assert backend.snapshot() == {'requests': 8001, 'errors': 0, 'last_seen': 7}
+
+    def test_finished_threads_are_retired(self):
+        """Verifica que las celdas de hilos terminados no se acumulan"""
+        backend = LocalStatsBackend(FIELDS, MAX_FIELDS)
+
+        for _ in range(3):
+            _run_threads(backend, threads=4, count=10)
+            assert backend.snapshot()['requests'] > 0
+
+        assert len(backend._cells) == 0
+        assert backend.snapshot()['requests'] == 120
+
+    def test_reset_clears_thread_cells(self):
+        """Verifica que reset pone a cero también las celdas de otros hilos"""
+        backend = LocalStatsBackend(FIELDS, MAX_FIELDS)
+        backend.add('requests', 5)
+        _run_threads(backend, threads=2, count=10)
+
+        backend.reset()
+
+        assert backend.snapshot() == {'requests': 0, 'errors': 0, 'last_seen': 0}
+
+
+class TestSharedMemoryStatsBackend:
+    """Tests para el backend en memoria compartida"""
+
+    def test_aggregates_slots(self):
+        """Verifica que la lectura suma slots y toma el máximo de timestamps"""
+        backend = SharedMemoryStatsBackend(FIELDS, slots=3, max_fields=MAX_FIELDS)
+        try:
+            backend.add('requests', 2)
+            backend.set_max('last_seen', 5)
+            backend.bind_slot(2)
+            backend.add('requests', 3)
+            backend.set_max('last_seen', 7)
+
+            snapshot = backend.snapshot()
+            assert snapshot['requests'] == 5
+            assert snapshot['last_seen'] == 7
+        finally:
+            backend.close()
+
+    def test_aggregates_thread_stripes(self):
+        """Verifica que los hilos repartidos en franjas se agregan correctamente"""
+        backend = SharedMemoryStatsBackend(FIELDS, slots=2, max_fields=MAX_FIELDS, stripes=4)
+        try:
+            _run_threads(backend, threads=16, count=500)
+
+            snapshot = backend.snapshot()
+            assert snapshot['requests'] == 8000
+            assert snapshot['last_seen'] == 15
+        finally:
+            backend.close()
+
+    def test_rejects_invalid_stripes(self):
+        """Verifica que un número de franjas no positivo genera error"""
+        with pytest.raises(ValueError):
+            SharedMemoryStatsBackend(FIELDS, slots=1, stripes=0)
+
+    def test_rejects_out_of_range_slot(self):
+        """Verifica que un slot inexistente genera error"""
+        backend = SharedMemoryStatsBackend(FIELDS, slots=2)
+        try:
+            with pytest.raises(ValueError):
+                backend.bind_slot(2)
+        finally:
+            backend.close()
+
+    @pytest.mark.skipif(
+        'fork' not in multiprocessing.get_all_start_methods(),
+        reason="Requiere el método de inicio fork"
+    )
+    def test_parent_sees_child_process_counters(self):
+        """Verifica que el proceso padre lee lo escrito por los workers"""
+        backend = SharedMemoryStatsBackend(FIELDS, slots=3, max_fields=MAX_FIELDS)
+        try:
+            context = multiprocessing.get_context('fork')
+            workers = [
+                context.Process(target=_child_writes, args=(backend, slot, 10 * slot))
+                for slot in (1, 2)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(timeout=10)
+
+            snapshot = backend.snapshot()
+            assert snapshot['requests'] == 30
+            assert snapshot['last_seen'] == 1002
+        finally:
+            backend.close()
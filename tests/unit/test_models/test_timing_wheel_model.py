@@ -0,0 +1,82 @@
+"""
+Tests unitarios para TimingWheel
+
+Valida el vencimiento en el tick correcto en todos los niveles, la
+cancelación, la reprogramación y los vencimientos fuera de alcance.
+"""
+
+import random
+
+import pytest
+
+from src.models.timing_wheel_model import TimingWheel
+
+
+class TestTimingWheel:
+    """Tests para la rueda de temporización jerárquica"""
+
+    def test_rejects_invalid_configuration(self):
+        """Verifica que la configuración se valida"""
+        with pytest.raises(ValueError):
+            TimingWheel(tick=0)
+        with pytest.raises(ValueError):
+            TimingWheel(slots=1)
+
+    def test_key_expires_at_its_deadline(self):
+        """Verifica que una clave no vence antes de tiempo y sí al llegar"""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2, start=0)
+        wheel.schedule("a", 3)
+
+        assert wheel.advance(2.5) == []
+        assert wheel.advance(3) == ["a"]
+        assert len(wheel) == 0
+
+    def test_deadlines_across_levels_expire_in_order(self):
+        """Verifica vencimientos exactos a través de cascadas entre niveles"""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=3, start=0)
+        deadlines = {f"k{i}": i for i in range(1, 64)}
+        keys = list(deadlines)
+        random.Random(7).shuffle(keys)
+        for key in keys:
+            wheel.schedule(key, deadlines[key])
+
+        for now in range(1, 64):
+            assert wheel.advance(now) == [f"k{now}"]
+
+    def test_deadline_beyond_range_waits_and_expires(self):
+        """Verifica que un vencimiento más allá del alcance total se respeta"""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2, start=0)
+        wheel.schedule("far", 100)
+
+        assert wheel.advance(99) == []
+        assert wheel.advance(100) == ["far"]
+
+    def test_cancel_and_reschedule(self):
+        """Verifica que cancelar y reprogramar sustituyen el vencimiento"""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2, start=0)
+        wheel.schedule("a", 2)
+        wheel.schedule("b", 2)
+        wheel.schedule("a", 10)
+
+        assert wheel.cancel("b") is True
+        assert wheel.cancel("b") is False
+        assert wheel.deadline("a") == 10
+        assert wheel.advance(5) == []
+        assert wheel.advance(10) == ["a"]
+
+    def test_past_deadline_expires_on_next_tick(self):
+        """Verifica que un vencimiento ya pasado vence en el siguiente tick"""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2, start=50)
+        wheel.schedule("late", 10)
+
+        assert "late" in wheel
+        assert wheel.advance(51) == ["late"]
+
+    def test_idle_wheel_jumps_to_now(self):
+        """Verifica que una rueda vacía avanza sin recorrer los ticks"""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2, start=0)
+
+        assert wheel.advance(10 ** 9) == []
+
+        wheel.schedule("a", 10 ** 9 + 2)
+        assert wheel.advance(10 ** 9 + 2) == ["a"]
@@ -0,0 +1,232 @@
+"""
+Tests unitarios para CoalescingService
+
+Valida que las solicitudes idénticas concurrentes compartan una sola
+llamada, tanto con hilos como dentro del event loop.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services.coalescing_service import CoalescingService
+
+
+def _wait_until(predicate, timeout=5.0):
+    """Espera activa hasta que se cumpla la condición"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timeout esperando la condición")
+        time.sleep(0.005)
+
+
+class TestCoalescingServiceThreads:
+    """Tests para run() con hilos concurrentes"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Verifica que los seguidores reciben el resultado del líder"""
+        waiting = []
+        service = CoalescingService(on_wait=waiting.append)
+        release = threading.Event()
+        calls = []
+
+        def upstream():
+            calls.append(1)
+            release.wait(5)
+            return b"result"
+
+        results = []
+
+        def worker():
+            results.append(service.run("key", upstream))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        _wait_until(lambda: waiting.count(1) == 3)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert sorted(results, key=lambda r: r[1]) == [(b"result", False)] + [(b"result", True)] * 3
+        assert sum(waiting) == 0
+
+    def test_leader_error_propagates_to_followers(self):
+        """Verifica que la excepción del líder llega a todas las esperas"""
+        waiting = []
+        service = CoalescingService(on_wait=waiting.append)
+        release = threading.Event()
+        errors = []
+
+        def upstream():
+            release.wait(5)
+            raise ValueError("upstream failed")
+
+        def worker():
+            try:
+                service.run("key", upstream)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        _wait_until(lambda: waiting.count(1) == 2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert errors == ["upstream failed"] * 3
+
+    def test_followers_get_their_own_error_copy(self):
+        """Verifica que cada espera recibe una copia de la excepción del líder"""
+        waiting = []
+        service = CoalescingService(on_wait=waiting.append)
+        release = threading.Event()
+        errors = []
+
+        def upstream():
+            release.wait(5)
+            raise ValueError("upstream failed")
+
+        def worker():
+            try:
+                service.run("key", upstream)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        _wait_until(lambda: waiting.count(1) == 2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len({id(error) for error in errors}) == 3
+        leader = next(error for error in errors if error.__cause__ is None)
+        assert all(error.__cause__ is leader for error in errors if error is not leader)
+
+    def test_slow_leader_lets_followers_call_themselves(self):
+        """Verifica que una espera que vence hace su propia llamada"""
+        service = CoalescingService(wait_timeout=0.05)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return b"leader"
+
+        thread = threading.Thread(target=lambda: service.run("key", slow))
+        thread.start()
+        started.wait(5)
+        try:
+            assert service.run("key", lambda: b"own") == (b"own", False)
+        finally:
+            release.set()
+            thread.join(5)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Verifica que la clave se libera al terminar la llamada"""
+        service = CoalescingService()
+
+        assert service.run("key", lambda: 1) == (1, False)
+        assert service.run("key", lambda: 2) == (2, False)
+
+    def test_key_is_canonical(self):
+        """Verifica que el orden de los campos no cambia la clave"""
+        service = CoalescingService()
+
+        assert service.make_key({"a": 1, "b": [1]}) == service.make_key({"b": [1], "a": 1})
+
+
+class TestCoalescingServiceAsync:
+    """Tests para run_async() dentro del event loop"""
+
+    def test_concurrent_coroutines_share_one_execution(self):
+        """Verifica la coalescencia entre corrutinas"""
+        service = CoalescingService()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return b"result"
+
+        async def main():
+            return await asyncio.gather(*(service.run_async("key", upstream) for _ in range(3)))
+
+        results = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert [coalesced for _, coalesced in results] == [False, True, True]
+
+    def test_async_error_propagates(self):
+        """Verifica que la excepción del líder llega a las esperas"""
+        service = CoalescingService()
+
+        async def upstream():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(
+                *(service.run_async("key", upstream) for _ in range(2)),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(main())
+
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            asyncio.run(service.run_async("key", upstream))
+
+    def test_leader_cancellation_does_not_cancel_followers(self):
+        """Verifica que si se cancela el líder sus esperas reciben el resultado"""
+        service = CoalescingService()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"result"
+
+        async def main():
+            leader = asyncio.ensure_future(service.run_async("key", upstream))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(service.run_async("key", upstream))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            await asyncio.gather(leader, return_exceptions=True)
+            return leader.cancelled(), await follower
+
+        cancelled, result = asyncio.run(main())
+
+        assert cancelled
+        assert result == (b"result", True)
+        assert len(calls) == 1
+
+    def test_cancelled_leader_without_followers_stops_the_call(self):
+        """Verifica que la llamada se cancela si nadie más la espera"""
+        service = CoalescingService()
+        finished = []
+
+        async def upstream():
+            await asyncio.sleep(5)
+            finished.append(1)
+
+        async def main():
+            leader = asyncio.ensure_future(service.run_async("key", upstream))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            await asyncio.gather(leader, return_exceptions=True)
+            await asyncio.sleep(0)
+            return service._async_flights
+
+        assert asyncio.run(main()) == {}
+        assert finished == []
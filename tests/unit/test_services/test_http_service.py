@@ -0,0 +1,80 @@
+"""
+Tests unitarios para HttpService
+
+Valida la reutilización de conexiones keep-alive del pool compartido
+y los contadores de aciertos/fallos reportados.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.services.http_service import HttpService
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 mínimo que mantiene la conexión abierta"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Servidor HTTP local con keep-alive"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpServicePool:
+    """Tests para el pool de conexiones keep-alive"""
+
+    def test_reuses_connection_between_requests(self, local_server):
+        """Verifica que la segunda solicitud reutiliza la conexión"""
+        service = HttpService(pool_maxsize=2)
+
+        service.get(f"{local_server}/models")
+        service.get(f"{local_server}/models")
+
+        stats = service.get_pool_statistics()
+        assert stats['pool_misses'] == 1
+        assert stats['pool_hits'] == 1
+        assert stats['pool_maxsize'] == 2
+        service.close()
+
+    def test_notifies_checkout_callback(self, local_server):
+        """Verifica que el callback recibe cada conexión entregada"""
+        checkouts = []
+        service = HttpService(on_checkout=checkouts.append)
+
+        for _ in range(3):
+            service.get(f"{local_server}/models")
+
+        assert checkouts == [False, True, True]
+        service.close()
+
+    def test_applies_default_timeout(self):
+        """Verifica que se aplica REQUEST_TIMEOUT si no se indica timeout"""
+        from src.models.config_model import REQUEST_TIMEOUT
+
+        service = HttpService()
+        with patch.object(service._session, 'post') as mock_post:
+            service.post("https://example.invalid/chat", json={})
+
+        assert mock_post.call_args[1]['timeout'] == REQUEST_TIMEOUT
@@ -0,0 +1,109 @@
+"""
+Tests unitarios para el servicio JSON
+
+Valida que ambos codecs sean intercambiables (formato compacto, errores
+compatibles) y que el proveedor de Flask serialice con el codec elegido.
+"""
+
+import decimal
+
+import pytest
+from flask import Flask, jsonify
+
+from src.services import json_service
+from src.services.json_service import (
+    CodecJSONProvider,
+    JsonCodec,
+    OrjsonCodec,
+    StdlibCodec,
+    get_codec
+)
+
+CODECS = [StdlibCodec]
+if json_service.orjson is not None:
+    CODECS.append(OrjsonCodec)
+
+
+@pytest.fixture(params=CODECS, ids=lambda cls: cls.name)
+def codec(request):
+    """Instancia de cada codec disponible"""
+    return request.param()
+
+
+class TestJsonCodecs:
+    """Tests comunes a todos los codecs"""
+
+    def test_round_trip(self, codec):
+        """Test: loads(dumps(x)) devuelve el objeto original"""
+        payload = {"model": "gpt-4o", "messages": [{"role": "user", "content": "Hola ñ €"}]}
+
+        assert codec.loads(codec.dumps(payload)) == payload
+
+    def test_dumps_is_compact_utf8(self, codec):
+        """Test: La salida son bytes sin espacios ni escapes ASCII"""
+        encoded = codec.dumps({"a": [1, 2], "b": "ñ"})
+
+        assert encoded == '{"a":[1,2],"b":"ñ"}'.encode("utf-8")
+
+    def test_loads_accepts_str_and_bytes(self, codec):
+        """Test: Se aceptan documentos str y bytes"""
+        assert codec.loads('{"a": 1}') == codec.loads(b'{"a": 1}') == {"a": 1}
+
+    def test_invalid_document_raises_value_error(self, codec):
+        """Test: JSON inválido lanza ValueError"""
+        with pytest.raises(ValueError):
+            codec.loads(b'{"a":')
+
+    def test_unserializable_raises_type_error(self, codec):
+        """Test: Objetos no serializables lanzan TypeError"""
+        with pytest.raises(TypeError):
+            codec.dumps({"a": object()})
+
+    def test_default_hook(self, codec):
+        """Test: La función default serializa tipos no soportados"""
+        assert codec.dumps({"a": {1, 2}}, default=sorted) == b'{"a":[1,2]}'
+
+
+class TestGetCodec:
+    """Tests para la selección del codec"""
+
+    def test_auto_prefers_orjson(self):
+        """Test: "auto" usa orjson si está instalado"""
+        expected = "orjson" if json_service.orjson is not None else "json"
+
+        assert get_codec("auto").name == expected
+
+    def test_json_forces_stdlib(self):
+        """Test: "json" usa siempre el módulo estándar"""
+        assert isinstance(get_codec("json"), StdlibCodec)
+
+    def test_unknown_codec_raises(self):
+        """Test: Un codec desconocido lanza ValueError"""
+        with pytest.raises(ValueError):
+            get_codec("ujson")
+
+    def test_incomplete_codec_cannot_be_created(self):
+        """Test: Un codec sin dumps falla al crearse, no al serializar"""
+        class LoadsOnly(JsonCodec):
+            def loads(self, data):
+                return None
+
+        with pytest.raises(TypeError):
+            LoadsOnly()
+
+
+class TestCodecJSONProvider:
+    """Tests para el proveedor JSON de Flask"""
+
+    def test_jsonify_uses_codec(self, codec):
+        """Test: jsonify serializa con el codec y el default de Flask"""
+        app = Flask(__name__)
+        provider = CodecJSONProvider(app)
+        provider.codec = codec
+        app.json = provider
+
+        with app.app_context():
+            response = jsonify({"price": decimal.Decimal("1.50"), "n": 1})
+
+        assert response.mimetype == "application/json"
+        assert response.get_data() == b'{"price":"1.50","n":1}'
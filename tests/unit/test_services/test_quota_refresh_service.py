@@ -0,0 +1,156 @@
+"""
+Tests unitarios para QuotaRefreshService
+
+Valida el refresco en paralelo con límite por host, la aplicación por lotes
+en AuthModel y el hilo de refresco periódico.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.models.auth_model import AuthModel
+from src.services.quota_refresh_service import QuotaRefreshService
+
+
+def _tokens(count):
+    """Tokens válidos para AuthModel"""
+    return [f"ghu_refresh{i:04d}5678901234567890123" for i in range(count)]
+
+
+def _auth_model(tokens, quota=1):
+    """AuthModel con las cuentas indicadas"""
+    auth_model = AuthModel()
+    for token in tokens:
+        auth_model.add_account(token, quota_remaining=quota, quota_total=quota)
+    return auth_model
+
+
+class ConcurrencyProbe:
+    """Verificación simulada que mide la concurrencia máxima alcanzada"""
+
+    def __init__(self, delay=0.02, quota=25, fail=()):
+        self.delay = delay
+        self.quota = quota
+        self.fail = set(fail)
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, token):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if token in self.fail:
+                raise ValueError("verification failed")
+            return {"token": "tid=x", "limited_user_quotas": {"chat": self.quota}}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestQuotaRefreshServiceRefreshAll:
+    """Tests para refresh_all"""
+
+    def test_refreshes_all_accounts_in_parallel(self):
+        """Verifica que las cuentas se verifican en paralelo y se aplican"""
+        tokens = _tokens(40)
+        auth_model = _auth_model(tokens)
+        probe = ConcurrencyProbe()
+        service = QuotaRefreshService(auth_model, probe, max_workers=8, per_host_limit=8)
+
+        result = service.refresh_all()
+
+        assert result['checked'] == 40
+        assert result['updated'] == 40
+        assert probe.peak > 1
+        # 40 verificaciones de 20 ms en serie tardarían 0.8 s
+        assert result['duration'] < 0.6
+        assert auth_model.get_statistics()['total_quota_remaining'] == 40 * 25
+
+    def test_per_host_limit_caps_concurrency(self):
+        """Verifica que el límite por host acota la concurrencia del pool"""
+        tokens = _tokens(20)
+        probe = ConcurrencyProbe(delay=0.01)
+        service = QuotaRefreshService(_auth_model(tokens), probe, max_workers=16, per_host_limit=3)
+
+        service.refresh_all()
+
+        assert probe.calls == 20
+        assert probe.peak <= 3
+
+    def test_failed_accounts_keep_quota(self):
+        """Verifica que un fallo no aborta el refresco ni toca la cuenta"""
+        tokens = _tokens(3)
+        auth_model = _auth_model(tokens, quota=9)
+        service = QuotaRefreshService(auth_model, ConcurrencyProbe(delay=0, fail=[tokens[1]]))
+
+        result = service.refresh_all()
+
+        assert result['failed'] == 1
+        assert result['updated'] == 2
+        accounts = auth_model.get_all_accounts()
+        assert accounts[tokens[1]]['quota_remaining'] == 9
+        assert accounts[tokens[0]]['quota_remaining'] == 25
+
+    def test_empty_pool(self):
+        """Verifica que sin cuentas no se verifica nada"""
+        service = QuotaRefreshService(AuthModel(), ConcurrencyProbe())
+
+        assert service.refresh_all()['checked'] == 0
+
+    def test_rejects_invalid_limits(self):
+        """Verifica que límites no positivos generan error"""
+        with pytest.raises(ValueError):
+            QuotaRefreshService(AuthModel(), ConcurrencyProbe(), per_host_limit=0)
+
+
+class TestQuotaRefreshServiceBackground:
+    """Tests para el hilo de refresco periódico"""
+
+    def test_refreshes_periodically(self):
+        """Verifica que el hilo repite el refresco cada intervalo"""
+        tokens = _tokens(2)
+        service = QuotaRefreshService(_auth_model(tokens), ConcurrencyProbe(delay=0), interval=0.02)
+        try:
+            service.start()
+            deadline = time.monotonic() + 5.0
+            while service.get_statistics()['refreshes'] < 2:
+                assert time.monotonic() < deadline
+                time.sleep(0.005)
+        finally:
+            service.stop()
+
+        assert service.is_running() is False
+        assert service.get_statistics()['last_result']['checked'] == 2
+
+    def test_start_refreshes_first_tokens_immediately(self):
+        """Verifica que los tokens indicados al arrancar se verifican sin esperar"""
+        tokens = _tokens(3)
+        probe = ConcurrencyProbe(delay=0)
+        service = QuotaRefreshService(_auth_model(tokens), probe, interval=100.0)
+        try:
+            service.start(first=tokens[:1])
+            deadline = time.monotonic() + 5.0
+            while service.get_statistics()['refreshes'] < 1:
+                assert time.monotonic() < deadline
+                time.sleep(0.005)
+        finally:
+            service.stop()
+
+        assert probe.calls == 1
+        assert service.get_statistics()['last_result']['checked'] == 1
+
+    def test_jittered_delay_stays_in_range(self):
+        """Verifica que la espera varía dentro de ±jitter"""
+        service = QuotaRefreshService(AuthModel(), ConcurrencyProbe(), interval=100.0, jitter=0.2)
+
+        delays = {service._next_delay() for _ in range(50)}
+
+        assert all(80.0 <= delay <= 120.0 for delay in delays)
+        assert len(delays) > 1
@@ -0,0 +1,211 @@
+"""
+Tests unitarios para TokenWatchService
+
+Valida la carga inicial, la detección de archivos nuevos y eliminados con
+inotify y con polling, el agrupado de eventos y el directorio de agotados.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from src.models.auth_model import AuthModel
+from src.services.token_watch_service import TokenWatchService, _InotifyWatcher
+
+
+def _token(i):
+    """Token válido para AuthModel"""
+    return f"ghu_watch{i:04d}56789012345678901234"
+
+
+def _write_token(directory, name, token):
+    """Escribe un archivo de token como lo haría add_account"""
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        f.write(token)
+
+
+def _wait_for(condition, timeout=5.0):
+    """Espera a que se cumpla condition (o falla al agotar el tiempo)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.01)
+    pytest.fail("La condición no se cumplió a tiempo")
+
+
+def _inotify_available():
+    """Indica si inotify funciona en este entorno"""
+    try:
+        _InotifyWatcher([], 1.0).close()
+    except OSError:
+        return False
+    return True
+
+
+BACKENDS = [
+    "polling",
+    pytest.param("inotify", marks=pytest.mark.skipif(
+        not _inotify_available(), reason="inotify no disponible"
+    ))
+]
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    """Directorios de tokens activos y agotados"""
+    token_dir = tmp_path / "tokens"
+    exhausted_dir = tmp_path / "TokensAgotados"
+    token_dir.mkdir()
+    exhausted_dir.mkdir()
+    return str(token_dir), str(exhausted_dir)
+
+
+def _service(dirs, backend, **kwargs):
+    """TokenWatchService con tiempos cortos para los tests"""
+    token_dir, exhausted_dir = dirs
+    kwargs.setdefault('debounce', 0.02)
+    kwargs.setdefault('poll_interval', 0.05)
+    return TokenWatchService(
+        kwargs.pop('auth_model', None) or AuthModel(),
+        token_dir=token_dir,
+        exhausted_dir=exhausted_dir,
+        backend=backend,
+        **kwargs
+    )
+
+
+class TestTokenWatchService:
+    """Tests para la vigilancia de directorios de tokens"""
+
+    def test_rejects_unknown_backend(self, dirs):
+        """Verifica que un backend desconocido se rechaza"""
+        with pytest.raises(ValueError):
+            _service(dirs, "kqueue")
+
+    def test_start_loads_existing_tokens(self, dirs):
+        """Verifica que el escaneo inicial carga activos y marca agotados"""
+        token_dir, exhausted_dir = dirs
+        auth_model = AuthModel()
+        auth_model.add_account(_token(2), quota_remaining=10, quota_total=10)
+        _write_token(token_dir, "1.copilot_token", _token(1))
+        _write_token(token_dir, "notes.txt", _token(9))
+        _write_token(exhausted_dir, "2.copilot_token", _token(2))
+        added = []
+
+        service = _service(dirs, "polling", auth_model=auth_model, on_added=added.append)
+        service.start()
+        try:
+            accounts = auth_model.get_all_accounts()
+            assert set(accounts) == {_token(1), _token(2)}
+            assert accounts[_token(2)]['is_exhausted'] is True
+            _wait_for(lambda: added == [[_token(1)]])
+        finally:
+            service.stop()
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_detects_added_and_removed_files(self, dirs, backend):
+        """Verifica que los archivos nuevos y eliminados se reflejan al momento"""
+        token_dir, _ = dirs
+        added = []
+        service = _service(dirs, backend, on_added=added.extend)
+        auth_model = service._auth_model
+        service.start()
+        try:
+            assert service.get_statistics()['backend'] == backend
+
+            _write_token(token_dir, "1.copilot_token", _token(1))
+            _wait_for(lambda: _token(1) in auth_model.get_all_accounts())
+            _wait_for(lambda: added == [_token(1)])
+
+            os.remove(os.path.join(token_dir, "1.copilot_token"))
+            _wait_for(lambda: _token(1) not in auth_model.get_all_accounts())
+            assert service.get_statistics()['removed'] == 1
+        finally:
+            service.stop()
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_moved_to_exhausted_dir_marks_account_exhausted(self, dirs, backend):
+        """Verifica que mover un token a agotados lo deja agotado, no eliminado"""
+        token_dir, exhausted_dir = dirs
+        _write_token(token_dir, "1.copilot_token", _token(1))
+        service = _service(dirs, backend)
+        auth_model = service._auth_model
+        service.start()
+        try:
+            auth_model.update_account_quota(_token(1), 50, quota_total=50)
+            assert auth_model.get_available_accounts_count() == 1
+
+            os.replace(
+                os.path.join(token_dir, "1.copilot_token"),
+                os.path.join(exhausted_dir, "1.copilot_token")
+            )
+            _wait_for(lambda: auth_model.get_statistics()['exhausted_accounts'] == 1)
+            assert auth_model.get_statistics()['total_accounts'] == 1
+            assert auth_model.get_all_accounts()[_token(1)]['is_exhausted'] is True
+        finally:
+            service.stop()
+
+    def test_new_account_is_usable_before_verification(self, dirs):
+        """Verifica que una cuenta nueva entra en la rotación sin esperar a on_added"""
+        token_dir, _ = dirs
+        release = threading.Event()
+        service = _service(dirs, "polling", on_added=lambda tokens: release.wait(5))
+        auth_model = service._auth_model
+        service.start()
+        try:
+            _write_token(token_dir, "1.copilot_token", _token(1))
+            _wait_for(lambda: auth_model.get_current_token() == _token(1))
+
+            # on_added sigue bloqueado: los siguientes archivos se aplican igual
+            _write_token(token_dir, "2.copilot_token", _token(2))
+            _wait_for(lambda: auth_model.get_total_accounts_count() == 2)
+            assert auth_model.get_all_accounts()[_token(2)]['is_exhausted'] is False
+        finally:
+            release.set()
+            service.stop()
+
+    def test_burst_of_files_is_applied_in_one_batch(self, dirs):
+        """Verifica que una ráfaga de archivos se agrupa en un solo lote"""
+        token_dir, _ = dirs
+        batches = []
+        service = _service(dirs, "polling", on_added=batches.append, debounce=0.2)
+        service.start()
+        try:
+            for i in range(20):
+                _write_token(token_dir, f"{i}.copilot_token", _token(i))
+            _wait_for(lambda: service.get_statistics()['loaded'] == 20)
+            _wait_for(lambda: batches)
+
+            assert len(batches) == 1
+            assert sorted(batches[0]) == sorted(_token(i) for i in range(20))
+        finally:
+            service.stop()
+
+    def test_invalid_token_file_is_skipped(self, dirs):
+        """Verifica que un archivo con token inválido no detiene la vigilancia"""
+        token_dir, _ = dirs
+        service = _service(dirs, "polling")
+        auth_model = service._auth_model
+        service.start()
+        try:
+            _write_token(token_dir, "bad.copilot_token", "corto")
+            _write_token(token_dir, "1.copilot_token", _token(1))
+            _wait_for(lambda: _token(1) in auth_model.get_all_accounts())
+
+            assert auth_model.get_total_accounts_count() == 1
+            assert service.get_statistics()['files'] == 1
+        finally:
+            service.stop()
+
+    def test_stop_ends_thread(self, dirs):
+        """Verifica que stop detiene el hilo de vigilancia"""
+        service = _service(dirs, "auto")
+        service.start()
+        assert service.is_running() is True
+
+        service.stop()
+
+        assert service.is_running() is False